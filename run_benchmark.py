@@ -0,0 +1,139 @@
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import contextlib
+
+# Headless: no window, no audio. Must be set before pygame is imported.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # Keep stdout clean JSON
+
+# Add 'src' to the python path so imports work correctly
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+import pygame
+import settings
+
+# --- SCRIPTED PLAYTHROUGH ---
+# Setup (levels up so every skill unlocks), then a loop that starts with an
+# enemy wave: stand and fight in all four directions, use every skill, travel
+# (streaming new chunks) and open the Item Bag through the HUB.
+SETUP_SCRIPT = [
+    {'ticks': 1, 'press': [pygame.K_EQUALS] * 15},
+]
+LOOP_SCRIPT = [
+    {'ticks': 45,  'hold': ['attack'], 'aim': (1, 0)},
+    {'ticks': 45,  'hold': ['attack'], 'aim': (0, 1)},
+    {'ticks': 45,  'hold': ['attack'], 'aim': (-1, 0)},
+    {'ticks': 45,  'hold': ['attack'], 'aim': (0, -1)},
+    {'ticks': 150, 'hold': ['skill3']},
+    {'ticks': 40,  'hold': ['skill1'], 'aim': (1, 0)},
+    {'ticks': 30,  'hold': ['skill2'], 'aim': (-1, 0)},
+    {'ticks': 45,  'hold': ['attack'], 'aim': (1, 0)},
+    {'ticks': 45,  'hold': ['attack'], 'aim': (-1, 0)},
+    {'ticks': 240, 'hold': ['right']},
+    {'ticks': 120, 'hold': ['down', 'dash']},
+    {'ticks': 120, 'hold': ['left']},
+    {'ticks': 120, 'hold': ['up']},
+    # Menus: open HUB, double-tap left into the Item Bag, back out, close
+    {'ticks': 2,   'hold': ['menu']},
+    {'ticks': 20},
+    {'ticks': 1,   'press': [pygame.K_LEFT]},
+    {'ticks': 1,   'press': [pygame.K_LEFT]},
+    {'ticks': 60},
+    {'ticks': 1,   'press': [pygame.K_ESCAPE]},
+    {'ticks': 30},
+    {'ticks': 2,   'hold': ['menu']},
+    {'ticks': 20},
+]
+
+def spawn_wave(game, count, Enemy):
+    """Drops enemies in a ring right next to the player so combat and loot get exercised."""
+    cx, cy = game.player.rect.center
+    walls = game.world.get_nearby_walls(game.player.rect)
+    for i in range(count):
+        angle = (i / count) * 360 + random.uniform(0, 30)
+        pos = pygame.math.Vector2(random.randint(50, 90), 0).rotate(angle)
+        x, y = int(cx + pos.x), int(cy + pos.y)
+        if pygame.Rect(x - 13, y - 13, 26, 26).collidelist(list(walls)) == -1:
+            game.enemies.append(Enemy(x, y, game.swarm))
+
+def run_benchmark(ticks, dt, seed, render=True, workers=0, wave_size=6, capture=None):
+    # Fixed world seed / worker count before any game module reads settings
+    settings.SEED = seed
+    settings.CHUNK_WORKERS = workers
+    # Logic step size drives per-step scaling (movement, lerps, camera shake)
+    settings.SIM_DT = dt
+    settings.SIM_HZ = 1.0 / dt
+    settings.FRAME_SCALE = settings.TUNING_HZ * dt
+    random.seed(seed)
+
+    from main import Game
+    from engine.input import ScriptedInput
+    from engine.entities import Enemy
+
+    game = Game()
+    try:
+        scripted = ScriptedInput(SETUP_SCRIPT + LOOP_SCRIPT, loop_from=len(SETUP_SCRIPT))
+        game.player.input = scripted
+        game.perf.reset()
+        if capture: game.perf.start_capture(ticks, capture)
+
+        t0 = time.perf_counter()
+        for _ in range(ticks):
+            if wave_size and scripted.at_loop_start(): spawn_wave(game, wave_size, Enemy)
+            game.step(dt, scripted.poll_events())
+            if render: game.draw()
+            game.perf.end_frame()
+        wall = time.perf_counter() - t0
+
+        report = {
+            'ticks': ticks,
+            'dt': dt,
+            'seed': seed,
+            'render': render,
+            'workers': workers,
+            'wave_size': wave_size,
+            'wall_s': round(wall, 3),
+            'ticks_per_s': round(ticks / wall, 1) if wall > 0 else None,
+            'sections': game.perf.report(),
+            'counters': game.perf.counter_report(),
+            # End state, so two runs can be compared for determinism
+            'final_state': {
+                'player_pos': list(game.player.rect.topleft),
+                'layer': game.world.current_layer,
+                'level': game.player.attributes.level,
+                'enemies': len(game.enemies),
+                'loot_drops': len(game.loot_drops),
+                'inventory_slots': len(game.player.inventory.slots),
+                'resident_chunks': len(game.world.current_chunks),
+            },
+            'streamer': dict(game.world.streamer.stats),
+        }
+    finally:
+        game.world.shutdown() # Also stops workers / drops the spill folder if a tick raises
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless deterministic simulation benchmark.")
+    parser.add_argument("--ticks", type=int, default=1800)
+    parser.add_argument("--dt", type=float, default=settings.SIM_DT)
+    parser.add_argument("--seed", type=int, default=settings.SEED)
+    parser.add_argument("--workers", type=int, default=0, help="Chunk worker processes (0 keeps runs deterministic)")
+    parser.add_argument("--no-render", action="store_true")
+    parser.add_argument("--wave-size", type=int, default=6, help="Enemies dropped next to the player every script loop (0 = off)")
+    parser.add_argument("--out", default="-", help="JSON output path ('-' = stdout)")
+    parser.add_argument("--capture", default=None, help="Also write per-tick timings/counters to CAPTURE.csv and CAPTURE.json")
+    args = parser.parse_args()
+
+    # Game chatter goes to stderr so stdout stays clean JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_benchmark(args.ticks, args.dt, args.seed, not args.no_render, args.workers, args.wave_size, args.capture)
+
+    text = json.dumps(report, indent=2)
+    if args.out == "-": print(text)
+    else:
+        with open(args.out, "w") as f: f.write(text + "\n")
@@ -1,77 +1,122 @@
 # src/engine/ai.py
-import heapq
-import math
+import numpy as np
 from pygame.math import Vector2
-from settings import TILE_SIZE, CHUNK_SIZE
+from settings import TILE_SIZE, CHUNK_SIZE, FLOW_RADIUS, FLOW_MAX_STEPS
+from world.world import COLLISION_MASK
+from engine.perf import PERF
 
-class Pathfinder:
-    @staticmethod
-    def get_path(start_pos, end_pos, world): 
-        start_node = (int(start_pos.x // TILE_SIZE), int(start_pos.y // TILE_SIZE))
-        end_node = (int(end_pos.x // TILE_SIZE), int(end_pos.y // TILE_SIZE))
+# 8 step directions; the first 4 are the BFS (orthogonal) moves
+_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
 
-        # Optimization: Straight line if far away to prevent lag
-        if abs(start_node[0] - end_node[0]) + abs(start_node[1] - end_node[1]) > 50:
-            return [end_pos]
+class FlowField:
+    """
+    Shared Dijkstra map toward the player.
+    - Rebuilt only when the player changes tile (or layer), a chunk inside the
+      window streams in or out, or the world's tiles are edited (world.version).
+      Covers resident chunks within FLOW_RADIUS tiles; unloaded ones count as walls.
+    - NumPy frontier BFS on the collision mask, then every cell stores its best
+      neighbour, so enemies read their next waypoint in O(1).
+    """
+    def __init__(self):
+        self.key = None           # (layer, player_tx, player_ty, world version, resident mask) the field was built for
+        self.size = FLOW_RADIUS * 2 + 1
+        self.width = self.size + 2 # Padded with a wall border so BFS needs no bounds checks
+        self.origin = (0, 0)      # World tile of the first unpadded cell
+        self.next_cell = None     # Flat padded index -> neighbour index toward the player (-1 = none)
+        self.builds = 0
 
-        open_set = []
-        heapq.heappush(open_set, (0, start_node))
-        came_from = {}
-        g_score = {start_node: 0}
-        f_score = {start_node: abs(start_node[0]-end_node[0]) + abs(start_node[1]-end_node[1])}
+    def update(self, world, player_pos):
+        tx, ty = int(player_pos[0] // TILE_SIZE), int(player_pos[1] // TILE_SIZE)
+        chunks = world.current_chunks
+        resident = tuple(c in chunks for c in self._window_chunks(tx, ty))
+        key = (world.current_layer, tx, ty, world.version, resident)
+        if key == self.key: return
+        self.key = key
+        self._build(world, tx, ty)
 
-        iterations = 0
-        while open_set:
-            iterations += 1
-            if iterations > 300: break 
+    def _window_chunks(self, tx, ty):
+        """Chunk coordinates overlapping the window centred on (tx, ty), row by row."""
+        ox, oy = tx - FLOW_RADIUS, ty - FLOW_RADIUS
+        return [(cx, cy) for cy in range(oy // CHUNK_SIZE, (oy + self.size - 1) // CHUNK_SIZE + 1)
+                for cx in range(ox // CHUNK_SIZE, (ox + self.size - 1) // CHUNK_SIZE + 1)]
 
-            current = heapq.heappop(open_set)[1]
+    def _gather_passable(self, world, tx, ty):
+        """Stitches resident chunks into one padded walkable mask centred on (tx, ty)."""
+        ox, oy = tx - FLOW_RADIUS, ty - FLOW_RADIUS
+        self.origin = (ox, oy)
+        passable = np.zeros((self.width, self.width), dtype=bool) # [x][y], like chunk grids
+        chunks = world.current_chunks
+        for cx, cy in self._window_chunks(tx, ty):
+            chunk = chunks.get((cx, cy))
+            if chunk is None: continue
+            # Overlap of this chunk with the window, in world tiles
+            x0, x1 = max(ox, cx * CHUNK_SIZE), min(ox + self.size, (cx + 1) * CHUNK_SIZE)
+            y0, y1 = max(oy, cy * CHUNK_SIZE), min(oy + self.size, (cy + 1) * CHUNK_SIZE)
+            grid = np.asarray(chunk.grid, dtype=np.uint8)
+            walkable = ~COLLISION_MASK[grid[x0 - cx * CHUNK_SIZE:x1 - cx * CHUNK_SIZE, y0 - cy * CHUNK_SIZE:y1 - cy * CHUNK_SIZE]]
+            passable[x0 - ox + 1:x1 - ox + 1, y0 - oy + 1:y1 - oy + 1] = walkable
+        passable[FLOW_RADIUS + 1, FLOW_RADIUS + 1] = True # The player's own tile is always the goal
+        return passable.ravel()
 
-            if current == end_node:
-                return Pathfinder.reconstruct_path(came_from, current)
+    def _build(self, world, tx, ty):
+        w = self.width
+        passable = self._gather_passable(world, tx, ty)
+        n = passable.size
 
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-                
-                cx = neighbor[0] // CHUNK_SIZE
-                cy = neighbor[1] // CHUNK_SIZE
-                
-                # --- THE FIX IS HERE ---
-                # Old: chunk = world.chunks.get((cx, cy))
-                # New: Use get_chunk() to handle Surface vs. Cave automatically
-                try:
-                    chunk = world.get_chunk(cx, cy)
-                except:
-                    continue # Safety skip if generation fails
+        # --- BFS (4-connected) from the player ---
+        dist = np.full(n, -1, dtype=np.int32)
+        start = (FLOW_RADIUS + 1) * w + (FLOW_RADIUS + 1)
+        dist[start] = 0
+        offsets = np.array([dx * w + dy for dx, dy in _STEPS], dtype=np.int64)
+        frontier = np.array([start], dtype=np.int64)
+        step = 0
+        while frontier.size and step < FLOW_MAX_STEPS:
+            step += 1
+            nb = (frontier[:, None] + offsets[:4]).ravel()
+            nb = np.unique(nb[passable[nb] & (dist[nb] < 0)])
+            dist[nb] = step
+            frontier = nb
+            PERF.count("path_expansions", nb.size)
 
-                is_wall = False
-                if chunk:
-                    lx = neighbor[0] % CHUNK_SIZE
-                    ly = neighbor[1] % CHUNK_SIZE
-                    # Access .grid inside the object
-                    # Check against Collision IDs 
-                    if chunk.grid[lx][ly] in [0, 1, 5, 6, 7, 100]: # Added 100 (Cave Wall)
-                         is_wall = True
-                else:
-                    is_wall = True 
+        # --- Best neighbour per cell (diagonals only if both sides are open) ---
+        cells = np.nonzero(dist > 0)[0]
+        far = np.iinfo(np.int32).max
+        cand = np.full((8, cells.size), far, dtype=np.int64)
+        for k, (dx, dy) in enumerate(_STEPS):
+            d = dist[cells + offsets[k]].astype(np.int64)
+            ok = d >= 0
+            if k >= 4: ok &= passable[cells + dx * w] & passable[cells + dy]
+            cand[k] = np.where(ok, d, far)
+        # Prefer diagonals on ties (smoother paths): diagonal distance counts slightly less
+        cand[4:] = np.where(cand[4:] < far, cand[4:] * 2 - 1, far)
+        cand[:4] = np.where(cand[:4] < far, cand[:4] * 2, far)
+        best = np.argmin(cand, axis=0)
 
-                if is_wall: continue
+        self.next_cell = np.full(n, -1, dtype=np.int64)
+        self.next_cell[cells] = cells + offsets[best]
+        self.builds += 1
 
-                tentative_g = g_score[current] + 1
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + (abs(neighbor[0]-end_node[0]) + abs(neighbor[1]-end_node[1]))
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
+    def next_waypoint(self, pos):
+        """World-space centre of the next tile toward the player, or None if pos is off the field."""
+        if self.next_cell is None: return None
+        lx = int(pos[0] // TILE_SIZE) - self.origin[0]
+        ly = int(pos[1] // TILE_SIZE) - self.origin[1]
+        if not (0 <= lx < self.size and 0 <= ly < self.size): return None
+        nxt = self.next_cell[(lx + 1) * self.width + (ly + 1)]
+        if nxt < 0: return None
+        nx, ny = divmod(int(nxt), self.width)
+        return Vector2((nx - 1 + self.origin[0]) * TILE_SIZE + TILE_SIZE // 2,
+                       (ny - 1 + self.origin[1]) * TILE_SIZE + TILE_SIZE // 2)
 
-        return [] 
-
-    @staticmethod
-    def reconstruct_path(came_from, current):
-        total_path = []
-        while current in came_from:
-            pixel_pos = Vector2(current[0] * TILE_SIZE + TILE_SIZE//2, 
-                                current[1] * TILE_SIZE + TILE_SIZE//2)
-            total_path.append(pixel_pos)
-            current = came_from[current]
-        return total_path[::-1]
\ No newline at end of file
+    def next_waypoints(self, xs, ys):
+        """Batched next_waypoint for arrays of positions: (wx, wy, on_field mask)."""
+        n = len(xs)
+        if self.next_cell is None: return np.zeros(n), np.zeros(n), np.zeros(n, dtype=bool)
+        lx = np.floor_divide(xs, TILE_SIZE).astype(np.int64) - self.origin[0]
+        ly = np.floor_divide(ys, TILE_SIZE).astype(np.int64) - self.origin[1]
+        ok = (lx >= 0) & (lx < self.size) & (ly >= 0) & (ly < self.size)
+        nxt = np.where(ok, self.next_cell[np.where(ok, (lx + 1) * self.width + (ly + 1), 0)], -1)
+        ok &= nxt >= 0
+        nx, ny = np.divmod(np.maximum(nxt, 0), self.width)
+        return ((nx - 1 + self.origin[0]) * TILE_SIZE + TILE_SIZE // 2,
+                (ny - 1 + self.origin[1]) * TILE_SIZE + TILE_SIZE // 2, ok)
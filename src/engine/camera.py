@@ -2,10 +2,12 @@
 import pygame
 import random
 from settings import *
+from engine.physics import frame_lerp
 
 class Camera:
     def __init__(self, width, height):
         self.camera = pygame.Rect(0, 0, width, height)
+        self.pos = pygame.math.Vector2(0, 0) # Float offset (the Rect would round away slow lerps)
         self.width = width
         self.height = height
         
@@ -23,17 +25,19 @@ class Camera:
         x = -target.rect.centerx + int(WIDTH / 2)
         y = -target.rect.centery + int(HEIGHT / 2)
 
-        # Smooth camera movement (Lerp)
-        self.camera.x += (x - self.camera.x) * 0.1
-        self.camera.y += (y - self.camera.y) * 0.1
+        # Smooth camera movement (Lerp, per logic step)
+        t = frame_lerp(0.1)
+        self.pos.x += (x - self.pos.x) * t
+        self.pos.y += (y - self.pos.y) * t
         
         # Apply Screen Shake
         if self.shake_duration > 0:
-            self.shake_duration -= 1
+            self.shake_duration -= FRAME_SCALE
             rx = random.randint(-self.shake_magnitude, self.shake_magnitude)
             ry = random.randint(-self.shake_magnitude, self.shake_magnitude)
-            self.camera.x += rx
-            self.camera.y += ry
+            self.pos.x += rx
+            self.pos.y += ry
+        self.camera.topleft = (round(self.pos.x), round(self.pos.y))
 
     def trigger_shake(self, duration=10, magnitude=5):
         """Call this when a hit lands!"""
@@ -2,10 +2,10 @@
 import pygame
 import math
 import os
-import copy
 import engine.item_database as item_database
 from pygame.math import Vector2
 from settings import *
+from ui.retained import RetainedLayer
 
 class StarNode:
     def __init__(self, node_id, name, x, y, tier, cost, stat_type, stat_value, reqs, desc):
@@ -21,11 +21,63 @@ class StarNode:
         self.is_unlocked = False
 
 class ConstellationRegistry:
+    """
+    Star nodes plus indices kept in step by set_unlocked(), so checks never walk the whole tree:
+    - children: node_id -> nodes that list it in reqs (reverse dependency edges)
+    - unlocked: ids of lit nodes; spent: their total cost (the Arcane Tube fill)
+    - lit_parents: node_id -> how many of its reqs are lit
+    - available: locked nodes with no reqs or at least one lit req
+    - version: bumped on every change, so cached views (sky layer, bonuses) know when to refresh
+    """
     HEADERS = ['ID', 'Name', 'X', 'Y', 'Tier', 'Cost', 'Stat_Type', 'Stat_Value', 'Reqs', 'Description']
     
     def __init__(self):
         self.nodes = {}
         self._initialize_base_tree()
+        self._build_index()
+
+    def _build_index(self):
+        self.children = {node_id: [] for node_id in self.nodes}
+        for node in self.nodes.values():
+            for req_id in dict.fromkeys(node.reqs): # A repeated req is still one edge
+                if req_id in self.children: self.children[req_id].append(node.node_id)
+        self.unlocked = {node_id for node_id, node in self.nodes.items() if node.is_unlocked}
+        self.spent = sum(self.nodes[node_id].cost for node_id in self.unlocked)
+        self.lit_parents = {node_id: sum(1 for r in dict.fromkeys(node.reqs) if r in self.unlocked) for node_id, node in self.nodes.items()}
+        self.available = set()
+        for node_id in self.nodes: self._refresh(node_id)
+        self.version = 0
+
+    def _refresh(self, node_id):
+        node = self.nodes[node_id]
+        if not node.is_unlocked and (not node.reqs or self.lit_parents[node_id] > 0): self.available.add(node_id)
+        else: self.available.discard(node_id)
+
+    def set_unlocked(self, node_id, value):
+        node = self.nodes[node_id]
+        if node.is_unlocked == value: return
+        node.is_unlocked = value
+        if value:
+            self.unlocked.add(node_id)
+            self.spent += node.cost
+        else:
+            self.unlocked.discard(node_id)
+            self.spent -= node.cost
+        self._refresh(node_id)
+        for child_id in self.children[node_id]:
+            self.lit_parents[child_id] += 1 if value else -1
+            self._refresh(child_id)
+        self.version += 1
+
+    def can_unlock(self, node_id):
+        return node_id in self.available
+
+    def can_refund(self, node_id):
+        """Refunding must not orphan a lit dependent: each one needs another lit req. Only children are checked."""
+        if node_id == "st_root" or node_id not in self.unlocked: return False
+        for child_id in self.children[node_id]:
+            if child_id in self.unlocked and child_id != "st_root" and self.lit_parents[child_id] <= 1: return False
+        return True
 
     def _initialize_base_tree(self):
         cx, cy = WIDTH//2, HEIGHT//2
@@ -109,9 +161,18 @@ class ConstellationUI:
         self.stick_y_pressed = False
         self.pulse_timer = 0.0
         
+        self.bonuses, self.bonus_version = {}, None
+
         # AAA Error Feedback System
         self.error_msg = ""
         self.error_timer = 0.0
+        
+        # Retained layers (see draw)
+        self.sky_bounds = None
+        self.sky_layer = RetainedLayer(alpha=False)
+        self.panel_layer = RetainedLayer()
+        self.panel_areas = [pygame.Rect(20, 40, 480, 60), pygame.Rect(20, 110, 140, 430),
+                            pygame.Rect(WIDTH - 380, HEIGHT - 290, 360, 270), pygame.Rect(0, HEIGHT - 40, WIDTH, 40)]
 
     def _snap_camera_to_cursor(self, instant=False):
         if len(self.node_list) == 0: return
@@ -139,28 +200,6 @@ class ConstellationUI:
                 if score < best_score: best_score, best_idx = score, i
         return best_idx
 
-    def _can_refund(self, target_id):
-        """Topological graph check: Ensures refunding a node does not orphan other active nodes."""
-        if target_id == "st_root": return False
-        
-        self.registry.nodes[target_id].is_unlocked = False
-        is_valid = True
-        
-        for node in self.node_list:
-            if node.is_unlocked and node.node_id != "st_root":
-                has_valid_parent = False
-                for req_id in node.reqs:
-                    if self.registry.nodes[req_id].is_unlocked:
-                        has_valid_parent = True
-                        break
-                
-                if not has_valid_parent and len(node.reqs) > 0:
-                    is_valid = False
-                    break
-                    
-        self.registry.nodes[target_id].is_unlocked = True
-        return is_valid
-
     def handle_input(self, event, player_inventory):
         if event.type == pygame.KEYDOWN and event.key in [pygame.K_ESCAPE, pygame.K_BACKSPACE]: return "BACK"
         if event.type == pygame.JOYBUTTONDOWN and event.button == 1: return "BACK"
@@ -201,11 +240,9 @@ class ConstellationUI:
         # --- THE LIGHT DOWN / REFUND MECHANIC ---
         if attempt_refund:
             if node.is_unlocked and node.node_id != "st_root":
-                if self._can_refund(node.node_id):
-                    crystal_item = copy.copy(item_database.GLOBAL_DB.items["mat_magic_crystal"])
-                    for _ in range(node.cost):
-                        player_inventory.add_item(copy.copy(crystal_item))
-                    node.is_unlocked = False
+                if self.registry.can_refund(node.node_id):
+                    player_inventory.add_items(item_database.GLOBAL_DB.items["mat_magic_crystal"], node.cost)
+                    self.registry.set_unlocked(node.node_id, False)
                 else:
                     self.error_msg = "Cannot Refund: Node supports other active stars!"
                     self.error_timer = 2.0
@@ -213,18 +250,14 @@ class ConstellationUI:
         # --- THE LIGHT UP / UNLOCK MECHANIC ---
         elif attempt_unlock:
             if not node.is_unlocked:
-                can_unlock = False
-                for req_id in node.reqs:
-                    if self.registry.nodes[req_id].is_unlocked: can_unlock = True; break
-                if not node.reqs: can_unlock = True
-                
-                total_spent = sum(n.cost for n in self.node_list if n.is_unlocked)
+                can_unlock = self.registry.can_unlock(node.node_id)
+                total_spent = self.registry.spent
                 crystals = player_inventory.count_item("mat_magic_crystal")
                 
                 if can_unlock:
                     if crystals >= node.cost and (total_spent + node.cost) <= 100:
-                        player_inventory.remove_item_by_id("mat_magic_crystal", node.cost)
-                        node.is_unlocked = True
+                        player_inventory.remove("mat_magic_crystal", node.cost)
+                        self.registry.set_unlocked(node.node_id, True)
                     elif (total_spent + node.cost) > 100:
                         self.error_msg = "Arcane Tube Capacity Reached (Max 100)!"
                         self.error_timer = 2.0
@@ -235,60 +268,69 @@ class ConstellationUI:
         return None
 
     def get_passive_bonuses(self):
-        totals = {}
-        for node in self.node_list:
-            if node.is_unlocked:
-                if node.stat_type not in totals: totals[node.stat_type] = 0
-                totals[node.stat_type] += node.stat_value
-        return totals
+        # Called every step; only re-summed when the registry changes (tree order, so sums match)
+        if self.bonus_version != self.registry.version:
+            totals = {}
+            for node in self.node_list:
+                if node.is_unlocked:
+                    if node.stat_type not in totals: totals[node.stat_type] = 0
+                    totals[node.stat_type] += node.stat_value
+            self.bonuses, self.bonus_version = totals, self.registry.version
+        return self.bonuses
 
-    def draw(self, screen, current_crystals):
-        screen.fill((5, 5, 12)) 
+    def _node_radius(self, node):
+        return 12 if node.tier == "Minor" else (20 if node.tier == "Major" else 30)
+
+    def _sky_bounds(self):
+        """Rect around every node (plus the widest node and cursor ring) in tree coordinates."""
+        margin = 45
+        xs, ys = [n.pos.x for n in self.node_list], [n.pos.y for n in self.node_list]
+        x0, y0 = math.floor(min(xs)) - margin, math.floor(min(ys)) - margin
+        return pygame.Rect(x0, y0, math.ceil(max(xs)) - x0 + margin, math.ceil(max(ys)) - y0 + margin)
+
+    def _draw_sky(self, surf, origin):
+        """Links and stars in tree coordinates (the sky layer is blitted at the camera offset)."""
+        surf.fill((5, 5, 12))
         
         for node in self.node_list:
-            start_pos = node.pos + self.camera_offset
+            start_pos = node.pos - origin
             for req_id in node.reqs:
                 if req_id in self.registry.nodes:
                     parent = self.registry.nodes[req_id]
-                    end_pos = parent.pos + self.camera_offset
+                    end_pos = parent.pos - origin
                     color = (255, 215, 0) if (node.is_unlocked and parent.is_unlocked) else (60, 60, 80)
                     width = 4 if (node.is_unlocked and parent.is_unlocked) else 2
-                    pygame.draw.line(screen, color, start_pos, end_pos, width)
+                    pygame.draw.line(surf, color, start_pos, end_pos, width)
 
         for i, node in enumerate(self.node_list):
-            draw_pos = node.pos + self.camera_offset
-            can_unlock = False
-            for req_id in node.reqs:
-                if self.registry.nodes[req_id].is_unlocked: can_unlock = True; break
-            if not node.reqs: can_unlock = True
+            draw_pos = node.pos - origin
+            can_unlock = node.node_id in self.registry.available
                     
             if node.is_unlocked: fill_color = (255, 215, 0); outline_color = (255, 255, 255)
             elif can_unlock: fill_color = (100, 100, 100); outline_color = (0, 255, 100)
             else: fill_color = (20, 20, 20); outline_color = (80, 80, 80)
                 
-            radius = 12 if node.tier == "Minor" else (20 if node.tier == "Major" else 30)
-            pygame.draw.circle(screen, fill_color, draw_pos, radius)
-            pygame.draw.circle(screen, outline_color, draw_pos, radius, 3)
-            
-            if i == self.cursor_idx:
-                pulse_offset = abs(math.sin(self.pulse_timer)) * 5.0
-                pygame.draw.circle(screen, (255, 255, 255), draw_pos, radius + 8 + pulse_offset, 3)
-                
-        screen.blit(self.title_font.render("CONSTELLATION OF DESTINY", True, (255,255,255)), (50, 40))
-        screen.blit(self.font.render(f"Magic Crystals: {current_crystals} 💎", True, (0, 255, 255)), (50, 80))
+            radius = self._node_radius(node)
+            pygame.draw.circle(surf, fill_color, draw_pos, radius)
+            pygame.draw.circle(surf, outline_color, draw_pos, radius, 3)
+
+    def _draw_panels(self, surf, current_crystals):
+        """Title, gem rack, node info and legend."""
+        surf.blit(self.title_font.render("CONSTELLATION OF DESTINY", True, (255,255,255)), (50, 40))
+        surf.blit(self.font.render(f"Magic Crystals: {current_crystals} 💎", True, (0, 255, 255)), (50, 80))
 
         # ==========================================
         # VISUAL GEM RACK (The 100-Capacity Constraint)
         # ==========================================
-        total_spent = sum(n.cost for n in self.node_list if n.is_unlocked)
+        total_spent = self.registry.spent
         
         rack_bg = pygame.Rect(20, 110, 110, 430)
-        pygame.draw.rect(screen, (15, 15, 20), rack_bg)
-        pygame.draw.rect(screen, (50, 50, 60), rack_bg, 2)
+        pygame.draw.rect(surf, (15, 15, 20), rack_bg)
+        pygame.draw.rect(surf, (50, 50, 60), rack_bg, 2)
         
-        screen.blit(self.font.render("ARCANE TUBE", True, (150, 150, 150)), (25, 120))
+        surf.blit(self.font.render("ARCANE TUBE", True, (150, 150, 150)), (25, 120))
         cap_color = (255, 50, 50) if total_spent >= 100 else (0, 255, 255)
-        screen.blit(self.font.render(f"{total_spent} / 100", True, cap_color), (40, 140))
+        surf.blit(self.font.render(f"{total_spent} / 100", True, cap_color), (40, 140))
 
         drawn_gems = 0
         rack_start_x, rack_start_y = 32, 170
@@ -301,23 +343,20 @@ class ConstellationUI:
                 rect = pygame.Rect(x, y, slot_sz, slot_sz)
                 
                 if drawn_gems < total_spent:
-                    pygame.draw.rect(screen, (0, 255, 255), rect) 
-                    pygame.draw.rect(screen, (255, 255, 255), rect, 1)
+                    pygame.draw.rect(surf, (0, 255, 255), rect) 
+                    pygame.draw.rect(surf, (255, 255, 255), rect, 1)
                     drawn_gems += 1
                 else:
-                    pygame.draw.rect(screen, (30, 30, 40), rect)  
-                    pygame.draw.rect(screen, (60, 60, 80), rect, 1)
+                    pygame.draw.rect(surf, (30, 30, 40), rect)  
+                    pygame.draw.rect(surf, (60, 60, 80), rect, 1)
 
         # INFO PANEL & ERROR RENDERING
         if len(self.node_list) > 0:
             sel_node = self.node_list[self.cursor_idx]
             info_rect = pygame.Rect(WIDTH - 380, HEIGHT - 250, 360, 230)
-            pygame.draw.rect(screen, (20, 20, 30), info_rect); pygame.draw.rect(screen, (100, 100, 150), info_rect, 2)
+            pygame.draw.rect(surf, (20, 20, 30), info_rect); pygame.draw.rect(surf, (100, 100, 150), info_rect, 2)
             
-            can_unlock = False
-            for req_id in sel_node.reqs:
-                if self.registry.nodes[req_id].is_unlocked: can_unlock = True; break
-            if not sel_node.reqs: can_unlock = True
+            can_unlock = sel_node.node_id in self.registry.available
             
             status = "UNLOCKED" if sel_node.is_unlocked else ("AVAILABLE" if can_unlock else "LOCKED")
             status_color = (255,215,0) if sel_node.is_unlocked else ((0,255,100) if status == "AVAILABLE" else (255,50,50))
@@ -326,22 +365,45 @@ class ConstellationUI:
                 status = "CAPACITY REACHED"
                 status_color = (255, 50, 50)
             
-            screen.blit(self.title_font.render(sel_node.name, True, (255,255,255)), (info_rect.x + 20, info_rect.y + 20))
-            screen.blit(self.font.render(status, True, status_color), (info_rect.x + 20, info_rect.y + 60))
+            surf.blit(self.title_font.render(sel_node.name, True, (255,255,255)), (info_rect.x + 20, info_rect.y + 20))
+            surf.blit(self.font.render(status, True, status_color), (info_rect.x + 20, info_rect.y + 60))
             
             val_txt = f"+{sel_node.stat_value}" if sel_node.stat_type not in ["Haste", "Reach", "Impact", "Vampire"] else f"+{int(sel_node.stat_value*100)}%"
-            screen.blit(self.font.render(f"{val_txt} {sel_node.stat_type}", True, (200,200,200)), (info_rect.x + 20, info_rect.y + 90))
+            surf.blit(self.font.render(f"{val_txt} {sel_node.stat_type}", True, (200,200,200)), (info_rect.x + 20, info_rect.y + 90))
             
-            if not sel_node.is_unlocked: screen.blit(self.font.render(f"Cost: {sel_node.cost} Crystals", True, (0,255,255)), (info_rect.x + 20, info_rect.y + 120))
+            if not sel_node.is_unlocked: surf.blit(self.font.render(f"Cost: {sel_node.cost} Crystals", True, (0,255,255)), (info_rect.x + 20, info_rect.y + 120))
                 
             desc_lines = [sel_node.desc[i:i+40] for i in range(0, len(sel_node.desc), 40)]
-            for i, line in enumerate(desc_lines): screen.blit(self.font.render(line, True, (150,150,150)), (info_rect.x + 20, info_rect.y + 160 + (i*20)))
+            for i, line in enumerate(desc_lines): surf.blit(self.font.render(line, True, (150,150,150)), (info_rect.x + 20, info_rect.y + 160 + (i*20)))
 
             if self.error_timer > 0:
                 err_rect = pygame.Rect(WIDTH - 380, HEIGHT - 290, 360, 30)
-                pygame.draw.rect(screen, (100, 0, 0), err_rect)
-                pygame.draw.rect(screen, (255, 50, 50), err_rect, 2)
-                screen.blit(self.font.render(self.error_msg, True, (255, 255, 255)), (err_rect.x + 10, err_rect.y + 8))
+                pygame.draw.rect(surf, (100, 0, 0), err_rect)
+                pygame.draw.rect(surf, (255, 50, 50), err_rect, 2)
+                surf.blit(self.font.render(self.error_msg, True, (255, 255, 255)), (err_rect.x + 10, err_rect.y + 8))
+
+        pygame.draw.rect(surf, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
+        surf.blit(self.font.render("[Stick/D-Pad] Navigate Sky   |   [A] Unlock Star   |   [Y] Refund Star   |   [B] Back", True, (150, 150, 150)), (WIDTH // 2 - 350, HEIGHT - 28))
+
+    def draw(self, screen, current_crystals):
+        """
+        Retained: the star chart and the side panels are cached layers keyed on the registry
+        version (plus cursor, crystals and error for the panels). Camera glide is a
+        blit offset and the cursor pulse is drawn on top.
+        """
+        screen.fill((5, 5, 12)) 
+        version = self.registry.version
+
+        if len(self.node_list) > 0:
+            if self.sky_bounds is None:
+                self.sky_bounds = self._sky_bounds()
+                self.sky_layer.resize(self.sky_bounds.size)
+            origin = Vector2(self.sky_bounds.topleft)
+            self.sky_layer.draw(screen, version, lambda surf: self._draw_sky(surf, origin), origin + self.camera_offset)
+
+            node = self.node_list[self.cursor_idx]
+            pulse_offset = abs(math.sin(self.pulse_timer)) * 5.0
+            pygame.draw.circle(screen, (255, 255, 255), node.pos + self.camera_offset, self._node_radius(node) + 8 + pulse_offset, 3)
 
-        pygame.draw.rect(screen, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
-        screen.blit(self.font.render("[Stick/D-Pad] Navigate Sky   |   [A] Unlock Star   |   [Y] Refund Star   |   [B] Back", True, (150, 150, 150)), (WIDTH // 2 - 350, HEIGHT - 28))
\ No newline at end of file
+        panel_key = (current_crystals, version, self.cursor_idx, self.error_timer > 0 and self.error_msg)
+        self.panel_layer.draw(screen, panel_key, lambda surf: self._draw_panels(surf, current_crystals), areas=self.panel_areas)
@@ -4,12 +4,17 @@ import random
 import math
 import os
 import csv
-import copy
+import bisect
 from pygame.math import Vector2
 from settings import *
 from engine.entity import Entity
-from engine.physics import move_and_slide
+from engine.physics import move_and_slide, frame_lerp
+from engine.overlay import AlphaOverlay
+from engine.hitbox import box_hits, cone_hits, circle_hits, arc_hits
+from engine.swarm import ENEMY_STATES, STATE_ID, ENEMY_SIZE, ENEMY_ATTACK_RANGE
 from engine.input import InputManager
+from ui.text_manager import TextManager # Floating combat text lives in ui.text_manager
+from ui.icon_atlas import ICON_ATLAS
 
 # --- src/engine/entities.py ---
 try:
@@ -39,20 +44,17 @@ class PlayerEquipment:
     def equip(self, item, source_slot=None):
         if not getattr(item, 'equip_slot', None): return False
         slot_name = item.equip_slot
-        
-        equipped_item = copy.copy(item)
-        equipped_item.is_equipped = True
 
         if source_slot:
             self.inv.remove_slot_item(source_slot, 1)
         else:
-            self.inv.remove_item_by_id(item.item_id, 1)
+            self.inv.remove(item.item_id, 1)
 
         if self.slots[slot_name]:
             self.unequip(slot_name)
             
-        self.slots[slot_name] = equipped_item
-        self.inv.add_item(equipped_item) 
+        self.slots[slot_name] = item
+        self.inv.add_item(item, equipped=True)
         return True
 
     def unequip(self, slot_name):
@@ -72,57 +74,111 @@ class PlayerEquipment:
         return stats
 
 class PlayerInventory:
+    """
+    Ordered list of {'item', 'count', 'equipped'} slots (what the menus draw) plus indices,
+    so pickups and crystal checks never scan the whole bag. 'item' is the shared
+    ItemRegistry definition; the slot carries the per-instance state.
+    - _open: (item_id, effect_value, equipped) -> stacks of that kind with room left, in bag order
+    - _by_id: item_id -> every stack holding that item, in bag order
+    - _counts: item_id -> running total (equipped copies included, as count_item always did)
+    Stacks only change through the methods below; self.slots stays read-only for callers.
+    """
     def __init__(self):
         self.slots = []
+        self._open = {}
+        self._by_id = {}
+        self._counts = {}
+        self._meta = {}   # id(slot) -> (bag order, stack key)
+        self._seq = 0
+
+    @staticmethod
+    def _key(item, equipped):
+        return (item.item_id, item.effect_value, equipped)
+
+    def _order(self, slot):
+        return self._meta[id(slot)][0]
+
+    @staticmethod
+    def _discard(stacks, slot):
+        # By identity: two stacks of the same item and count compare equal as dicts
+        for i, s in enumerate(stacks):
+            if s is slot:
+                del stacks[i]
+                return
 
-    def add_item(self, new_item):
-        for slot in self.slots:
-            if (slot['item'].item_id == new_item.item_id and 
-                slot['item'].effect_value == new_item.effect_value and
-                getattr(slot['item'], 'is_equipped', False) == getattr(new_item, 'is_equipped', False)):
-                
-                if slot['count'] < int(new_item.max_stack):
-                    slot['count'] += 1
-                    return True
-        
-        self.slots.append({'item': new_item, 'count': 1})
+    def _new_slot(self, item, count, key):
+        slot = {'item': item, 'count': count, 'equipped': key[2]}
+        self.slots.append(slot)
+        self._meta[id(slot)] = (self._seq, key)
+        self._seq += 1
+        self._by_id.setdefault(item.item_id, []).append(slot)
+        return slot
+
+    def _drop_slot(self, slot, was_open):
+        _, key = self._meta.pop(id(slot))
+        self._discard(self.slots, slot)
+        self._discard(self._by_id[slot['item'].item_id], slot)
+        if was_open: self._discard(self._open[key], slot)
+
+    def add_items(self, new_item, n=1, equipped=False):
+        """Adds n of new_item, topping up open stacks first (bag order), then new stacks."""
+        key = self._key(new_item, equipped)
+        cap = int(new_item.max_stack)
+        open_slots = self._open.setdefault(key, [])
+        self._counts[new_item.item_id] = self._counts.get(new_item.item_id, 0) + n
+        while n > 0:
+            if open_slots:
+                slot = open_slots[0]
+                take = min(n, cap - slot['count'])
+                slot['count'] += take
+                if slot['count'] >= cap: open_slots.pop(0)
+            else:
+                take = max(1, min(n, cap))
+                slot = self._new_slot(new_item, take, key)
+                if take < cap: open_slots.append(slot)
+            n -= take
         return True
 
+    def add_item(self, new_item, equipped=False):
+        return self.add_items(new_item, 1, equipped)
+
     def unequip_item(self, item_to_unequip):
-        for slot in self.slots:
-            if slot['item'].item_id == item_to_unequip.item_id and getattr(slot['item'], 'is_equipped', False):
-                slot['count'] -= 1
-                if slot['count'] <= 0:
-                    self.slots.remove(slot)
-                
-                item_to_unequip.is_equipped = False
+        for slot in self._by_id.get(item_to_unequip.item_id, ()):
+            if slot['equipped']:
+                self.remove_slot_item(slot, 1)
                 self.add_item(item_to_unequip)
                 return
 
     def remove_slot_item(self, slot, amount=1):
+        if id(slot) not in self._meta: # Stale reference (stack already gone)
+            slot['count'] -= amount
+            return
+        # A stack sits in its _open list exactly while it is below max_stack
+        cap = int(slot['item'].max_stack)
+        was_open = slot['count'] < cap
+        self._counts[slot['item'].item_id] -= min(amount, slot['count'])
         slot['count'] -= amount
         if slot['count'] <= 0:
-            if slot in self.slots:
-                self.slots.remove(slot)
+            self._drop_slot(slot, was_open)
+        elif not was_open and slot['count'] < cap:
+            bisect.insort(self._open.setdefault(self._meta[id(slot)][1], []), slot, key=self._order)
 
     def count_item(self, item_id):
-        total = 0
-        for slot in self.slots:
-            if slot['item'].item_id == item_id:
-                total += slot['count']
-        return total
-        
-    def remove_item_by_id(self, item_id, amount):
+        return self._counts.get(item_id, 0)
+
+    def remove(self, item_id, n):
+        """Removes up to n unequipped item_id, newest stacks first. Returns how many were removed."""
         removed = 0
-        for slot in reversed(self.slots): 
-            if slot['item'].item_id == item_id and not getattr(slot['item'], 'is_equipped', False):
-                if slot['count'] <= (amount - removed):
-                    removed += slot['count']
-                    self.slots.remove(slot)
-                else:
-                    slot['count'] -= (amount - removed)
-                    removed = amount
-            if removed >= amount: break
+        for slot in reversed(self._by_id.get(item_id, [])[:]):
+            if removed >= n: break
+            if slot['equipped']: continue
+            take = min(slot['count'], n - removed)
+            self.remove_slot_item(slot, take)
+            removed += take
+        return removed
+
+    def remove_item_by_id(self, item_id, amount):
+        return self.remove(item_id, amount)
 
     def get_filtered_slots(self, category_string):
         if category_string == "ALL": return self.slots
@@ -198,30 +254,6 @@ class AttributeManager:
             self.update_stats(constellation_bonuses, equip_bonuses)
             self.current_hp = self.max_hp
 
-class TextManager:
-    def __init__(self):
-        self.texts = []
-        self.font = pygame.font.Font(None, 24)
-
-    def add(self, x, y, text, color=(255, 50, 50)):
-        self.texts.append({
-            'x': x + random.randint(-10, 10), 'y': y + random.randint(-10, 10),
-            'text': text, 'color': color, 'life': 1.0, 'vy': -30
-        })
-
-    def update(self, dt):
-        for t in self.texts:
-            t['life'] -= dt
-            t['y'] += t['vy'] * dt
-        self.texts = [t for t in self.texts if t['life'] > 0]
-
-    def draw(self, screen, camera):
-        for t in self.texts:
-            alpha = max(0, int(255 * (t['life'] / 0.5))) if t['life'] < 0.5 else 255
-            surf = self.font.render(t['text'], True, t['color'])
-            surf.set_alpha(alpha)
-            screen.blit(surf, camera.apply(surf.get_rect(center=(t['x'], t['y']))))
-
 class Player(Entity):
     def __init__(self, x, y):
         super().__init__(x, y, 26, 26, (0, 0, 255))
@@ -236,6 +268,7 @@ class Player(Entity):
             self.animator = PlayerAnimator()
         else:
             self.animator = None
+        self.overlay = AlphaOverlay() # Translucent hitbox / skill shapes
         
         self.state = STATE_IDLE
         self.state_timer = 0
@@ -316,7 +349,7 @@ class Player(Entity):
 
         # 3. Handle Physics and Input
         self.handle_input(dt, combat_allowed)
-        self.rect = move_and_slide(self.rect, self.velocity, walls)
+        self.rect = move_and_slide(self.rect, self.velocity, walls, self.move_carry)
         
         # 4. Timer Management
         if self.damage_flash_timer > 0: self.damage_flash_timer -= dt
@@ -376,13 +409,13 @@ class Player(Entity):
             self.velocity = self.dash_direction * (speed * self.dash_speed_mult)
             return 
         elif self.state in (STATE_ATTACKING, STATE_SKILL_2):
-            self.velocity = self.velocity.lerp(self.move_direction * (speed * 0.1), 0.2) 
+            self.velocity = self.velocity.lerp(self.move_direction * (speed * 0.1), frame_lerp(0.2)) 
         elif self.state == STATE_SKILL_1:
-            self.velocity = self.velocity.lerp(Vector2(0, 0), 0.3) 
+            self.velocity = self.velocity.lerp(Vector2(0, 0), frame_lerp(0.3)) 
         elif self.state == STATE_SKILL_3:
-            self.velocity = self.velocity.lerp(self.move_direction * (speed * 0.6), 0.2) 
+            self.velocity = self.velocity.lerp(self.move_direction * (speed * 0.6), frame_lerp(0.2)) 
         else:
-            self.velocity = self.velocity.lerp(self.move_direction * speed, 0.2)
+            self.velocity = self.velocity.lerp(self.move_direction * speed, frame_lerp(0.2))
             if self.state != STATE_COOLDOWN:
                 self.state = STATE_MOVING if self.move_direction.length() > 0 else STATE_IDLE
 
@@ -445,7 +478,9 @@ class Player(Entity):
         enemy.interrupt_attack(is_heavy)
         enemy.velocity += push_dir * knockback_amt
         
-        vec_to_enemy = (Vector2(enemy.rect.center) - Vector2(self.rect.center))
+        ex, ey, etop = enemy.centerx, enemy.centery, enemy.top
+        enemy_stats = enemy.stats
+        vec_to_enemy = (Vector2(ex, ey) - Vector2(self.rect.center))
         dot = vec_to_enemy.normalize().dot(enemy.aim_direction) if vec_to_enemy.length() > 0 else 0
         
         is_crit = False
@@ -459,15 +494,15 @@ class Player(Entity):
         else:
             self.gain_flow(1)
 
-        if dot < -0.3 and enemy.stats.shield_hp > 0:
-            enemy.stats.shield_hp -= raw_damage
-            if enemy.stats.shield_hp <= 0:
-                texts.add(enemy.rect.centerx, enemy.rect.top, "SHIELD BROKEN!", (0, 255, 255))
+        if dot < -0.3 and enemy_stats.shield_hp > 0:
+            enemy_stats.shield_hp -= raw_damage
+            if enemy_stats.shield_hp <= 0:
+                texts.add(ex, etop, "SHIELD BROKEN!", (0, 255, 255))
             else:
-                texts.add(enemy.rect.centerx, enemy.rect.top, f"Shield -{int(raw_damage)}", (150, 150, 150))
+                texts.add(ex, etop, f"Shield -{int(raw_damage)}", (150, 150, 150))
         else:
             enemy.take_damage(raw_damage)
-            texts.add(enemy.rect.centerx, enemy.rect.top, f"{int(raw_damage)}{'!' if is_crit else ''}", color)
+            texts.add(ex, etop, f"{int(raw_damage)}{'!' if is_crit else ''}", color)
             
             actual_vampire = vamp_override if vamp_override is not None else min(stats.get('Vampire', 0), 1.0)
             if actual_vampire > 0:
@@ -475,13 +510,14 @@ class Player(Entity):
                 self.attributes.current_hp = min(self.attributes.current_hp + heal, self.attributes.max_hp)
                 texts.add(self.rect.centerx, self.rect.top, f"+{int(heal)}", (50, 255, 50))
                 
-        if enemy.stats.current_hp <= 0 and enemy.is_alive:
+        if enemy_stats.current_hp <= 0 and enemy.is_alive:
             enemy.is_alive = False
             self.attributes.gain_xp(40)
             return True 
         return False
 
     def check_attack(self, enemies, texts):
+        """enemies is a SpatialHash; each skill only looks at the enemies near its shape."""
         killed = []
         stats = self._get_stats_for_state(self.state)
         
@@ -495,6 +531,13 @@ class Player(Entity):
             self._process_whirlwind(enemies, texts, killed, stats)
         return killed
 
+    def _fresh_targets(self, enemies, indices, with_index=False):
+        """Live enemies (by SpatialHash index, in list order) this swing hasn't hit yet."""
+        for i in indices.tolist():
+            e = enemies.entities[i]
+            if e not in self.enemies_hit and e.is_alive:
+                yield (e, i) if with_index else e
+
     def _process_combo_attack(self, enemies, texts, killed, stats):
         aim_dir = self.aim_direction
         perp_dir = Vector2(-aim_dir.y, aim_dir.x)
@@ -519,17 +562,14 @@ class Player(Entity):
             is_heavy = True
             vamp_override = (vamp_base + 0.05) if vamp_base > 0 else 0 
             
-        for e in enemies:
-            if e not in self.enemies_hit and e.is_alive:
-                vec_to_enemy = Vector2(e.rect.center) - Vector2(self.rect.center)
-                proj_fwd = vec_to_enemy.dot(aim_dir)
-                proj_side = vec_to_enemy.dot(perp_dir)
-                
-                if (-10 <= proj_fwd <= blade_length + 13) and (abs(proj_side) <= (blade_width / 2) + 13):
-                    self.enemies_hit.add(e)
-                    raw_dmg = self.attributes.damage * damage_mult
-                    if self._apply_combat_physics(e, raw_dmg, self.aim_direction, knockback, is_heavy, texts, stats, vamp_override):
-                        killed.append(e)
+        shape = (self.rect.center, aim_dir, perp_dir, 10, blade_length + 13, (blade_width / 2) + 13)
+        idx = enemies.query_indices(*enemies.box_bounds(*shape))
+        hits, _ = box_hits(enemies.centers[idx], *shape)
+        for e in self._fresh_targets(enemies, idx[hits]):
+            self.enemies_hit.add(e)
+            raw_dmg = self.attributes.damage * damage_mult
+            if self._apply_combat_physics(e, raw_dmg, self.aim_direction, knockback, is_heavy, texts, stats, vamp_override):
+                killed.append(e)
 
     def _process_hammer_smash(self, enemies, texts, killed, stats):
         force_mult = 1.0 + stats.get('Force', 0)
@@ -539,19 +579,15 @@ class Player(Entity):
         
         cone_range = 90 * reach_mult 
         
-        for e in enemies:
-            if e not in self.enemies_hit and e.is_alive:
-                vec_to_enemy = Vector2(e.rect.center) - self.skill_anchor_pos
-                dist = vec_to_enemy.length()
-                if 0 < dist <= cone_range:
-                    vec_to_enemy_norm = vec_to_enemy.normalize()
-                    angle = self.skill_anchor_aim.angle_to(vec_to_enemy_norm)
-                    if abs(angle) <= 30: 
-                        self.enemies_hit.add(e)
-                        raw_dmg = (self.attributes.damage * 2.5) * force_mult
-                        knockback = 25 * impact_mult 
-                        if self._apply_combat_physics(e, raw_dmg, self.skill_anchor_aim, knockback, True, texts, stats, vamp_override):
-                            killed.append(e)
+        shape = (self.skill_anchor_pos, self.skill_anchor_aim, 30, cone_range)
+        idx = enemies.query_indices(*enemies.cone_bounds(*shape))
+        hits, _ = cone_hits(enemies.centers[idx], *shape)
+        for e in self._fresh_targets(enemies, idx[hits]):
+            self.enemies_hit.add(e)
+            raw_dmg = (self.attributes.damage * 2.5) * force_mult
+            knockback = 25 * impact_mult 
+            if self._apply_combat_physics(e, raw_dmg, self.skill_anchor_aim, knockback, True, texts, stats, vamp_override):
+                killed.append(e)
 
     def _process_stun(self, enemies, texts, killed, stats):
         stun_radius = 37 * (1.0 + min(stats.get('Reach', 0), 1.5)) 
@@ -560,19 +596,17 @@ class Player(Entity):
         vamp_base = stats.get('Vampire', 0)
         vamp_override = max(0.01, vamp_base - 0.04) if vamp_base > 0 else 0 
         
-        for e in enemies:
-            if e not in self.enemies_hit and e.is_alive:
-                vec_to_enemy = Vector2(e.rect.center) - Vector2(self.rect.center)
-                dist = vec_to_enemy.length()
-                if 0 < dist <= stun_radius:
-                    self.enemies_hit.add(e)
-                    push_dir = vec_to_enemy.normalize() if dist > 0 else Vector2(0,1)
-                    raw_dmg = (self.attributes.damage * 0.5) * force_mult
-                    
-                    is_dead = self._apply_combat_physics(e, raw_dmg, push_dir, 2, False, texts, stats, vamp_override)
-                    e.apply_stun(3.0) 
-                    texts.add(e.rect.centerx, e.rect.top - 20, "STUNNED!", (255, 255, 0))
-                    if is_dead: killed.append(e)
+        idx = enemies.query_indices(*enemies.circle_bounds(self.rect.center, stun_radius))
+        hits, push = circle_hits(enemies.centers[idx], self.rect.center, stun_radius)
+        push_by_index = dict(zip(idx[hits].tolist(), push[hits].tolist()))
+        for e, i in self._fresh_targets(enemies, idx[hits], with_index=True):
+            self.enemies_hit.add(e)
+            raw_dmg = (self.attributes.damage * 0.5) * force_mult
+            
+            is_dead = self._apply_combat_physics(e, raw_dmg, Vector2(push_by_index[i]), 2, False, texts, stats, vamp_override)
+            e.apply_stun(3.0) 
+            texts.add(e.centerx, e.top - 20, "STUNNED!", (255, 255, 0))
+            if is_dead: killed.append(e)
 
     def _process_whirlwind(self, enemies, texts, killed, stats):
         reach_mult = 1.0 + min(stats.get('Reach', 0), 1.5)
@@ -586,29 +620,28 @@ class Player(Entity):
         spin_dir = Vector2(1, 0).rotate(self.spin_angle)
         spin_perp = Vector2(0, 1).rotate(self.spin_angle)
         
-        for e in enemies:
-            if e not in self.enemies_hit and e.is_alive:
-                vec_to_enemy = Vector2(e.rect.center) - Vector2(self.rect.center)
-                dist = vec_to_enemy.length()
-                push_dir = vec_to_enemy.normalize() if dist > 0 else Vector2(0,1)
-                
-                proj_fwd = vec_to_enemy.dot(spin_dir)
-                proj_side = vec_to_enemy.dot(spin_perp)
-                
-                if (0 <= proj_fwd <= blade_length + 13) and (abs(proj_side) <= (blade_width / 2) + 13):
-                    self.enemies_hit.add(e)
-                    raw_dmg = self.attributes.damage * force_mult
-                    if self._apply_combat_physics(e, raw_dmg, push_dir, 11, False, texts, stats, vamp_override):
-                        killed.append(e)
-                else:
-                    if 0 < dist <= blade_length + 13:
-                        enemy_angle = math.degrees(math.atan2(vec_to_enemy.y, vec_to_enemy.x))
-                        rel_angle = (enemy_angle - self.spin_angle + 180) % 360 - 180
-                        if -90 <= rel_angle < -10: 
-                            self.enemies_hit.add(e)
-                            raw_dmg = (self.attributes.damage * 0.3) * force_mult
-                            if self._apply_combat_physics(e, raw_dmg, push_dir, 0, False, texts, stats, vamp_override):
-                                killed.append(e)
+        # The blade box and the swept arc both fit in this circle
+        reach = math.hypot(blade_length + 13, (blade_width / 2) + 13)
+        idx = enemies.query_indices(*enemies.circle_bounds(self.rect.center, reach))
+        points = enemies.centers[idx]
+        blade, push = box_hits(points, self.rect.center, spin_dir, spin_perp, 0, blade_length + 13, (blade_width / 2) + 13)
+        # Chip damage for whatever the blade just swept past (the 80 degrees behind it)
+        swept, _ = arc_hits(points, self.rect.center, self.spin_angle, -90, -10, blade_length + 13)
+        swept &= ~blade
+        hit = blade | swept
+        info = dict(zip(idx[hit].tolist(), zip(blade[hit].tolist(), push[hit].tolist())))
+        
+        for e, i in self._fresh_targets(enemies, idx[hit], with_index=True):
+            in_blade, push_dir = info[i]
+            self.enemies_hit.add(e)
+            if in_blade:
+                raw_dmg = self.attributes.damage * force_mult
+                if self._apply_combat_physics(e, raw_dmg, Vector2(push_dir), 11, False, texts, stats, vamp_override):
+                    killed.append(e)
+            else:
+                raw_dmg = (self.attributes.damage * 0.3) * force_mult
+                if self._apply_combat_physics(e, raw_dmg, Vector2(push_dir), 0, False, texts, stats, vamp_override):
+                    killed.append(e)
 
     def draw(self, screen, camera):
         colors = {
@@ -671,9 +704,7 @@ class Player(Entity):
             tl = bl + dir_vec * (blade_len + 10)
             tr = br + dir_vec * (blade_len + 10)
             
-            atk_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            pygame.draw.polygon(atk_surf, COLOR_HITBOX, [bl, tl, tr, br])
-            screen.blit(atk_surf, (0,0))
+            self.overlay.draw(screen, [('polygon', COLOR_HITBOX, [bl, tl, tr, br])])
             
         elif self.state == STATE_SKILL_1:
             cone_range = 90 * reach_mult 
@@ -684,16 +715,12 @@ class Player(Entity):
             
             pygame.draw.line(screen, (255, 100, 0), anchor_start, anchor_start + left_bound, 3)
             pygame.draw.line(screen, (255, 100, 0), anchor_start, anchor_start + right_bound, 3)
-            cone_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) 
-            pygame.draw.polygon(cone_surf, (255, 100, 0, 80), [anchor_start, anchor_start + left_bound, anchor_start + right_bound])
-            screen.blit(cone_surf, (0,0))
+            self.overlay.draw(screen, [('polygon', (255, 100, 0, 80), [anchor_start, anchor_start + left_bound, anchor_start + right_bound])])
             
         elif self.state == STATE_SKILL_2:
             radius = int(37 * reach_mult) 
             pygame.draw.circle(screen, (150, 0, 255), start, radius, 3)  
-            circle_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            pygame.draw.circle(circle_surf, (150, 0, 255, 80), start, radius)
-            screen.blit(circle_surf, (0,0))
+            self.overlay.draw(screen, [('circle', (150, 0, 255, 80), start, radius)])
             
         elif self.state == STATE_SKILL_3:
             blade_len = 45 * reach_mult 
@@ -705,26 +732,96 @@ class Player(Entity):
             tl = bl + dir_vec * blade_len
             tr = br + dir_vec * blade_len
             
-            spin_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            pygame.draw.polygon(spin_surf, (0, 255, 100, 150), [bl, tl, tr, br])
             trail_points = [start]
             for step in range(0, -95, -15): 
                 trail_points.append(start + Vector2(blade_len, 0).rotate(self.spin_angle + step))
-            pygame.draw.polygon(spin_surf, (0, 255, 100, 40), trail_points)
-            screen.blit(spin_surf, (0,0))
+            # One overlay: the trail overwrites the blade where they overlap, as before
+            self.overlay.draw(screen, [('polygon', (0, 255, 100, 150), [bl, tl, tr, br]),
+                                       ('polygon', (0, 255, 100, 40), trail_points)])
 
         if self.state != STATE_SKILL_3:
             pygame.draw.line(screen, (255,255,255), start, start + (self.aim_direction * 30), 2)
 
-class Enemy(Entity):
-    def __init__(self, x, y):
-        super().__init__(x, y, 26, 26, (200, 50, 50))
-        self.stats = type('obj', (object,), {'max_hp': 60, 'current_hp': 60, 'speed': 0.65, 'shield_hp': 30, 'damage': 15})()
-        self.aim_direction = Vector2(0, 1)
-        self.state = ENEMY_CHASING
-        self.state_timer = 0.0
-        self.attack_range = 45 
-        self.attack_visual_timer = 0.0 
+def _slot(view):
+    i = view.slot
+    if i is None: raise ReferenceError("Enemy view is detached: its swarm slot was compacted away or cleared")
+    return i
+
+def _column(name, cast=float):
+    """Property reading/writing one EnemySwarm column at the view's slot."""
+    def get(self): return cast(getattr(self.swarm, name)[_slot(self)])
+    def set(self, value): getattr(self.swarm, name)[_slot(self)] = value
+    return property(get, set)
+
+class _EnemyStats:
+    """enemy.stats.* as a view onto the swarm (hp, shield, damage, speed). One per Enemy."""
+    __slots__ = ('enemy',)
+    def __init__(self, enemy): self.enemy = enemy
+    @property
+    def swarm(self): return self.enemy.swarm
+    @property
+    def slot(self): return self.enemy.slot # Follows the enemy through compact()
+    max_hp = _column('max_hp')
+    current_hp = _column('hp')
+    shield_hp = _column('shield')
+    damage = _column('damage')
+    speed = _column('speed')
+
+class Enemy:
+    """
+    Thin view onto one EnemySwarm slot (the swarm owns the data and runs the AI).
+    Keeps the old Enemy attributes so combat and drawing don't care.
+    - rect is a fresh snapshot Rect; move the enemy by assigning enemy.rect.
+      Hot paths read centerx / centery / top straight from the columns instead.
+    - Once its slot is compacted away (slot None) is_alive is False and every
+      other accessor raises ReferenceError.
+    """
+    attack_range = ENEMY_ATTACK_RANGE
+
+    def __init__(self, x, y, swarm):
+        self.swarm = swarm
+        self.slot = swarm.add(self, x, y)
+        self.stats = _EnemyStats(self)
+
+    state_timer = _column('timer')
+    attack_visual_timer = _column('visual')
+
+    @property
+    def is_alive(self):
+        return self.slot is not None and bool(self.swarm.alive[self.slot])
+    @is_alive.setter
+    def is_alive(self, value): self.swarm.alive[_slot(self)] = value
+
+    @property
+    def rect(self):
+        i, sw = _slot(self), self.swarm
+        return pygame.Rect(int(sw.x[i]), int(sw.y[i]), int(sw.w[i]), int(sw.h[i]))
+    @rect.setter
+    def rect(self, value):
+        i, sw = _slot(self), self.swarm
+        sw.x[i], sw.y[i], sw.w[i], sw.h[i] = value.x, value.y, value.w, value.h
+
+    @property
+    def centerx(self): i = _slot(self); return int(self.swarm.x[i] + self.swarm.w[i] // 2)
+    @property
+    def centery(self): i = _slot(self); return int(self.swarm.y[i] + self.swarm.h[i] // 2)
+    @property
+    def top(self): return int(self.swarm.y[_slot(self)])
+
+    @property
+    def state(self): return ENEMY_STATES[self.swarm.state[_slot(self)]]
+    @state.setter
+    def state(self, value): self.swarm.state[_slot(self)] = STATE_ID[value]
+
+    @property
+    def velocity(self): i = _slot(self); return Vector2(self.swarm.vx[i], self.swarm.vy[i])
+    @velocity.setter
+    def velocity(self, value): i = _slot(self); self.swarm.vx[i], self.swarm.vy[i] = value
+
+    @property
+    def aim_direction(self): i = _slot(self); return Vector2(self.swarm.aim_x[i], self.swarm.aim_y[i])
+    @aim_direction.setter
+    def aim_direction(self, value): i = _slot(self); self.swarm.aim_x[i], self.swarm.aim_y[i] = value
 
     def apply_stun(self, duration):
         self.state = ENEMY_STUNNED
@@ -737,69 +834,29 @@ class Enemy(Entity):
             self.attack_visual_timer = 0.0 
 
     def take_damage(self, amount):
-        self.stats.current_hp -= amount
-
-    def update(self, dt, player, walls, texts, camera):
-        self.velocity = self.velocity.lerp(Vector2(0, 0), 0.15)
-        self.rect = move_and_slide(self.rect, self.velocity, walls)
-        
-        if self.attack_visual_timer > 0: self.attack_visual_timer -= dt
-
-        vec_to_player = Vector2(player.rect.center) - Vector2(self.rect.center)
-        dist_to_player = vec_to_player.length()
-        
-        if self.state == ENEMY_STUNNED:
-            self.state_timer -= dt
-            if self.state_timer <= 0:
-                self.state = ENEMY_CHASING
-                
-        elif self.state == ENEMY_STAGGERED:
-            self.state_timer -= dt
-            if self.state_timer <= 0:
-                self.state = ENEMY_CHASING
-                
-        elif self.state == ENEMY_RECOVERING:
-            self.state_timer -= dt
-            if self.state_timer <= 0:
-                self.state = ENEMY_CHASING
-                
-        elif self.state == ENEMY_WINDUP:
-            self.state_timer -= dt
-            if self.state_timer <= 0:
-                self.attack_visual_timer = 0.15 
-                if dist_to_player <= self.attack_range + 20: 
-                    player.take_damage(self.stats.damage, texts, camera)
-                self.state = ENEMY_RECOVERING
-                self.state_timer = 0.4 
-                
-        elif self.state == ENEMY_CHASING:
-            if dist_to_player <= self.attack_range:
-                self.state = ENEMY_WINDUP
-                self.state_timer = 0.40 
-            else:
-                if dist_to_player > 0:
-                    self.aim_direction = self.aim_direction.lerp(vec_to_player.normalize(), 0.05).normalize()
-                target_vel = self.aim_direction * (self.stats.speed * PLAYER_MAX_SPEED)
-                self.velocity = self.velocity.lerp(target_vel, 0.1)
+        self.swarm.hp[_slot(self)] -= amount
 
     def draw(self, screen, camera):
-        if self.state == ENEMY_STUNNED: self.color = (150, 150, 0) 
-        elif self.state == ENEMY_STAGGERED: self.color = (100, 150, 200) 
-        elif self.state == ENEMY_WINDUP: self.color = (255, 255, 255) 
-        elif self.state == ENEMY_RECOVERING: self.color = (100, 50, 50) 
-        else: self.color = (200, 50, 50) 
-        
-        super().draw(screen, camera)
-        start = camera.apply(self.rect).center
+        state = self.state
+        if state == ENEMY_STUNNED: color = (150, 150, 0) 
+        elif state == ENEMY_STAGGERED: color = (100, 150, 200) 
+        elif state == ENEMY_WINDUP: color = (255, 255, 255) 
+        elif state == ENEMY_RECOVERING: color = (100, 50, 50) 
+        else: color = (200, 50, 50) 
+        
+        draw_rect = camera.apply(self.rect)
+        pygame.draw.rect(screen, color, draw_rect)
+        start = draw_rect.center
+        aim = self.aim_direction
 
         if self.attack_visual_timer > 0:
-            end_strike = start + (self.aim_direction * (self.attack_range + 20))
+            end_strike = start + (aim * (self.attack_range + 20))
             pygame.draw.line(screen, (255, 0, 0), start, end_strike, 8)
 
-        if self.stats.shield_hp > 0:
-            pygame.draw.line(screen, (150, 150, 150), start, start + (self.aim_direction * 20), 5)
+        if self.swarm.shield[_slot(self)] > 0:
+            pygame.draw.line(screen, (150, 150, 150), start, start + (aim * 20), 5)
         else:
-            pygame.draw.line(screen, (255, 0, 0), start, start + (self.aim_direction * 20), 2)
+            pygame.draw.line(screen, (255, 0, 0), start, start + (aim * 20), 2)
 
 class ItemDrop:
     def __init__(self, x, y, item):
@@ -820,8 +877,6 @@ class ItemDrop:
         self.pickup_delay = 0.5 
         
         self.rect = pygame.Rect(x-10, y-10, 20, 20)
-        try: self.icon_font = pygame.font.SysFont(['segoe ui emoji', 'apple color emoji', 'noto color emoji'], 24)
-        except: self.icon_font = pygame.font.Font(None, 24)
 
     def update(self, dt, player):
         if self.pickup_delay > 0:
@@ -871,27 +926,43 @@ class ItemDrop:
 
         pygame.draw.rect(screen, self.item.color, item_rect, 2)
         try:
-            icon_surf = self.icon_font.render(self.item.icon, True, (255, 255, 255))
-            screen.blit(icon_surf, icon_surf.get_rect(center=item_rect.center))
+            ICON_ATLAS.blit_centered(screen, self.item.icon, 24, item_rect.center)
         except: pass
 
-class GlyphOre(Enemy):
+class GlyphOre(Entity):
     def __init__(self, x, y):
-        super().__init__(x, y)
+        super().__init__(x, y, ENEMY_SIZE, ENEMY_SIZE, (138, 43, 226))
         self.is_ore = True
-        self.stats.max_hp = 5
-        self.stats.current_hp = 5
-        self.stats.shield_hp = 0
+        # Stationary, so it lives outside the EnemySwarm but keeps the enemy interface combat expects
+        self.stats = type('obj', (object,), {'max_hp': 5, 'current_hp': 5, 'speed': 0, 'shield_hp': 0, 'damage': 0})()
+        self.aim_direction = Vector2(0, 1)
+        self.state = ENEMY_CHASING
+        self.state_timer = 0.0
+        self.attack_visual_timer = 0.0
         
         # Make the hitbox slightly wider than a standard enemy
         self.rect.inflate_ip(10, 10) 
 
+    # Same position accessors as the swarm Enemy view
+    @property
+    def centerx(self): return self.rect.centerx
+    @property
+    def centery(self): return self.rect.centery
+    @property
+    def top(self): return self.rect.top
+
+    def apply_stun(self, duration):
+        pass # Rocks don't get dizzy
+
+    def take_damage(self, amount):
+        self.stats.current_hp -= amount
+
     def interrupt_attack(self, is_heavy=False):
         # It's a rock! It doesn't flinch or get staggered.
         # But we use the visual timer to trigger a white flash when hit.
         self.attack_visual_timer = 0.1 
 
-    def update(self, dt, player, walls, texts, camera):
+    def update(self, dt, player, walls, texts, camera, flow=None):
         # Absolutely stationary. No AI. No movement.
         self.velocity = Vector2(0, 0)
         if self.attack_visual_timer > 0: self.attack_visual_timer -= dt
@@ -8,6 +8,7 @@ class Entity:
         # Physical Properties based on custom sandbox sizes
         self.rect = pygame.Rect(x, y, w, h)
         self.velocity = Vector2(0, 0)
+        self.move_carry = Vector2(0, 0) # Sub-pixel movement left over from the last step
         self.color = color
         
         # State
@@ -15,7 +16,7 @@ class Entity:
 
     def apply_physics(self, walls):
         """Shared physics logic using the Corner Sliding system"""
-        self.rect = move_and_slide(self.rect, self.velocity, walls)
+        self.rect = move_and_slide(self.rect, self.velocity, walls, self.move_carry)
 
     def draw(self, screen, camera):
         """Shared drawing logic"""
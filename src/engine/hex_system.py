@@ -1,10 +1,11 @@
 # hex_system.py
 import pygame
 import math
-import copy
 import engine.item_database as item_database
 from pygame.math import Vector2
 from settings import *
+from ui.icon_atlas import ICON_ATLAS
+from ui.retained import RetainedLayer
 
 def axial_to_pixel(q, r, size):
     x = size * math.sqrt(3) * (q + r / 2.0)
@@ -49,12 +50,6 @@ class HexCoreUI:
         pygame.font.init()
         self.font = pygame.font.Font(None, 24)
         self.title_font = pygame.font.Font(None, 36)
-        try: 
-            self.icon_font = pygame.font.SysFont(['segoe ui emoji', 'apple color emoji', 'noto color emoji'], 32)
-            self.small_icon_font = pygame.font.SysFont(['segoe ui emoji', 'apple color emoji', 'noto color emoji'], 18)
-        except: 
-            self.icon_font = self.font
-            self.small_icon_font = self.font
         
         self.sockets = {} 
         self.cores = []
@@ -107,6 +102,11 @@ class HexCoreUI:
         self.visual_bag_scroll = 0.0
         self.screen_y_level, self.camera_y_offset = 0, 0.0 
         
+        # Retained layers (see draw)
+        self.page_layer = RetainedLayer()
+        self.bag_layer = RetainedLayer()
+        self.forge_bag_layer = RetainedLayer()
+        
         self.anvils = [
             ForgeAnvil("Rare", "Epic", 2, 2),
             ForgeAnvil("Epic", "Mythic", 3, 3),
@@ -172,7 +172,7 @@ class HexCoreUI:
         for item in item_database.GLOBAL_DB.items.values():
             if hasattr(item, 'rarity') and hasattr(item, 'effect_stat'):
                 if item.rarity == rarity and item.effect_stat == effect_stat:
-                    return copy.copy(item)
+                    return item
         return None
 
     def handle_input(self, event, player_inventory, current_level):
@@ -246,7 +246,7 @@ class HexCoreUI:
                 if len(target_anvil.slots) == target_anvil.req_slots:
                     crystals = player_inventory.count_item("mat_magic_crystal")
                     if crystals >= target_anvil.crystal_cost:
-                        player_inventory.remove_item_by_id("mat_magic_crystal", target_anvil.crystal_cost)
+                        player_inventory.remove("mat_magic_crystal", target_anvil.crystal_cost)
                         off_item = self._get_official_db_item(target_anvil.out_tier, target_anvil.base_stat)
                         if off_item: player_inventory.add_item(off_item)
                         target_anvil.slots, target_anvil.base_stat = [], None
@@ -255,7 +255,7 @@ class HexCoreUI:
                 elif hovered_item and hovered_item.rarity == target_anvil.in_tier:
                     if len(target_anvil.slots) == 0 or target_anvil.base_stat == hovered_item.effect_stat:
                         target_anvil.base_stat = hovered_item.effect_stat
-                        target_anvil.slots.append(copy.copy(hovered_item))
+                        target_anvil.slots.append(hovered_item)
                         player_inventory.remove_slot_item(glyph_slots[self.bag_idx], 1)
                     else: target_anvil.error_msg, target_anvil.error_timer = "Stat Mismatch!", 2.0
             return None
@@ -288,15 +288,15 @@ class HexCoreUI:
                         if self.target_socket_idx != -1:
                             ts = self.socket_list[self.target_socket_idx]
                             old_g = ts.glyph
-                            ts.glyph = copy.copy(slot['item'])
-                            player_inventory.remove_item_by_id(slot['item'].item_id, 1)
+                            ts.glyph = slot['item']
+                            player_inventory.remove(slot['item'].item_id, 1)
                             if old_g: player_inventory.add_item(old_g)
                             self.target_socket_idx, self.active_pane = -1, "GRID"
                             self.grid_idx = next((i for i, s in enumerate(self.socket_list) if s == ts), 0)
                             self.recalculate_stats()
                         elif not self.held_glyph: 
-                            self.held_glyph = copy.copy(slot['item'])
-                            player_inventory.remove_item_by_id(slot['item'].item_id, 1) 
+                            self.held_glyph = slot['item']
+                            player_inventory.remove(slot['item'].item_id, 1) 
                             if self.grid_idx == 999: 
                                 self.grid_idx = 0
                                 self.pulse_timer = 1.5 # Trigger juice!
@@ -319,74 +319,51 @@ class HexCoreUI:
         pts = [(x + radius * math.cos(math.radians(60 * i - 30)), y + radius * math.sin(math.radians(60 * i - 30))) for i in range(6)]
         pygame.draw.polygon(screen, color, pts, width)
 
-    def draw(self, screen, current_level, player_inventory):
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA); overlay.fill(HEX_MENU_COLOR); screen.blit(overlay, (0,0))
-        yo = self.camera_y_offset
-        glyph_slots = player_inventory.get_filtered_slots("GLYPH")
-        if len(glyph_slots) > 0: self.bag_idx = max(0, min(self.bag_idx, len(glyph_slots)-1))
+    def _draw_page(self, surf, yo, current_level, player_inventory, glyph_slots):
+        """Both screens (grid and forge) at camera offset yo, minus the glyph bags and the pulse."""
+        surf.fill(HEX_MENU_COLOR)
 
         pw = 420
-        pygame.draw.rect(screen, (20, 20, 25), (0, yo, pw, HEIGHT))
-        pygame.draw.line(screen, (80, 80, 80), (pw, yo), (pw, yo + HEIGHT), 3)
-        pygame.draw.line(screen, (50, 50, 50), (0, yo + 360), (pw, yo + 360), 3) 
+        pygame.draw.rect(surf, (20, 20, 25), (0, yo, pw, HEIGHT))
+        pygame.draw.line(surf, (80, 80, 80), (pw, yo), (pw, yo + HEIGHT), 3)
+        pygame.draw.line(surf, (50, 50, 50), (0, yo + 360), (pw, yo + 360), 3) 
         is_bag_active = (self.active_pane == "BAG" and self.screen_y_level == 0)
-        pygame.draw.rect(screen, (255, 215, 0) if is_bag_active else (60, 60, 60), (0, yo, pw, 360), 3)
-        screen.blit(self.title_font.render("AVAILABLE GLYPHS", True, (255,255,255)), (20, yo + 20))
+        pygame.draw.rect(surf, (255, 215, 0) if is_bag_active else (60, 60, 60), (0, yo, pw, 360), 3)
+        surf.blit(self.title_font.render("AVAILABLE GLYPHS", True, (255,255,255)), (20, yo + 20))
         
-        if glyph_slots:
-            sx, sy, sz, sp = 20, 60, 65, 12
-            screen.set_clip(pygame.Rect(10, yo + 50, 400, self.bag_rows_visible*(sz+sp)+10))
-            for i, slot in enumerate(glyph_slots):
-                col, row = i % self.bag_cols, i // self.bag_cols
-                x, y = sx + col * (sz + sp), sy + (row - self.visual_bag_scroll) * (sz + sp) + yo
-                if y > sy + yo + (self.bag_rows_visible*(sz+sp)) or y < sy + yo - sz: continue
-                rect = pygame.Rect(x, y, sz, sz)
-                pygame.draw.rect(screen, (60, 60, 70) if (is_bag_active and i == self.bag_idx) else (30, 30, 35), rect)
-                pygame.draw.rect(screen, slot['item'].color, rect, 3)
-                if is_bag_active and i == self.bag_idx: pygame.draw.rect(screen, (255, 215, 0), rect, 5)
-                try: screen.blit(self.icon_font.render(slot['item'].icon, True, (255, 255, 255)), self.icon_font.render(slot['item'].icon, True, (255, 255, 255)).get_rect(center=rect.center))
-                except: pass
-                if slot['count'] > 1: screen.blit(self.font.render(str(slot['count']), True, (255,255,255)), (x + sz - 20, y + sz - 20))
-            screen.set_clip(None)
-
-        screen.blit(self.title_font.render("HEX-CORE TELEMETRY", True, (255,255,255)), (20, yo + 380))
+        surf.blit(self.title_font.render("HEX-CORE TELEMETRY", True, (255,255,255)), (20, yo + 380))
         cur_y = yo + 420
         for core in self.cores:
             cn = core['name']
             if current_level >= core['lvl']:
-                screen.blit(self.font.render(f"[{cn}]", True, (255,215,0)), (20, cur_y)); cur_y += 25; has_s = False
+                surf.blit(self.font.render(f"[{cn}]", True, (255,215,0)), (20, cur_y)); cur_y += 25; has_s = False
                 for k, v in self.skill_stats[cn].items():
-                    if v > 0: screen.blit(self.font.render(f" + {k}: +{int(v*100)}%", True, (0, 255, 100)), (30, cur_y)); cur_y += 20; has_s = True
-                if not has_s: screen.blit(self.font.render("   Empty Sockets", True, (100, 100, 100)), (30, cur_y)); cur_y += 20
+                    if v > 0: surf.blit(self.font.render(f" + {k}: +{int(v*100)}%", True, (0, 255, 100)), (30, cur_y)); cur_y += 20; has_s = True
+                if not has_s: surf.blit(self.font.render("   Empty Sockets", True, (100, 100, 100)), (30, cur_y)); cur_y += 20
                 cur_y += 10
-            else: screen.blit(self.font.render(f"[{cn}] (Lvl {core['lvl']})", True, (100,100,100)), (20, cur_y)); cur_y += 30
+            else: surf.blit(self.font.render(f"[{cn}] (Lvl {core['lvl']})", True, (100,100,100)), (20, cur_y)); cur_y += 30
 
         for i, s in enumerate(self.socket_list):
             sx, sy_soc = s.pos.x, s.pos.y + yo
             if self.is_socket_unlocked(s, current_level):
-                self._draw_poly(screen, sx, sy_soc, 43, s.glyph.color if s.glyph else (15,15,15))
+                self._draw_poly(surf, sx, sy_soc, 43, s.glyph.color if s.glyph else (15,15,15))
                 if (self.active_pane == "GRID" and i == self.grid_idx and self.screen_y_level == 0) or (i == self.target_socket_idx):
-                    self._draw_poly(screen, sx, sy_soc, 47, (255, 215, 0), 4)
-                else: self._draw_poly(screen, sx, sy_soc, 43, (60,60,60), 2)
-                
-                # JUMP PULSE JUICE
-                if i == 0 and self.pulse_timer > 0:
-                    alpha = int(abs(math.sin(pygame.time.get_ticks() * 0.01)) * 255)
-                    self._draw_poly(screen, sx, sy_soc, 55, (255, 255, 255, alpha), 3)
+                    self._draw_poly(surf, sx, sy_soc, 47, (255, 215, 0), 4)
+                else: self._draw_poly(surf, sx, sy_soc, 43, (60,60,60), 2)
 
                 if s.glyph:
-                    try: screen.blit(self.icon_font.render(s.glyph.icon, True, (255, 255, 255)), self.icon_font.render(s.glyph.icon, True, (255, 255, 255)).get_rect(center=(sx, sy_soc)))
+                    try: ICON_ATLAS.blit_centered(surf, s.glyph.icon, 32, (sx, sy_soc))
                     except: pass
             else:
-                self._draw_poly(screen, sx, sy_soc, 43, (5, 5, 5))
-                self._draw_poly(screen, sx, sy_soc, 43, (40, 0, 0), 2)
+                self._draw_poly(surf, sx, sy_soc, 43, (5, 5, 5))
+                self._draw_poly(surf, sx, sy_soc, 43, (40, 0, 0), 2)
             
         for c in self.cores:
             is_u, cx, cy_c = current_level >= c['lvl'], c['base_pos'].x, c['base_pos'].y + yo
-            self._draw_poly(screen, cx, cy_c, 45, COLOR_MAIN_HEX if is_u else (0,0,0))
-            self._draw_poly(screen, cx, cy_c, 45, (255, 255, 255) if is_u else COLOR_LOCKED, 3)
+            self._draw_poly(surf, cx, cy_c, 45, COLOR_MAIN_HEX if is_u else (0,0,0))
+            self._draw_poly(surf, cx, cy_c, 45, (255, 255, 255) if is_u else COLOR_LOCKED, 3)
             if is_u:
-                try: screen.blit(self.icon_font.render(c['icon'], True, (255,255,255)), self.icon_font.render(c['icon'], True, (255,255,255)).get_rect(center=(cx, cy_c - 5)))
+                try: ICON_ATLAS.blit_centered(surf, c['icon'], 32, (cx, cy_c - 5))
                 except: pass
 
         bx, by = self.forge_btn_pos.x, self.forge_btn_pos.y + yo
@@ -394,72 +371,111 @@ class HexCoreUI:
         btn_s = self.title_font.render("THE ARCANE FORGE", True, (255, 255, 255) if is_sel else (150, 150, 150))
         br = btn_s.get_rect(center=(bx, by))
         if is_sel:
-            pygame.draw.rect(screen, (50, 50, 60), br.inflate(40, 20), border_radius=10)
-            pygame.draw.rect(screen, (255, 215, 0), br.inflate(40, 20), 2, border_radius=10)
-        screen.blit(btn_s, br)
+            pygame.draw.rect(surf, (50, 50, 60), br.inflate(40, 20), border_radius=10)
+            pygame.draw.rect(surf, (255, 215, 0), br.inflate(40, 20), 2, border_radius=10)
+        surf.blit(btn_s, br)
 
         if self.held_glyph and self.screen_y_level == 0:
             v_tx, v_ty = (self.socket_list[self.grid_idx].pos.x if self.grid_idx != 999 else bx), (self.socket_list[self.grid_idx].pos.y + yo if self.grid_idx != 999 else by)
-            self._draw_poly(screen, v_tx, v_ty, 50, self.held_glyph.color)
-            self._draw_poly(screen, v_tx, v_ty, 50, (255,255,255), 2)
-            try: screen.blit(self.icon_font.render(self.held_glyph.icon, True, (255, 255, 255)), self.icon_font.render(self.held_glyph.icon, True, (255, 255, 255)).get_rect(center=(v_tx, v_ty)))
+            self._draw_poly(surf, v_tx, v_ty, 50, self.held_glyph.color)
+            self._draw_poly(surf, v_tx, v_ty, 50, (255,255,255), 2)
+            try: ICON_ATLAS.blit_centered(surf, self.held_glyph.icon, 32, (v_tx, v_ty))
             except: pass
 
         fy = HEIGHT + yo
         if fy < HEIGHT and fy + HEIGHT > 0: 
             lw = WIDTH - 420
-            pygame.draw.rect(screen, (15, 10, 10), (0, fy, lw, HEIGHT))
-            pygame.draw.line(screen, (255, 100, 50), (lw, fy), (lw, fy + HEIGHT), 3)
-            pygame.draw.rect(screen, (20, 20, 25), (lw, fy, 420, HEIGHT))
-            pygame.draw.rect(screen, (255, 215, 0) if self.screen_y_level == 1 else (60, 60, 60), (lw, fy, 420, HEIGHT), 3)
-            screen.blit(self.title_font.render(f"Magic Crystals: {player_inventory.count_item('mat_magic_crystal')}", True, (0, 255, 255)), (40, fy + 30))
+            pygame.draw.rect(surf, (15, 10, 10), (0, fy, lw, HEIGHT))
+            pygame.draw.line(surf, (255, 100, 50), (lw, fy), (lw, fy + HEIGHT), 3)
+            pygame.draw.rect(surf, (20, 20, 25), (lw, fy, 420, HEIGHT))
+            pygame.draw.rect(surf, (255, 215, 0) if self.screen_y_level == 1 else (60, 60, 60), (lw, fy, 420, HEIGHT), 3)
+            surf.blit(self.title_font.render(f"Magic Crystals: {player_inventory.count_item('mat_magic_crystal')}", True, (0, 255, 255)), (40, fy + 30))
             aa = next((a for a in self.anvils if len(a.slots) > 0), None)
             hi = glyph_slots[self.bag_idx]['item'] if (self.bag_idx < len(glyph_slots) and self.screen_y_level == 1) else None
             for i, anvil in enumerate(self.anvils):
                 ay = fy + 130 + (i * 180)
                 is_lit = (aa == anvil) or (not aa and hi and hi.rarity == anvil.in_tier)
                 box = pygame.Rect(40, ay - 40, lw - 80, 120)
-                pygame.draw.rect(screen, (30, 20, 20) if is_lit else (20, 10, 10), box, border_radius=10)
-                pygame.draw.rect(screen, (255, 215, 0) if is_lit else (80, 40, 40), box, 3, border_radius=10)
-                screen.blit(self.title_font.render(f"{anvil.in_tier} -> {anvil.out_tier}", True, (200, 200, 200)), (60, ay - 25))
-                screen.blit(self.font.render(f"Cost: {anvil.crystal_cost} Crystals", True, (0, 255, 255)), (60, ay + 15))
-                if anvil.error_timer > 0: screen.blit(self.font.render(anvil.error_msg, True, (255, 50, 50)), (60, ay + 45))
-                elif anvil.success_timer > 0: screen.blit(self.font.render(anvil.success_msg, True, (50, 255, 50)), (60, ay + 45))
+                pygame.draw.rect(surf, (30, 20, 20) if is_lit else (20, 10, 10), box, border_radius=10)
+                pygame.draw.rect(surf, (255, 215, 0) if is_lit else (80, 40, 40), box, 3, border_radius=10)
+                surf.blit(self.title_font.render(f"{anvil.in_tier} -> {anvil.out_tier}", True, (200, 200, 200)), (60, ay - 25))
+                surf.blit(self.font.render(f"Cost: {anvil.crystal_cost} Crystals", True, (0, 255, 255)), (60, ay + 15))
+                if anvil.error_timer > 0: surf.blit(self.font.render(anvil.error_msg, True, (255, 50, 50)), (60, ay + 45))
+                elif anvil.success_timer > 0: surf.blit(self.font.render(anvil.success_msg, True, (50, 255, 50)), (60, ay + 45))
                 for s in range(anvil.req_slots):
                     sx, sy = 220 + (s * 55), ay + 20
-                    pygame.draw.circle(screen, (10, 10, 15), (sx, sy), 25)
-                    pygame.draw.circle(screen, (100, 100, 100), (sx, sy), 25, 2)
+                    pygame.draw.circle(surf, (10, 10, 15), (sx, sy), 25)
+                    pygame.draw.circle(surf, (100, 100, 100), (sx, sy), 25, 2)
                     if s < len(anvil.slots):
-                        pygame.draw.circle(screen, anvil.slots[s].color, (sx, sy), 22, 3)
-                        try: screen.blit(self.icon_font.render(anvil.slots[s].icon, True, (255, 255, 255)), self.icon_font.render(anvil.slots[s].icon, True, (255, 255, 255)).get_rect(center=(sx, sy)))
+                        pygame.draw.circle(surf, anvil.slots[s].color, (sx, sy), 22, 3)
+                        try: ICON_ATLAS.blit_centered(surf, anvil.slots[s].icon, 32, (sx, sy))
                         except: pass
-                screen.blit(self.title_font.render("->", True, (150, 150, 150)), (220 + (anvil.req_slots*55) + 10, ay + 5))
+                surf.blit(self.title_font.render("->", True, (150, 150, 150)), (220 + (anvil.req_slots*55) + 10, ay + 5))
                 oc = COLOR_EPIC if anvil.out_tier == "Epic" else (COLOR_MYTHIC if anvil.out_tier == "Mythic" else COLOR_LEGENDARY)
-                screen.blit(self.title_font.render(f"{anvil.out_tier}", True, oc), (220 + (anvil.req_slots*55) + 50, ay + 5))
+                surf.blit(self.title_font.render(f"{anvil.out_tier}", True, oc), (220 + (anvil.req_slots*55) + 50, ay + 5))
                 if len(anvil.slots) == anvil.req_slots:
                     mr = pygame.Rect(220 + (anvil.req_slots*55) + 170, ay, 120, 30)
-                    pygame.draw.rect(screen, (0, 255, 100), mr, border_radius=5)
-                    screen.blit(self.font.render("[A] MERGE", True, (0,0,0)), (mr.x + 15, ay + 6))
-            screen.blit(self.title_font.render("AVAILABLE GLYPHS", True, (255,255,255)), (lw + 20, fy + 20))
-            if glyph_slots:
-                stx, sty, sz, sp = lw + 20, 60, 65, 12
-                screen.set_clip(pygame.Rect(lw + 10, fy + 50, 400, self.bag_rows_visible * (sz + sp) + 10))
-                for i, slot in enumerate(glyph_slots):
-                    c, r = i % self.bag_cols, i // self.bag_cols
-                    x, y = stx + c * (sz+sp), sty + (r - self.visual_bag_scroll) * (sz+sp) + fy
-                    if y > sty + fy + (self.bag_rows_visible*(sz+sp)) or y < sty + fy - sz: continue
-                    rect = pygame.Rect(x, y, sz, sz)
-                    pygame.draw.rect(screen, (60, 60, 70) if i == self.bag_idx else (30, 30, 35), rect)
-                    pygame.draw.rect(screen, slot['item'].color, rect, 3)
-                    if i == self.bag_idx: pygame.draw.rect(screen, (255, 215, 0), rect, 5)
-                    try: screen.blit(self.icon_font.render(slot['item'].icon, True, (255, 255, 255)), self.icon_font.render(slot['item'].icon, True, (255, 255, 255)).get_rect(center=rect.center))
-                    except: pass
-                    if slot['count'] > 1: screen.blit(self.font.render(str(slot['count']), True, (255,255,255)), (x + sz - 20, y + sz - 20))
-                screen.set_clip(None)
+                    pygame.draw.rect(surf, (0, 255, 100), mr, border_radius=5)
+                    surf.blit(self.font.render("[A] MERGE", True, (0,0,0)), (mr.x + 15, ay + 6))
+            surf.blit(self.title_font.render("AVAILABLE GLYPHS", True, (255,255,255)), (lw + 20, fy + 20))
 
-        pygame.draw.rect(screen, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
+        pygame.draw.rect(surf, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
         if self.target_socket_idx != -1: legend = "[Stick/D-Pad] Choose Glyph   |   [A] Confirm Placement   |   [B] Cancel Jump"
         elif self.screen_y_level == 1: legend = "[Stick/D-Pad] Navigate Bag (Up to Exit)   |   [A] Fill / Merge   |   [Y] Recall"
         else: legend = "[Stick/D-Pad] Navigate   |   [A] Drag/Swap   |   [B] Return to Bag"
         legend_surf = self.font.render(legend, True, (150, 150, 150))
-        screen.blit(legend_surf, (WIDTH // 2 - legend_surf.get_width() // 2, HEIGHT - 28))
\ No newline at end of file
+        surf.blit(legend_surf, (WIDTH // 2 - legend_surf.get_width() // 2, HEIGHT - 28))
+
+    def _draw_bag(self, surf, glyph_slots, sel_idx):
+        """Glyph bag strip, unscrolled, with sel_idx highlighted (-1 for none)."""
+        sz, sp = 65, 12
+        for i, slot in enumerate(glyph_slots):
+            col, row = i % self.bag_cols, i // self.bag_cols
+            x, y = 10 + col * (sz + sp), 10 + row * (sz + sp)
+            rect = pygame.Rect(x, y, sz, sz)
+            pygame.draw.rect(surf, (60, 60, 70) if i == sel_idx else (30, 30, 35), rect)
+            pygame.draw.rect(surf, slot['item'].color, rect, 3)
+            if i == sel_idx: pygame.draw.rect(surf, (255, 215, 0), rect, 5)
+            try: ICON_ATLAS.blit_centered(surf, slot['item'].icon, 32, rect.center)
+            except: pass
+            if slot['count'] > 1: surf.blit(self.font.render(str(slot['count']), True, (255,255,255)), (x + sz - 20, y + sz - 20))
+
+    def draw(self, screen, current_level, player_inventory):
+        """
+        Retained: the page (grid + forge at the current camera offset) and the two glyph
+        bags are cached layers keyed on sockets, anvils, cursor and bag contents.
+        Bag scroll is a blit offset; the jump pulse is drawn on top.
+        """
+        glyph_slots = player_inventory.get_filtered_slots("GLYPH")
+        if len(glyph_slots) > 0: self.bag_idx = max(0, min(self.bag_idx, len(glyph_slots)-1))
+        yo = math.floor(self.camera_y_offset)
+        bag_key = tuple((s['item'], s['count']) for s in glyph_slots)
+
+        page_key = (yo, current_level, tuple(s.glyph for s in self.socket_list), self.active_pane, self.grid_idx, self.bag_idx,
+                    self.screen_y_level, self.target_socket_idx, self.held_glyph, bag_key, player_inventory.count_item('mat_magic_crystal'),
+                    tuple((tuple(a.slots), a.error_timer > 0 and a.error_msg, a.success_timer > 0 and a.success_msg) for a in self.anvils))
+        self.page_layer.draw(screen, page_key, lambda surf: self._draw_page(surf, yo, current_level, player_inventory, glyph_slots))
+
+        if glyph_slots:
+            sz, sp = 65, 12
+            view_h = self.bag_rows_visible * (sz + sp) + 10
+            scroll_px = math.ceil(self.visual_bag_scroll * (sz + sp))
+            bag_h = max(view_h, 10 + math.ceil(len(glyph_slots) / self.bag_cols) * (sz + sp))
+            is_bag_active = (self.active_pane == "BAG" and self.screen_y_level == 0)
+            area = [pygame.Rect(0, scroll_px, 400, view_h)]
+            screen.set_clip(pygame.Rect(0, 0, WIDTH, HEIGHT - 40)) # Keep the legend bar on top while the pages slide
+            self.bag_layer.resize((400, bag_h))
+            self.bag_layer.draw(screen, (bag_key, self.bag_idx if is_bag_active else -1), 
+                                lambda surf: self._draw_bag(surf, glyph_slots, self.bag_idx if is_bag_active else -1), (10, yo + 50 - scroll_px), area)
+            fy = HEIGHT + yo
+            if fy < HEIGHT and fy + HEIGHT > 0:
+                self.forge_bag_layer.resize((400, bag_h))
+                self.forge_bag_layer.draw(screen, (bag_key, self.bag_idx), 
+                                          lambda surf: self._draw_bag(surf, glyph_slots, self.bag_idx), (WIDTH - 410, fy + 50 - scroll_px), area)
+            screen.set_clip(None)
+
+        # JUMP PULSE JUICE
+        s = self.socket_list[0]
+        if self.pulse_timer > 0 and self.is_socket_unlocked(s, current_level):
+            alpha = int(abs(math.sin(pygame.time.get_ticks() * 0.01)) * 255)
+            self._draw_poly(screen, s.pos.x, s.pos.y + yo, 55, (255, 255, 255, alpha), 3)
@@ -0,0 +1,42 @@
+# src/engine/hitbox.py
+import math
+import numpy as np
+
+# --- BATCH HIT TESTS ---
+# Each test takes an (n, 2) array of enemy centres plus one attack shape and
+# returns (hit mask, push directions): the push direction is the unit vector
+# from the shape's origin to each enemy ((0, 1) for an enemy exactly on it).
+
+def _offsets(points, origin):
+    vec = np.asarray(points, dtype=np.float64).reshape(-1, 2) - (origin[0], origin[1])
+    dist = np.hypot(vec[:, 0], vec[:, 1])
+    push = np.tile((0.0, 1.0), (len(vec), 1))
+    moved = dist > 0
+    push[moved] = vec[moved] / dist[moved, None]
+    return vec, dist, push
+
+def box_hits(points, origin, forward, side, back, length, half_width):
+    """Oriented rectangle: -back..length along forward, +-half_width along side."""
+    vec, dist, push = _offsets(points, origin)
+    fwd = vec[:, 0] * forward[0] + vec[:, 1] * forward[1]
+    lat = vec[:, 0] * side[0] + vec[:, 1] * side[1]
+    return (fwd >= -back) & (fwd <= length) & (np.abs(lat) <= half_width), push
+
+def cone_hits(points, apex, direction, half_angle, reach):
+    """Circle sector of +-half_angle degrees around direction, up to reach."""
+    vec, dist, push = _offsets(points, apex)
+    dx, dy = direction[0], direction[1]
+    norm = math.hypot(dx, dy) or 1.0
+    facing = (push[:, 0] * dx + push[:, 1] * dy) / norm
+    return (dist > 0) & (dist <= reach) & (facing >= math.cos(math.radians(half_angle))), push
+
+def circle_hits(points, center, radius):
+    vec, dist, push = _offsets(points, center)
+    return (dist > 0) & (dist <= radius), push
+
+def arc_hits(points, center, facing_deg, start_deg, end_deg, reach):
+    """Enemies within reach whose bearing, relative to facing_deg, lies in [start_deg, end_deg)."""
+    vec, dist, push = _offsets(points, center)
+    bearing = np.degrees(np.arctan2(vec[:, 1], vec[:, 0]))
+    rel = np.mod(bearing - facing_deg + 180, 360) - 180
+    return (dist > 0) & (dist <= reach) & (rel >= start_deg) & (rel < end_deg), push
@@ -92,4 +92,57 @@ class InputManager:
             if event.key == pygame.K_i: return True
         if event and event.type == pygame.JOYBUTTONDOWN:
             if event.button == 6: return True # Back/Select
-        return False
\ No newline at end of file
+        return False
+
+class ScriptedInput(InputManager):
+    """
+    Deterministic stand-in for InputManager (benchmarks / headless runs).
+    - script: list of steps {'ticks': N, 'hold': [...], 'press': [...]}. Steps before
+      loop_from run once (setup), the rest loop forever.
+    - 'hold' names stay down for the whole step: up/down/left/right, attack, dash,
+      skill1-3, menu. 'aim': (x, y) acts like the right stick. 'press' entries are
+      pygame key constants sent as KEYDOWN events on the step's first tick.
+    """
+    HOLD_NAMES = ('up', 'down', 'left', 'right', 'attack', 'dash', 'skill1', 'skill2', 'skill3', 'menu')
+
+    def __init__(self, script, loop_from=0):
+        self.joystick = None # Never touch real devices
+        self.script = script
+        self.loop_from = loop_from
+        self.step_index = 0
+        self.step_tick = 0
+        self.held = set()
+        self.aim = Vector2(0, 0)
+
+    def _scan_controllers(self): pass
+    def handle_hotplug(self, event): pass
+
+    def poll_events(self):
+        """Advances the script by one tick and returns this tick's pygame events."""
+        step = self.script[self.step_index]
+        events = []
+        if self.step_tick == 0:
+            self.held = set(step.get('hold', ()))
+            self.aim = Vector2(step.get('aim', (0, 0)))
+            events = [pygame.event.Event(pygame.KEYDOWN, key=k, mod=0, unicode="", scancode=0) for k in step.get('press', ())]
+        self.step_tick += 1
+        if self.step_tick >= step.get('ticks', 1):
+            self.step_tick = 0
+            self.step_index += 1
+            if self.step_index >= len(self.script): self.step_index = self.loop_from
+        return events
+
+    def get_movement_vector(self):
+        vec = Vector2(('right' in self.held) - ('left' in self.held), ('down' in self.held) - ('up' in self.held))
+        return vec.normalize() if vec.length() > 0 else vec
+
+    def at_loop_start(self):
+        return self.step_index == self.loop_from and self.step_tick == 0
+
+    def get_aim_vector(self): return Vector2(self.aim)
+    def is_attack_pressed(self): return 'attack' in self.held
+    def is_dash_pressed(self): return 'dash' in self.held
+    def is_skill_1_pressed(self): return 'skill1' in self.held
+    def is_skill_2_pressed(self): return 'skill2' in self.held
+    def is_skill_3_pressed(self): return 'skill3' in self.held
+    def is_menu_pressed(self): return 'menu' in self.held
@@ -1,9 +1,21 @@
 # item_database.py
 import os
 import csv
+import random
+import json
+import hashlib
 from settings import *
 
 class GameItem:
+    """
+    Shared, read-only item definition (flyweight): ItemRegistry builds one per item_id and
+    drops, stacks, sockets and equipment slots all reference it, nothing copies it.
+    - Per-instance state (equipped) lives in the inventory slot, not on the item.
+    - __slots__ keeps each definition small and rejects stray per-instance attributes.
+    """
+    __slots__ = ('item_id', 'name', 'category', 'rarity', 'icon', 'equip_slot',
+                 'effect_stat', 'effect_value', 'max_stack', 'is_consumable', 'damage_type')
+
     def __init__(self, item_id, name, category, rarity, icon, equip_slot=None):
         self.item_id = item_id
         self.name = name
@@ -18,9 +30,6 @@ class GameItem:
         self.is_consumable = "False"
         self.damage_type = "N/A"
         
-        # THE FIX: Explicitly setting it to prevent Ghost Variable crashes
-        self.is_equipped = False
-        
     @property
     def color(self):
         if self.rarity == "Rare": return COLOR_RARE
@@ -37,20 +46,24 @@ class GameItem:
         ]
 
 class GlyphItem(GameItem):
+    __slots__ = ()
+
     def __init__(self, item_id, name, rarity, effect_stat, effect_value, icon):
         super().__init__(item_id, name, "Glyph", rarity, icon)
         self.effect_stat = effect_stat   
         self.effect_value = effect_value 
-        self.is_equipped = False # Redundant safety net
 
 class EquipmentItem(GameItem):
+    __slots__ = ()
+
     def __init__(self, item_id, name, category, rarity, equip_slot, stat, value, icon):
         super().__init__(item_id, name, category, rarity, icon, equip_slot)
         self.effect_stat = stat
         self.effect_value = value
-        self.is_equipped = False # Redundant safety net
 
 class PotionItem(GameItem):
+    __slots__ = ()
+
     def __init__(self, item_id, name, rarity, heal_amount, icon):
         super().__init__(item_id, name, "Potion", rarity, icon)
         self.effect_stat = "Health"
@@ -58,19 +71,162 @@ class PotionItem(GameItem):
         self.is_consumable = "True"
 
 class MaterialItem(GameItem):
+    __slots__ = ()
+
     def __init__(self, item_id, name, rarity, description, icon, max_stack=100):
         super().__init__(item_id, name, "Material", rarity, icon)
         self.effect_stat = "Crafting"
         self.effect_value = description
         self.max_stack = max_stack 
 
+class AliasTable:
+    """
+    Walker / Vose alias table: weighted sampling in O(1) (one column pick + one coin)
+    after an O(n) build. Entries may be None for "no drop".
+    - Columns whose probability is 1 skip the coin, so an evenly weighted table draws
+      exactly like random.choice over the same list.
+    """
+    __slots__ = ('entries', 'prob', 'alias')
+
+    def __init__(self, entries, weights=None):
+        self.entries = list(entries)
+        n = len(self.entries)
+        weights = [1.0] * n if weights is None else [float(w) for w in weights]
+        total = sum(weights)
+        self.prob, self.alias = [1.0] * n, list(range(n))
+        if not n or total <= 0: return
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s], self.alias[s] = scaled[s], l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to float error
+
+    def roll(self):
+        if not self.entries: return None
+        i = random.randrange(len(self.entries))
+        if self.prob[i] >= 1.0 or random.random() < self.prob[i]: return self.entries[i]
+        return self.entries[self.alias[i]]
+
+class LootTables:
+    """
+    Drop tables per loot source, built once when the registry loads (no per-kill pool filtering).
+    - monster: MONSTER_ITEM_CHANCE of one item from the enemy loot pool, MONSTER_CRYSTAL_CHANCE of a crystal
+    - ore: always a glyph (rarity by ORE_RARITY_WEIGHTS, then evenly within it), ORE_CRYSTAL_CHANCE of a crystal
+    - roll(sources) rolls a batch of kills (AoE clears) in kill order, one source per
+      kill, yielding each kill's drops. Both levels are lazy, so the caller's own random
+      use per drop (scatter) stays interleaved with the rolls.
+    - Monster rolls draw from random exactly like the old per-kill code; ore rolls take
+      one alias draw instead of rarity + choice, so seeded runs with ore kills differ.
+    """
+    MONSTER_ITEM_CHANCE = 0.4
+    MONSTER_CRYSTAL_CHANCE = 0.2
+    ORE_CRYSTAL_CHANCE = 0.5
+    ORE_RARITY_WEIGHTS = {"Rare": 0.70, "Epic": 0.24, "Mythic": 0.05, "Legendary": 0.01}
+
+    def __init__(self, registry):
+        self.crystal = registry.items.get("mat_magic_crystal")
+        self.monster = AliasTable(registry.get_enemy_loot_pool())
+
+        glyphs = registry.get_all_glyphs()
+        self.glyphs_by_rarity = {r: [g for g in glyphs if g.rarity == r] for r in self.ORE_RARITY_WEIGHTS}
+        # One table over every glyph: rarity weight split evenly inside the rarity.
+        # A rarity without glyphs keeps its share as a None (no drop), like the old per-rarity filter
+        entries, weights = [], []
+        for rarity, weight in self.ORE_RARITY_WEIGHTS.items():
+            pool = self.glyphs_by_rarity[rarity]
+            if not pool: entries.append(None); weights.append(weight)
+            for g in pool: entries.append(g); weights.append(weight / len(pool))
+        self.ore = AliasTable(entries, weights)
+
+    def _roll_monster(self):
+        if random.random() < self.MONSTER_ITEM_CHANCE:
+            item = self.monster.roll()
+            if item: yield item
+        if random.random() < self.MONSTER_CRYSTAL_CHANCE and self.crystal: yield self.crystal
+
+    def _roll_ore(self):
+        glyph = self.ore.roll()
+        if glyph: yield glyph
+        if random.random() < self.ORE_CRYSTAL_CHANCE and self.crystal: yield self.crystal
+
+    def roll(self, sources):
+        for source in sources: yield self._roll_ore() if source == "ore" else self._roll_monster()
+
+# --- COMPILED SNAPSHOT ---
+ITEM_CACHE_VERSION = 2 # Bump when the snapshot layout (GameItem.__slots__) changes
+_ITEM_CLASSES = {cls.__name__: cls for cls in (GameItem, GlyphItem, EquipmentItem, PotionItem, MaterialItem)}
+
+def _content_hash():
+    """Item content is defined in this file, so its source (plus the layout version) is the content key."""
+    with open(__file__, 'rb') as f: source = f.read()
+    return hashlib.sha1(source + f"|v{ITEM_CACHE_VERSION}".encode()).hexdigest()
+
+def _cache_path():
+    folder = ITEM_CACHE_DIR or os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "capstone_crawler")
+    return os.path.join(folder, "items.json")
+
+def _write_atomic(path, write):
+    """Writes via a per-process temp file + rename, so parallel runs never see half a file.
+    Returns False (and writes nothing) on read-only installs."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        folder = os.path.dirname(path)
+        if folder: os.makedirs(folder, exist_ok=True)
+        write(tmp)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        try: os.remove(tmp)
+        except OSError: pass
+        return False
+
 class ItemRegistry:
+    """
+    Every item definition, keyed by item_id (insertion order is the loot/menu order).
+    - Loads from a compiled snapshot (plain field lists, as JSON) when its content hash
+      matches this module; otherwise builds the items in code, then refreshes the
+      snapshot and the DB_CSV_PATH export. A normal launch only writes the export
+      if it is missing.
+    - Writes are atomic and skipped on read-only installs.
+    """
     HEADERS = ['ID', 'Name', 'Category', 'Rarity', 'Effect_Stat', 'Effect_Value', 'Max_Stack', 'Is_Consumable', 'Damage_Type', 'Icon', 'Equip_Slot']
     
-    def __init__(self):
+    def __init__(self, cache_path=None):
         self.items = {}
-        self._initialize_game_content()
-        self._sync_with_csv()
+        self.cache_path = cache_path or _cache_path()
+        content_hash = _content_hash()
+        if not self._load_snapshot(content_hash):
+            self._initialize_game_content()
+            self._save_snapshot(content_hash)
+            self._write_full_csv()
+        elif DB_CSV_PATH and not os.path.exists(DB_CSV_PATH):
+            self._write_full_csv()
+        self.loot = LootTables(self)
+
+    def _load_snapshot(self, content_hash):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f: snapshot = json.load(f)
+            if not isinstance(snapshot, dict) or snapshot.get('hash') != content_hash: return False
+            for class_name, values in snapshot['items']:
+                cls = _ITEM_CLASSES[class_name]
+                item = cls.__new__(cls)
+                for field, value in zip(GameItem.__slots__, values): setattr(item, field, value)
+                self.items[item.item_id] = item
+            return True
+        except (OSError, ValueError, KeyError, TypeError, EOFError): # Missing or corrupt: rebuild from code
+            self.items = {}
+            return False
+
+    def _save_snapshot(self, content_hash):
+        rows = [(type(item).__name__, [getattr(item, f) for f in GameItem.__slots__]) for item in self.items.values()]
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f: json.dump({'hash': content_hash, 'items': rows}, f, ensure_ascii=False)
+        _write_atomic(self.cache_path, write)
 
     def _initialize_game_content(self):
         raw_items = [
@@ -124,18 +280,15 @@ class ItemRegistry:
                 eq_item = EquipmentItem(item_id, final_name, t_cat, rarity, t_slot, t_stat, final_val, t_icon)
                 self.items[item_id] = eq_item
 
-    def _sync_with_csv(self):
-        if not os.path.exists(DB_CSV_PATH):
-            self._write_full_csv()
-            return
-        self._write_full_csv() 
-
     def _write_full_csv(self):
-        with open(DB_CSV_PATH, mode='w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(self.HEADERS)
-            for item in self.items.values():
-                writer.writerow(item.get_csv_row())
+        if not DB_CSV_PATH: return
+        def write(path):
+            with open(path, mode='w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.HEADERS)
+                for item in self.items.values():
+                    writer.writerow(item.get_csv_row())
+        _write_atomic(DB_CSV_PATH, write)
 
     def get_all_items_list(self):
         return list(self.items.values())
@@ -146,4 +299,9 @@ class ItemRegistry:
     def get_all_glyphs(self):
         return [item for item in self.items.values() if item.category == "Glyph"]
 
-GLOBAL_DB = ItemRegistry()
\ No newline at end of file
+def __getattr__(name):
+    # GLOBAL_DB is built on first use rather than at import
+    if name == "GLOBAL_DB":
+        db = globals()["GLOBAL_DB"] = ItemRegistry()
+        return db
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
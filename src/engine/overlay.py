@@ -0,0 +1,49 @@
+# src/engine/overlay.py
+import math
+import pygame
+
+class AlphaOverlay:
+    """
+    Translucent attack / skill shapes without a full-screen SRCALPHA surface per frame.
+    - draw() takes a list of shapes that belong together (they overwrite each other
+      exactly like they did on the old full-screen surface):
+        ('polygon', color, points) / ('circle', color, center, radius)
+    - They go into one persistent scratch surface, only over their bounding box;
+      that region is cleared, drawn, and blitted to the screen in one go.
+    """
+    def __init__(self):
+        self.surf = None
+
+    def _bounds(self, shapes):
+        xs, ys = [], []
+        for shape in shapes:
+            if shape[0] == 'polygon':
+                xs.extend(p[0] for p in shape[2])
+                ys.extend(p[1] for p in shape[2])
+            else:
+                (cx, cy), r = shape[2], shape[3]
+                xs += [cx - r, cx + r]
+                ys += [cy - r, cy + r]
+        x0, y0 = math.floor(min(xs)), math.floor(min(ys))
+        return pygame.Rect(x0, y0, math.ceil(max(xs)) - x0 + 2, math.ceil(max(ys)) - y0 + 2)
+
+    def draw(self, screen, shapes):
+        box = self._bounds(shapes).clip(screen.get_rect())
+        if box.w <= 0 or box.h <= 0: return
+
+        # Grow the scratch surface on demand (it never shrinks)
+        if self.surf is None or self.surf.get_width() < box.w or self.surf.get_height() < box.h:
+            w, h = box.w, box.h
+            if self.surf is not None: w, h = max(w, self.surf.get_width()), max(h, self.surf.get_height())
+            self.surf = pygame.Surface((w, h), pygame.SRCALPHA)
+
+        area = pygame.Rect(0, 0, box.w, box.h)
+        self.surf.fill((0, 0, 0, 0), area)
+        ox, oy = box.x, box.y
+        for shape in shapes:
+            if shape[0] == 'polygon':
+                pygame.draw.polygon(self.surf, shape[1], [(p[0] - ox, p[1] - oy) for p in shape[2]])
+            else:
+                center = shape[2]
+                pygame.draw.circle(self.surf, shape[1], (center[0] - ox, center[1] - oy), shape[3])
+        screen.blit(self.surf, box.topleft, area)
@@ -0,0 +1,161 @@
+# src/engine/perf.py
+import os
+import sys
+import csv
+import json
+import time
+from collections import deque
+
+def _percentiles(values, qs=(0.50, 0.95, 0.99)):
+    data = sorted(values)
+    if not data: return [0.0 for _ in qs]
+    return [data[min(len(data) - 1, int(q * len(data)))] for q in qs]
+
+class PerfTimer:
+    """
+    Lightweight per-subsystem frame timer.
+    - begin(name) / end(name) around a block; end_frame() closes the frame.
+    - Keeps the last `history` frames per section for percentiles.
+    - count(name, n) / gauge(name, value) feed per-frame counters (rects tested,
+      flow field expansions, resident chunks...). Net allocated memory blocks are
+      counted automatically as 'alloc_blocks'.
+    - frame_times holds the wall time between end_frame() calls (the frame graph).
+    - start_capture(frames, prefix) records one row per frame and writes
+      prefix.csv / prefix.json once the window is full.
+    """
+    def __init__(self, history=3600):
+        self.history = history
+        self.frame = {}      # name -> ms spent this frame
+        self.samples = {}    # name -> deque of per-frame ms
+        self.totals = {}     # name -> total ms since reset
+        self.frames = 0
+        self._open = {}
+
+        self.counters = {}        # name -> value this frame
+        self.counter_samples = {} # name -> deque of per-frame values
+        self.counter_totals = {}  # name -> total since reset
+        self.frame_times = deque(maxlen=history)
+        self._last_frame = None
+        self._blocks = sys.getallocatedblocks()
+
+        self.capture = None       # Rows of the capture window in progress
+        self.capture_left = 0
+        self.capture_prefix = None
+        self.last_capture = None  # (csv path, json path) of the last finished capture
+
+    def begin(self, name):
+        self._open[name] = time.perf_counter()
+
+    def end(self, name):
+        t0 = self._open.pop(name, None)
+        if t0 is None: return
+        ms = (time.perf_counter() - t0) * 1000.0
+        self.frame[name] = self.frame.get(name, 0.0) + ms
+        self.totals[name] = self.totals.get(name, 0.0) + ms
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        self.counters[name] = value
+
+    def end_frame(self):
+        now = time.perf_counter()
+        frame_ms = (now - self._last_frame) * 1000.0 if self._last_frame is not None else 0.0
+        if self._last_frame is not None: self.frame_times.append(frame_ms)
+        self._last_frame = now
+        blocks = sys.getallocatedblocks()
+        self.counters['alloc_blocks'] = blocks - self._blocks
+        self._blocks = blocks
+
+        for name in self.totals:
+            if name not in self.samples: self.samples[name] = deque(maxlen=self.history)
+            self.samples[name].append(self.frame.get(name, 0.0))
+        for name, value in self.counters.items():
+            if name not in self.counter_samples:
+                self.counter_samples[name] = deque(maxlen=self.history)
+                self.counter_totals[name] = 0
+            self.counter_totals[name] += value
+        for name, values in self.counter_samples.items():
+            values.append(self.counters.get(name, 0))
+
+        if self.capture is not None: self._record(frame_ms)
+        self.frame = {}
+        self.counters = {}
+        self.frames += 1
+
+    def reset(self):
+        self.__init__(self.history)
+
+    def report(self):
+        """{section: {total_ms, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} over the kept history."""
+        out = {}
+        for name, total in self.totals.items():
+            data = self.samples.get(name)
+            if not data: continue
+            p50, p95, p99 = _percentiles(data)
+            out[name] = {
+                'total_ms': round(total, 3),
+                'mean_ms': round(total / max(1, self.frames), 4),
+                'p50_ms': round(p50, 4),
+                'p95_ms': round(p95, 4),
+                'p99_ms': round(p99, 4),
+                'max_ms': round(max(data), 4),
+            }
+        return out
+
+    def counter_report(self):
+        """{counter: {total, mean, p95, max}} over the kept history."""
+        out = {}
+        for name, values in self.counter_samples.items():
+            if not values: continue
+            out[name] = {
+                'total': self.counter_totals[name],
+                'mean': round(self.counter_totals[name] / max(1, self.frames), 2),
+                'p95': _percentiles(values, (0.95,))[0],
+                'max': max(values),
+            }
+        return out
+
+    def frame_percentiles(self, window=None):
+        """(p50, p95, p99, max) frame time in ms over the last `window` frames (all kept if None)."""
+        times = list(self.frame_times)[-window:] if window else list(self.frame_times)
+        return (*_percentiles(times), max(times) if times else 0.0)
+
+    # --- CAPTURE WINDOW ---
+    def start_capture(self, frames, prefix=None):
+        self.capture, self.capture_left = [], frames
+        self.capture_prefix = prefix or time.strftime("perf_capture_%Y%m%d_%H%M%S")
+
+    def _record(self, frame_ms):
+        row = {'frame': self.frames, 'frame_ms': round(frame_ms, 4)}
+        for name in self.totals: row[name + '_ms'] = round(self.frame.get(name, 0.0), 4)
+        for name in self.counter_samples: row[name] = self.counters.get(name, 0)
+        self.capture.append(row)
+        self.capture_left -= 1
+        if self.capture_left <= 0:
+            rows, self.capture = self.capture, None
+            self.last_capture = self.export(rows, self.capture_prefix)
+
+    def export(self, rows, prefix):
+        """Writes rows to prefix.csv and (with a summary) prefix.json; returns both paths."""
+        folder = os.path.dirname(prefix)
+        if folder: os.makedirs(folder, exist_ok=True)
+        columns = []
+        for row in rows:
+            columns.extend(k for k in row if k not in columns)
+        csv_path, json_path = prefix + ".csv", prefix + ".json"
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval=0)
+            writer.writeheader()
+            writer.writerows(rows)
+        times = [r['frame_ms'] for r in rows]
+        p50, p95, p99 = _percentiles(times)
+        summary = {'frames': len(rows), 'frame_ms': {'p50': p50, 'p95': p95, 'p99': p99, 'max': max(times, default=0.0)},
+                   'sections': self.report(), 'counters': self.counter_report()}
+        with open(json_path, "w") as f:
+            json.dump({'summary': summary, 'frames': rows}, f, indent=1)
+        print(f"[PERF] Capture of {len(rows)} frames saved to {csv_path} / {json_path}")
+        return csv_path, json_path
+
+PERF = PerfTimer() # Process-wide timer, so engine modules can feed counters without a game reference
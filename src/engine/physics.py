@@ -1,18 +1,149 @@
 import pygame
+import numpy as np
+import settings
+from settings import CHUNK_SIZE, TILE_SIZE, WALL_CELL_TILES, WALL_BROADPHASE_MIN_RECTS
+from engine.perf import PERF
+
+def frame_lerp(t):
+    """Per-step lerp factor equivalent to `t` per tuned (60 Hz) frame at the current SIM_HZ."""
+    return 1.0 - (1.0 - t) ** settings.FRAME_SCALE
+
+class WallGrid:
+    """
+    Broadphase over the walls near a point (built by UniverseManager.get_nearby_walls).
+    - query(rect) only returns the mesh rects bucketed in the cells rect overlaps
+      (sparse neighbourhoods just hand back the flat list), in flat-list order so
+      walls resolve in the same order as a brute-force pass.
+    - Still iterable / truthy like the old flat wall list.
+    """
+    def __init__(self, chunks, placeholders):
+        self.chunks = chunks              # (cx, cy) -> WorldChunk (with wall_cells)
+        self.placeholders = placeholders  # Solid stand-ins for chunks that aren't loaded yet
+        self.flat = [wall for chunk in chunks.values() for wall in chunk.rects] + placeholders
+        self.bases = {}                   # (cx, cy) -> index of the chunk's first rect in self.flat
+        base = 0
+        for key, chunk in chunks.items():
+            self.bases[key] = base
+            base += len(chunk.rects)
+        self._array = None
+
+    def query(self, rect):
+        # Sparse neighbourhoods: one C-level collidelistall over everything is cheaper
+        if len(self.flat) <= WALL_BROADPHASE_MIN_RECTS: return self.flat
+        chunk_px = CHUNK_SIZE * TILE_SIZE
+        found = set() # Indices into self.flat (big rects span several cells)
+        for cy in range(rect.top // chunk_px, (rect.bottom - 1) // chunk_px + 1):
+            for cx in range(rect.left // chunk_px, (rect.right - 1) // chunk_px + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is not None: self._query_cells(chunk, self.bases[(cx, cy)], rect, cx * chunk_px, cy * chunk_px, found)
+        if self.placeholders:
+            base = len(self.flat) - len(self.placeholders)
+            found.update(base + i for i, p in enumerate(self.placeholders) if p.colliderect(rect))
+        flat = self.flat
+        return [flat[i] for i in sorted(found)]
+
+    def query_move(self, rect, velocity):
+        """Walls that rect could touch while moving by velocity (its swept box)."""
+        if len(self.flat) <= WALL_BROADPHASE_MIN_RECTS: return self.flat
+        return self.query(rect.union(rect.move(velocity.x, velocity.y)).inflate(2, 2))
+
+    def _query_cells(self, chunk, base, rect, ox, oy, found):
+        cell_px = WALL_CELL_TILES * TILE_SIZE
+        n = CHUNK_SIZE // WALL_CELL_TILES
+        gx0, gx1 = max(0, (rect.left - ox) // cell_px), min(n - 1, (rect.right - 1 - ox) // cell_px)
+        gy0, gy1 = max(0, (rect.top - oy) // cell_px), min(n - 1, (rect.bottom - 1 - oy) // cell_px)
+        for gy in range(gy0, gy1 + 1):
+            for gx in range(gx0, gx1 + 1):
+                found.update(base + i for i in chunk.wall_cells[gy * n + gx])
+
+    def as_array(self):
+        """All walls as one (n, 4) [left, top, right, bottom] array, in self.flat order."""
+        if self._array is None:
+            parts = [chunk.rect_array for chunk in self.chunks.values()]
+            parts.append(np.array([(p.left, p.top, p.right, p.bottom) for p in self.placeholders], dtype=np.int64).reshape(-1, 4))
+            self._array = np.concatenate(parts)
+        return self._array
+
+    def __iter__(self):
+        return iter(self.flat)
+
+    def __len__(self):
+        return len(self.flat)
+
+
+def move_and_slide(rect, velocity, walls, carry=None):
+    """
+    Moves rect by velocity (pixels per tuned frame, scaled to one logic step).
+    carry (a Vector2 owned by the entity) keeps the sub-pixel remainder between
+    steps, so slow movement isn't rounded away by the integer Rect.
+    """
+    move_x, move_y = velocity.x * settings.FRAME_SCALE, velocity.y * settings.FRAME_SCALE
+    if carry is not None:
+        move_x, move_y = move_x + carry.x, move_y + carry.y
+        carry.x, carry.y = move_x - int(move_x), move_y - int(move_y)
+        move_x, move_y = int(move_x), int(move_y)
+
+    # 0. Broadphase: only walls around the swept box
+    if isinstance(walls, WallGrid): walls = walls.query_move(rect, pygame.math.Vector2(move_x, move_y))
+    PERF.count("rects_tested", 2 * len(walls))
 
-def move_and_slide(rect, velocity, walls):
     # 1. Horizontal
-    rect.x += velocity.x
-    hit_list = [wall for wall in walls if rect.colliderect(wall)]
+    rect.x += move_x
+    hit_list = [walls[i] for i in rect.collidelistall(walls)]
     for wall in hit_list:
-        if velocity.x > 0: rect.right = wall.left
-        elif velocity.x < 0: rect.left = wall.right
+        if move_x > 0: rect.right = wall.left
+        elif move_x < 0: rect.left = wall.right
+    if hit_list and carry is not None: carry.x = 0
     
     # 2. Vertical
-    rect.y += velocity.y
-    hit_list = [wall for wall in walls if rect.colliderect(wall)]
+    rect.y += move_y
+    hit_list = [walls[i] for i in rect.collidelistall(walls)]
     for wall in hit_list:
-        if velocity.y > 0: rect.bottom = wall.top
-        elif velocity.y < 0: rect.top = wall.bottom
+        if move_y > 0: rect.bottom = wall.top
+        elif move_y < 0: rect.top = wall.bottom
+    if hit_list and carry is not None: carry.y = 0
             
-    return rect
\ No newline at end of file
+    return rect
+
+def _wall_array(walls):
+    if isinstance(walls, WallGrid): return walls.as_array()
+    return np.array([(w.left, w.top, w.right, w.bottom) for w in walls], dtype=np.int64).reshape(-1, 4)
+
+def _last_hit(n, ents, walls_idx, hit):
+    """Per entity, the last wall (in wall order) it hit, or -1. Mirrors move_and_slide's 'last wall wins'."""
+    last = np.full(n, -1, dtype=np.int64)
+    np.maximum.at(last, ents[hit], walls_idx[hit])
+    return last
+
+def slide_many(x, y, w, h, move_x, move_y, walls):
+    """
+    Batched move_and_slide for many rects at once (integer moves, already carried).
+    x, y, w, h, move_x, move_y are int arrays; returns (new_x, new_y, hit_x, hit_y).
+    """
+    arr = _wall_array(walls)
+    n = x.size
+    if not n or not arr.size:
+        return x + move_x, y + move_y, np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+    wl, wt, wr, wb = arr[:, 0], arr[:, 1], arr[:, 2], arr[:, 3]
+    PERF.count("rects_tested", 2 * n * len(arr))
+
+    # 1. Horizontal (candidates: walls touching the swept box)
+    nx = x + move_x
+    left, right = np.minimum(x, nx), np.maximum(x, nx) + w
+    ents, idx = np.nonzero((left[:, None] < wr) & (wl < right[:, None]) & (y[:, None] < wb) & (wt < (y + h)[:, None]))
+    hit = (nx[ents] < wr[idx]) & (wl[idx] < nx[ents] + w[ents])
+    last = _last_hit(n, ents, idx, hit)
+    hit_x = last >= 0
+    nx = np.where(hit_x & (move_x > 0), wl[last] - w, nx)
+    nx = np.where(hit_x & (move_x < 0), wr[last], nx)
+
+    # 2. Vertical
+    ny = y + move_y
+    top, bottom = np.minimum(y, ny), np.maximum(y, ny) + h
+    ents, idx = np.nonzero((nx[:, None] < wr) & (wl < (nx + w)[:, None]) & (top[:, None] < wb) & (wt < bottom[:, None]))
+    hit = (ny[ents] < wb[idx]) & (wt[idx] < ny[ents] + h[ents])
+    last = _last_hit(n, ents, idx, hit)
+    hit_y = last >= 0
+    ny = np.where(hit_y & (move_y > 0), wt[last] - h, ny)
+    ny = np.where(hit_y & (move_y < 0), wb[last], ny)
+    return nx, ny, hit_x, hit_y
@@ -0,0 +1,95 @@
+# src/engine/spatial.py
+import math
+import numpy as np
+from settings import COMBAT_CELL_SIZE
+
+class SpatialHash:
+    """
+    Uniform grid over entity centres, for attack hit queries.
+    - invalidate(entities, swarm) once per tick; the first query that tick rebuilds
+      the buckets (ticks without an attack cost nothing). Swarm enemies' centres
+      come straight from the EnemySwarm arrays.
+    - query_indices(x0, y0, x1, y1) returns the indices (into the entity list) of
+      candidates whose centre lies in a cell the box touches, in their original
+      list order (so hits, kills and loot rolls happen in the same order as before).
+    - circle_bounds / box_bounds / cone_bounds turn an attack shape into that box;
+      the exact hit test runs on self.centers[idx] (engine.hitbox).
+    """
+    def __init__(self, cell_size=COMBAT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.entities = []
+        self.swarm = None
+        self.centers = np.zeros((0, 2))  # Entity centres at rebuild time, in list order
+        self.order = np.zeros(0, dtype=np.int64)       # Entity indices sorted by cell key
+        self.sorted_keys = np.zeros(0, dtype=np.int64)
+        self.stale = True
+
+    def invalidate(self, entities, swarm=None):
+        self.entities = entities
+        self.swarm = swarm
+        self.stale = True
+
+    def _rebuild(self):
+        ents = self.entities
+        n = len(ents)
+        slots = np.fromiter((s if s is not None else -1 for s in (getattr(e, 'slot', None) for e in ents)), dtype=np.int64, count=n)
+        in_swarm = (slots >= 0) if self.swarm is not None else np.zeros(n, dtype=bool)
+        centers = np.zeros((n, 2))
+        if in_swarm.any():
+            sx, sy = self.swarm.centers()
+            centers[in_swarm, 0], centers[in_swarm, 1] = sx[slots[in_swarm]], sy[slots[in_swarm]]
+        for i in np.nonzero(~in_swarm)[0]: centers[i] = ents[i].rect.center
+        self.centers = centers
+
+        # Bucket by cell: entity indices sorted by cell key (stable, so a cell keeps list order)
+        cell = np.floor_divide(centers, self.cell_size).astype(np.int64)
+        keys = self._key(cell[:, 0], cell[:, 1])
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+        self.stale = False
+
+    @staticmethod
+    def _key(gx, gy):
+        return gx * (1 << 32) + (gy + (1 << 31))
+
+    def query_indices(self, x0, y0, x1, y1):
+        """Sorted indices of entities bucketed in the cells overlapping the box."""
+        if self.stale: self._rebuild()
+        size = self.cell_size
+        gx, gy = np.meshgrid(np.arange(int(x0 // size), int(x1 // size) + 1),
+                             np.arange(int(y0 // size), int(y1 // size) + 1))
+        wanted = self._key(gx.ravel(), gy.ravel())
+        lo = np.searchsorted(self.sorted_keys, wanted, 'left')
+        hi = np.searchsorted(self.sorted_keys, wanted, 'right')
+        found = [self.order[a:b] for a, b in zip(lo.tolist(), hi.tolist()) if b > a]
+        if not found: return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate(found))
+
+    @staticmethod
+    def circle_bounds(center, radius):
+        return center[0] - radius, center[1] - radius, center[0] + radius, center[1] + radius
+
+    @staticmethod
+    def box_bounds(origin, forward, side, back, length, half_width):
+        """Oriented box: from -back to +length along forward, +-half_width along side."""
+        corners = [(origin[0] + forward[0] * f + side[0] * s, origin[1] + forward[1] * f + side[1] * s)
+                   for f in (-back, length) for s in (-half_width, half_width)]
+        xs, ys = [c[0] for c in corners], [c[1] for c in corners]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    @staticmethod
+    def cone_bounds(apex, direction, half_angle, reach):
+        """Circle sector around direction (half_angle in degrees) up to reach."""
+        mid = math.degrees(math.atan2(direction[1], direction[0]))
+        angles = [mid - half_angle, mid + half_angle]
+        # The arc bulges past its end points where it crosses an axis
+        angles += [a for a in range(-360, 361, 90) if mid - half_angle < a < mid + half_angle]
+        xs = [apex[0]] + [apex[0] + math.cos(math.radians(a)) * reach for a in angles]
+        ys = [apex[1]] + [apex[1] + math.sin(math.radians(a)) * reach for a in angles]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def __iter__(self):
+        return iter(self.entities)
+
+    def __len__(self):
+        return len(self.entities)
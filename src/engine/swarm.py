@@ -0,0 +1,199 @@
+# src/engine/swarm.py
+import numpy as np
+import settings
+from settings import *
+from engine.physics import slide_many, frame_lerp
+
+# State strings <-> small ints for the state column
+ENEMY_STATES = (ENEMY_CHASING, ENEMY_WINDUP, ENEMY_RECOVERING, ENEMY_STUNNED, ENEMY_STAGGERED)
+STATE_ID = {name: i for i, name in enumerate(ENEMY_STATES)}
+CHASING, WINDUP, RECOVERING, STUNNED, STAGGERED = range(len(ENEMY_STATES))
+
+ENEMY_SIZE = 26
+ENEMY_ATTACK_RANGE = 45
+
+class EnemySwarm:
+    """
+    Struct-of-arrays store for every chasing enemy.
+    - One NumPy column per field (position, velocity, hp, state, timers...).
+    - update() runs movement, collision and the CHASING/WINDUP/RECOVERING/
+      STUNNED/STAGGERED state machine for all enemies at once.
+    - Enemy objects (engine.entities) are thin views onto a slot, used by
+      combat and drawing; compact() drops dead slots and renumbers the views.
+    """
+    FLOAT_COLUMNS = ('vx', 'vy', 'carry_x', 'carry_y', 'aim_x', 'aim_y', 'hp', 'max_hp',
+                     'shield', 'damage', 'speed', 'timer', 'visual')
+    INT_COLUMNS = ('x', 'y', 'w', 'h')
+
+    def __init__(self, capacity=64):
+        self.n = 0
+        self.views = []
+        self._alloc(capacity)
+        self.prev_x = self.prev_y = None
+
+    def _alloc(self, capacity):
+        old_n = self.n
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS + ('state', 'alive'):
+            dtype = np.float64 if name in self.FLOAT_COLUMNS else np.int64
+            if name == 'state': dtype = np.int8
+            if name == 'alive': dtype = bool
+            col = np.zeros(capacity, dtype=dtype)
+            if old_n: col[:old_n] = getattr(self, name)[:old_n]
+            setattr(self, name, col)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.n
+
+    # --- LIFETIME ---
+    def add(self, view, x, y):
+        """Claims a slot for a new enemy with its top-left at (x, y). Returns the slot."""
+        if self.n == self.capacity: self._alloc(self.capacity * 2)
+        i = self.n
+        self.n += 1
+        self.x[i], self.y[i], self.w[i], self.h[i] = x, y, ENEMY_SIZE, ENEMY_SIZE
+        for name in ('vx', 'vy', 'carry_x', 'carry_y', 'aim_x', 'timer', 'visual'): getattr(self, name)[i] = 0.0
+        self.aim_y[i] = 1.0
+        self.hp[i] = self.max_hp[i] = 60
+        self.shield[i], self.damage[i], self.speed[i] = 30, 15, 0.65
+        self.state[i] = CHASING
+        self.alive[i] = True
+        self.views.append(view)
+        return i
+
+    def recycle(self, i, cx, cy):
+        """Teleports slot i (centred on cx, cy) with full HP, like a fresh spawn."""
+        self.x[i], self.y[i] = cx - self.w[i] // 2, cy - self.h[i] // 2
+        self.hp[i] = self.max_hp[i]
+        self.state[i] = CHASING
+        self.vx[i] = self.vy[i] = 0.0
+
+    def compact(self):
+        """Drops dead enemies, keeping the survivors (and their views) in order."""
+        n = self.n
+        keep = np.nonzero(self.alive[:n])[0]
+        if keep.size == n: return
+        for i in np.nonzero(~self.alive[:n])[0]: self.views[i].slot = None
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS + ('state', 'alive'):
+            col = getattr(self, name)
+            col[:keep.size] = col[keep]
+        self.views = [self.views[i] for i in keep]
+        for slot, view in enumerate(self.views): view.slot = slot
+        self.n = keep.size
+        self.prev_x = self.prev_y = None
+
+    def clear(self):
+        for view in self.views: view.slot = None
+        self.views = []
+        self.n = 0
+        self.prev_x = self.prev_y = None
+
+    # --- QUERIES ---
+    def centers(self):
+        n = self.n
+        return self.x[:n] + self.w[:n] // 2, self.y[:n] + self.h[:n] // 2
+
+    def beyond(self, pos, distance):
+        """Slots whose centre is farther than distance from pos."""
+        cx, cy = self.centers()
+        return np.nonzero(np.hypot(pos[0] - cx, pos[1] - cy) > distance)[0]
+
+    # --- SIMULATION ---
+    def update(self, dt, player, walls, texts, camera, flow=None, skip=()):
+        """One logic step for every enemy except the slots in skip (mirrors the old Enemy.update)."""
+        n = self.n
+        if not n: return
+        active = self.alive[:n].copy()
+        if len(skip): active[skip] = False
+        idx = np.nonzero(active)[0]
+        if not idx.size: return
+
+        # 1. Friction + movement with collision
+        vx, vy = self.vx[idx], self.vy[idx]
+        keep = 1.0 - frame_lerp(0.15)
+        vx, vy = vx * keep, vy * keep
+        mx = vx * settings.FRAME_SCALE + self.carry_x[idx]
+        my = vy * settings.FRAME_SCALE + self.carry_y[idx]
+        ix, iy = np.trunc(mx), np.trunc(my)
+        carry_x, carry_y = mx - ix, my - iy
+        x, y, hit_x, hit_y = slide_many(self.x[idx], self.y[idx], self.w[idx], self.h[idx],
+                                        ix.astype(np.int64), iy.astype(np.int64), walls)
+        self.x[idx], self.y[idx] = x, y
+        self.carry_x[idx] = np.where(hit_x, 0.0, carry_x)
+        self.carry_y[idx] = np.where(hit_y, 0.0, carry_y)
+
+        visual = self.visual[idx]
+        self.visual[idx] = np.where(visual > 0, visual - dt, visual)
+
+        # 2. State machine (every enemy takes exactly one branch, picked from its state this step)
+        to_px = player.rect.centerx - (x + self.w[idx] // 2)
+        to_py = player.rect.centery - (y + self.h[idx] // 2)
+        dist = np.hypot(to_px, to_py)
+        state, timer = self.state[idx], self.timer[idx]
+
+        timed = (state == STUNNED) | (state == STAGGERED) | (state == RECOVERING)
+        timer = np.where(timed, timer - dt, timer)
+        state = np.where(timed & (timer <= 0), CHASING, state)
+
+        windup = self.state[idx] == WINDUP
+        timer = np.where(windup, timer - dt, timer)
+        strike = windup & (timer <= 0)
+        if strike.any():
+            self.visual[idx[strike]] = 0.15
+            for i in idx[strike & (dist <= ENEMY_ATTACK_RANGE + 20)]:
+                player.take_damage(self.damage[i], texts, camera)
+            state = np.where(strike, RECOVERING, state)
+            timer = np.where(strike, 0.4, timer)
+
+        chasing = self.state[idx] == CHASING
+        attack = chasing & (dist <= ENEMY_ATTACK_RANGE)
+        state = np.where(attack, WINDUP, state)
+        timer = np.where(attack, 0.40, timer)
+        self.state[idx], self.timer[idx] = state, timer
+
+        chase = chasing & ~attack
+        if chase.any():
+            c = idx[chase]
+            # Follow the shared flow field around walls; straight line up close or off-field
+            sx, sy = to_px[chase].astype(np.float64), to_py[chase].astype(np.float64)
+            if flow:
+                cx, cy = self.x[c] + self.w[c] // 2, self.y[c] + self.h[c] // 2
+                wx, wy, ok = flow.next_waypoints(cx, cy)
+                ok &= dist[chase] > FLOW_DIRECT_RANGE
+                sx, sy = np.where(ok, wx - cx, sx), np.where(ok, wy - cy, sy)
+            length = np.hypot(sx, sy)
+            steer = length > 0
+            safe = np.where(steer, length, 1.0)
+            t = frame_lerp(0.05)
+            ax, ay = self.aim_x[c], self.aim_y[c]
+            ax = np.where(steer, ax + (sx / safe - ax) * t, ax)
+            ay = np.where(steer, ay + (sy / safe - ay) * t, ay)
+            norm = np.hypot(ax, ay)
+            norm = np.where(norm > 0, norm, 1.0)
+            self.aim_x[c], self.aim_y[c] = ax / norm, ay / norm
+
+            top_speed = self.speed[c] * PLAYER_MAX_SPEED
+            t = frame_lerp(0.1)
+            vx[chase] += (self.aim_x[c] * top_speed - vx[chase]) * t
+            vy[chase] += (self.aim_y[c] * top_speed - vy[chase]) * t
+        self.vx[idx], self.vy[idx] = vx, vy
+
+    # --- INTERPOLATED DRAWING ---
+    def snapshot(self):
+        """Remembers positions before a logic step (see Game._interpolate)."""
+        self.prev_x, self.prev_y = self.x[:self.n].copy(), self.y[:self.n].copy()
+
+    def interpolate(self, alpha, max_jump):
+        """Moves every enemy to its in-between position. Returns what restore() needs."""
+        n = self.n
+        if self.prev_x is None or self.prev_x.size != n: return None
+        cur_x, cur_y = self.x[:n].copy(), self.y[:n].copy()
+        smooth = np.abs(cur_x - self.prev_x) + np.abs(cur_y - self.prev_y) <= max_jump # Teleported: no smear
+        self.x[:n] = np.where(smooth, np.round(self.prev_x + (cur_x - self.prev_x) * alpha), cur_x)
+        self.y[:n] = np.where(smooth, np.round(self.prev_y + (cur_y - self.prev_y) * alpha), cur_y)
+        return cur_x, cur_y
+
+    def restore(self, saved):
+        if saved is None: return
+        n = saved[0].size
+        self.x[:n], self.y[:n] = saved
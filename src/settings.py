@@ -11,10 +11,37 @@ TILE_SIZE = 32       # Tuned for Sandbox combat
 CHUNK_SIZE = 32      # 32x32 Chunks
 RENDER_DISTANCE = 5
 
+# --- SIMULATION TIMING ---
+SIM_HZ = 120                    # Fixed logic rate (independent of rendering)
+SIM_DT = 1.0 / SIM_HZ
+RENDER_FPS = FPS                # Render cap; may be lower than SIM_HZ
+MAX_CATCHUP_STEPS = 8           # Logic steps allowed per rendered frame before dropping time
+TUNING_HZ = 60                  # Rate the per-frame constants (velocities, lerps) were tuned at
+FRAME_SCALE = TUNING_HZ / SIM_HZ  # Tuned frames per logic step
+
+# --- PROFILING ---
+PERF_GRAPH_FRAMES = 240         # Frames shown in the F3 frame-time graph
+PERF_CAPTURE_FRAMES = 600       # Frames recorded by an F4 capture (written as CSV + JSON)
+PERF_OVERLAY_REFRESH = 15       # Frames between refreshes of the F3 overlay text
+
+# --- CHUNK STREAMING ---
+CHUNK_WORKERS = 2               # Background generator processes (0 = generate inline)
+PREFETCH_RADIUS = 2             # Chunks generated around the player (and ahead of them)
+PREFETCH_LOOKAHEAD_FRAMES = 90  # How far along the velocity vector the ring is pushed
+CHUNK_INTEGRATE_PER_FRAME = 2   # Finished chunks turned into WorldChunks per frame
+
+# --- CHUNK CACHE ---
+CHUNK_BUDGET_CHUNKS = 256       # Resident chunks per layer before eviction kicks in (None = no cap)
+CHUNK_BUDGET_MB = None          # Optional resident memory cap per layer in MB (None = no cap)
+CHUNK_KEEP_RADIUS = 3           # Chunks this close to the player are never evicted
+CHUNK_CACHE_DIR = None          # Where evicted chunks are spilled (None = per-session temp folder)
+
 # --- PHYSICS ---
 PLAYER_SPEED = 0.5
 PLAYER_FRICTION = 0.85   # Preserved from Main
 PLAYER_MAX_SPEED = 4.5   # Tuned for Sandbox
+WALL_CELL_TILES = 4      # Broadphase cell size (in tiles) for wall queries
+WALL_BROADPHASE_MIN_RECTS = 160 # Fewer nearby walls than this: skip the cell lookup, scan them all
 
 # --- PLAYER STATES ---
 STATE_IDLE = "IDLE"
@@ -33,6 +60,13 @@ ENEMY_RECOVERING = "RECOVERING"
 ENEMY_STUNNED = "STUNNED"
 ENEMY_STAGGERED = "STAGGERED" 
 
+# --- ENEMY AI ---
+MAX_ENEMIES = 15          # Spawn cap (pathing cost no longer scales with this)
+FLOW_RADIUS = 48          # Flow field half-size in tiles (covers the despawn distance)
+FLOW_MAX_STEPS = 160      # BFS depth limit; farther enemies fall back to a straight line
+FLOW_DIRECT_RANGE = 48    # Pixels: this close, enemies just walk straight at the player
+COMBAT_CELL_SIZE = 128    # Pixels per spatial-hash cell for attack hit queries
+
 # --- COMBAT & STATS ---
 ATTACK_DURATION = 0.2
 ATTACK_COOLDOWN = 0.4
@@ -44,6 +78,7 @@ HEX_MENU_COLOR = (15, 15, 20, 240)
 COLOR_MAIN_HEX = (30, 30, 35)       
 COLOR_LOCKED = (40, 40, 40)      
 COLOR_HITBOX = (255, 0, 0, 100)  
+TEXT_CACHE_SIZE = 512               # Rendered strings kept by ui.text_manager.TEXT_CACHE
 
 # --- RARITY COLORS ---
 COLOR_COMMON = (200, 200, 200)   
@@ -53,7 +88,8 @@ COLOR_MYTHIC = (255, 50, 50)
 COLOR_LEGENDARY = (255, 215, 0)  
 
 # --- DATABASE SETTINGS ---
-DB_CSV_PATH = "game_objects.csv"
+DB_CSV_PATH = "game_objects.csv"      # Human-readable export, rewritten when item content changes or the file is missing (None = off)
+ITEM_CACHE_DIR = None                # Compiled item snapshot folder (None = $XDG_CACHE_HOME or ~/.cache/capstone_crawler)
 STATS_CSV_PATH = "player_progression.csv"
 CONST_CSV_PATH = "constellations.csv" 
 
@@ -1,34 +1,112 @@
 # src/ui/debug.py
 import pygame
-from settings import TILE_SIZE, CHUNK_SIZE
+from settings import TILE_SIZE, CHUNK_SIZE, FPS, PERF_GRAPH_FRAMES, PERF_OVERLAY_REFRESH
+from engine.perf import PERF
+
+# Subsystem timers shown in the overlay, in frame order (only those that have run are listed)
+SECTIONS = ["input", "ui", "chunk_gen", "physics", "spawning", "combat", "loot", "ai",
+            "render", "terrain_draw", "entity_draw", "ui_draw"]
+COUNTERS = ["rects_tested", "path_expansions", "alloc_blocks", "chunks_resident", "enemies"]
+
+PANEL_W = 360
+LINE_H = 16
+GRAPH_H = 60
 
 class DebugInterface:
-    def __init__(self, player, world, clock): # Renamed dungeon -> world
+    """
+    F3 overlay: position / chunk stats plus the profiler.
+    - Per-subsystem mean and p95 ms and per-frame counters over the last
+      PERF_GRAPH_FRAMES frames, re-rendered every PERF_OVERLAY_REFRESH frames.
+    - Rolling frame-time graph (16.7 ms line = 60 FPS) with p50/p95/p99/max, redrawn every frame.
+    - F4 (handled in main) records a capture window; its progress and output are shown here.
+    """
+    def __init__(self, player, world, clock, perf=PERF): # Renamed dungeon -> world
         self.player = player
         self.world = world
         self.clock = clock
+        self.perf = perf
         self.font = pygame.font.SysFont("Consolas", 14)
-        self.active = False 
+        self.active = False
+        self.panel = None
+        self.graph_top = 0
+        self.refresh_in = 0
 
     def toggle(self):
         self.active = not self.active
+        self.refresh_in = 0
 
-    def draw(self, screen, enemy_count=0):
-        if not self.active: return
-
-        bg = pygame.Surface((300, 150))
-        bg.set_alpha(180)
-        bg.fill((0, 0, 0))
-        screen.blit(bg, (10, 80))
+    def _lines(self, enemy_count):
+        chunks = self.world.current_chunks
+        chunk_px = CHUNK_SIZE * TILE_SIZE
+        here = chunks.get((int(self.player.rect.centerx // chunk_px), int(self.player.rect.centery // chunk_px)))
+        perf = self.perf
 
         lines = [
-            f"FPS: {int(self.clock.get_fps())}",
+            f"FPS: {int(self.clock.get_fps())}   Enemies: {enemy_count}",
             f"Pos: {int(self.player.rect.x)}, {int(self.player.rect.y)}",
-            # Updated to use self.world.chunks
-            f"Loaded Chunks: {len(self.world.chunks)}",
-            f"Biome ID: N/A" # Placeholder
+            f"Loaded Chunks: {len(chunks)}",
+            # Collision mesh size (greedy meshing)
+            f"Chunk Rects: {len(here.rects) if here else '-'}",
+            f"Loaded Rects: {sum(len(c.rects) for c in chunks.values())}",
+            "",
+            f"{'section':<13}{'mean':>8}{'p95':>8}{'max':>8}",
         ]
+        for name in SECTIONS:
+            samples = perf.samples.get(name)
+            if not samples: continue
+            data = sorted(list(samples)[-PERF_GRAPH_FRAMES:])
+            mean = sum(data) / len(data)
+            lines.append(f"{name:<13}{mean:>8.2f}{data[int(0.95 * (len(data) - 1))]:>8.2f}{data[-1]:>8.2f}")
+
+        lines.append("")
+        lines.append(f"{'counter':<16}{'last':>9}{'mean':>11}")
+        for name in COUNTERS:
+            samples = perf.counter_samples.get(name)
+            if not samples: continue
+            recent = list(samples)[-PERF_GRAPH_FRAMES:]
+            lines.append(f"{name:<16}{recent[-1]:>9}{sum(recent) / len(recent):>11.1f}")
+
+        lines.append("")
+        if perf.capture is not None: lines.append(f"Capturing... {perf.capture_left} frames left")
+        elif perf.last_capture: lines.append(f"Saved {perf.last_capture[0]}")
+        else: lines.append("F4: capture CSV/JSON")
+        return lines
 
+    def _render_panel(self, enemy_count):
+        lines = self._lines(enemy_count)
+        self.graph_top = 10 + len(lines) * LINE_H + 4
+        height = self.graph_top + GRAPH_H + 24
+        if self.panel is None or self.panel.get_height() != height:
+            self.panel = pygame.Surface((PANEL_W, height))
+            self.panel.set_alpha(180)
+        self.panel.fill((0, 0, 0))
         for i, line in enumerate(lines):
-            text = self.font.render(line, True, (0, 255, 0))
-            screen.blit(text, (20, 90 + (i * 20)))
\ No newline at end of file
+            if line: self.panel.blit(self.font.render(line, True, (0, 255, 0)), (10, 10 + i * LINE_H))
+
+        p50, p95, p99, worst = self.perf.frame_percentiles(PERF_GRAPH_FRAMES)
+        label = f"frame p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}  max {worst:.1f} ms"
+        self.panel.blit(self.font.render(label, True, (0, 255, 0)), (10, self.graph_top + GRAPH_H + 4))
+
+    def _draw_graph(self):
+        rect = pygame.Rect(10, self.graph_top, PANEL_W - 20, GRAPH_H)
+        self.panel.fill((20, 20, 20), rect)
+        times = list(self.perf.frame_times)[-PERF_GRAPH_FRAMES:]
+        budget = 1000.0 / FPS
+        scale = max(budget * 2, max(times, default=0.0))
+        to_y = lambda ms: rect.bottom - 1 - int(min(ms, scale) / scale * (rect.height - 1))
+        pygame.draw.line(self.panel, (90, 90, 0), (rect.left, to_y(budget)), (rect.right - 1, to_y(budget)))
+        if len(times) < 2: return
+        step = rect.width / max(1, PERF_GRAPH_FRAMES - 1)
+        x0 = rect.right - 1 - (len(times) - 1) * step
+        points = [(int(x0 + i * step), to_y(ms)) for i, ms in enumerate(times)]
+        pygame.draw.lines(self.panel, (0, 255, 0), False, points)
+
+    def draw(self, screen, enemy_count=0):
+        if not self.active: return
+
+        self.refresh_in -= 1
+        if self.panel is None or self.refresh_in <= 0:
+            self._render_panel(enemy_count)
+            self.refresh_in = PERF_OVERLAY_REFRESH
+        self._draw_graph()
+        screen.blit(self.panel, (10, 80))
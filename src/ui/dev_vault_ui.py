@@ -1,17 +1,17 @@
 # dev_vault_ui.py
 import pygame
 import math
-import copy
 from pygame.math import Vector2
 from settings import *
+from ui.icon_atlas import ICON_ATLAS
+from ui.retained import RetainedLayer
+from ui.text_manager import TEXT_CACHE
 
 class DevVaultUI:
     def __init__(self, global_db):
         pygame.font.init()
         self.font = pygame.font.Font(None, 24)
         self.title_font = pygame.font.Font(None, 36)
-        try: self.icon_font = pygame.font.SysFont(['segoe ui emoji', 'apple color emoji', 'noto color emoji'], 32)
-        except: self.icon_font = self.font
         
         self.items = global_db.get_all_items_list()
         self.cursor_idx = 0
@@ -29,6 +29,10 @@ class DevVaultUI:
         # Quantity Selector State
         self.is_selecting_qty = False
         self.spawn_qty = 1
+        
+        # Retained layers (see draw)
+        self.frame_layer = RetainedLayer()
+        self.grid_layer = RetainedLayer()
 
     def reset(self):
         self.cursor_idx = 0
@@ -113,10 +117,8 @@ class DevVaultUI:
             if self.spawn_qty > max_q: self.spawn_qty = max_q
             
             if action_pressed:
-                # Fast spawning logic loops the safe add_item logic
-                for _ in range(self.spawn_qty):
-                    new_item = copy.copy(sel_item)
-                    player_inventory.add_item(new_item)
+                # One bulk add: fills open stacks, then new ones, without a pass per item
+                player_inventory.add_items(sel_item, self.spawn_qty)
                 self.is_selecting_qty = False
                 return "SPAWNED"
             return None
@@ -134,65 +136,91 @@ class DevVaultUI:
             
         return None
 
-    def draw(self, screen):
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((30, 10, 10, 250)) 
-        screen.blit(overlay, (0,0))
-
-        screen.blit(self.title_font.render("DEVELOPER VAULT (ALL ITEMS)", True, (255,100,100)), (50, 40))
-
-        total_items = len(self.items)
-        start_x, start_y = 50, 100
+    def _draw_grid(self, surf):
+        """Every vault item, unscrolled and unselected (the cursor slot is drawn over it)."""
         slot_size, spacing = 70, 15
-        
-        # AAA Clipping for smooth scroll
-        clip_h = self.rows_visible * (slot_size + spacing)
-        screen.set_clip(pygame.Rect(40, 90, WIDTH - 80, clip_h + 20))
-        
         for i, item in enumerate(self.items): 
             col, row = i % self.cols, i // self.cols
-            x = start_x + col * (slot_size + spacing)
-            y = start_y + (row - self.visual_scroll) * (slot_size + spacing)
-            
-            if y > start_y + clip_h or y < start_y - slot_size: continue
-            
-            rect = pygame.Rect(x, y, slot_size, slot_size)
-            is_selected = (i == self.cursor_idx)
-            
-            pygame.draw.rect(screen, (60, 60, 70) if is_selected else (30, 30, 35), rect)
-            pygame.draw.rect(screen, item.color, rect, 3) 
-            
-            try:
-                icon_surf = self.icon_font.render(item.icon, True, (255, 255, 255))
-                screen.blit(icon_surf, icon_surf.get_rect(center=rect.center))
-            except: pass
+            rect = pygame.Rect(10 + col * (slot_size + spacing), 10 + row * (slot_size + spacing), slot_size, slot_size)
+            self._draw_slot(surf, rect, item, False)
 
-            pygame.draw.rect(screen, (255, 215, 0) if is_selected else (50, 50, 50), rect, 4 if is_selected else 2)
+    def _draw_slot(self, surf, rect, item, is_selected):
+        pygame.draw.rect(surf, (60, 60, 70) if is_selected else (30, 30, 35), rect)
+        pygame.draw.rect(surf, item.color, rect, 3) 
+        
+        try:
+            ICON_ATLAS.blit_centered(surf, item.icon, 32, rect.center)
+        except: pass
 
-        screen.set_clip(None)
+        pygame.draw.rect(surf, (255, 215, 0) if is_selected else (50, 50, 50), rect, 4 if is_selected else 2)
 
+    def _draw_frame(self, surf):
+        """Backdrop, scroll track, info readout and legend."""
+        surf.fill((30, 10, 10, 250))
+        surf.blit(self.title_font.render("DEVELOPER VAULT (ALL ITEMS)", True, (255,100,100)), (50, 40))
+
+        total_items = len(self.items)
+        start_x, start_y = 50, 100
+        slot_size, spacing = 70, 15
+        clip_h = self.rows_visible * (slot_size + spacing)
         total_rows = max(self.rows_visible, math.ceil(total_items / self.cols))
         track_w = 16
         track_x = start_x + self.cols * (slot_size + spacing) + 10
         scroll_track_rect = pygame.Rect(track_x, start_y, track_w, clip_h - spacing)
         
-        pygame.draw.rect(screen, (20, 20, 25), scroll_track_rect)
-        pygame.draw.rect(screen, (80, 80, 90), scroll_track_rect, 2) 
-        
-        if total_rows > self.rows_visible:
-            thumb_height = max(30, (self.rows_visible / total_rows) * scroll_track_rect.height)
-            thumb_y = start_y + (self.visual_scroll / max(1, total_rows - self.rows_visible)) * (scroll_track_rect.height - thumb_height)
-            thumb_rect = pygame.Rect(scroll_track_rect.x + 3, thumb_y + 3, track_w - 6, thumb_height - 6)
-            pygame.draw.rect(screen, (255, 100, 100), thumb_rect) 
-        else:
+        pygame.draw.rect(surf, (20, 20, 25), scroll_track_rect)
+        pygame.draw.rect(surf, (80, 80, 90), scroll_track_rect, 2) 
+        if total_rows <= self.rows_visible:
             thumb_rect = pygame.Rect(scroll_track_rect.x + 3, start_y + 3, track_w - 6, scroll_track_rect.height - 6)
-            pygame.draw.rect(screen, (50, 50, 55), thumb_rect) 
+            pygame.draw.rect(surf, (50, 50, 55), thumb_rect) 
 
         # INFO READOUT
         if self.cursor_idx < total_items:
             sel_item = self.items[self.cursor_idx]
             info_txt = f"{sel_item.name} | {sel_item.rarity} | +{sel_item.effect_value} {sel_item.effect_stat}"
-            screen.blit(self.title_font.render(info_txt, True, sel_item.color), (50, HEIGHT - 100))
+            surf.blit(self.title_font.render(info_txt, True, sel_item.color), (50, HEIGHT - 100))
+
+        pygame.draw.rect(surf, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
+        if self.is_selecting_qty:
+            legend_text = "[Left/Right] +/- 1   |   [Up/Down] +/- 10   |   [A] Spawn   |   [B] Cancel"
+        else:
+            legend_text = "[Stick/D-Pad] Navigate   |   [A] Select Item   |   [B] Back"
+        legend_surf = self.font.render(legend_text, True, (150, 150, 150))
+        surf.blit(legend_surf, (WIDTH // 2 - legend_surf.get_width() // 2, HEIGHT - 28))
+
+    def draw(self, screen):
+        """
+        Retained: the frame and the full item grid are cached layers; the grid is
+        blitted at the scroll offset and only the selected slot is redrawn per frame.
+        """
+        total_items = len(self.items)
+        start_x, start_y = 50, 100
+        slot_size, spacing = 70, 15
+        clip_h = self.rows_visible * (slot_size + spacing)
+        total_rows = max(self.rows_visible, math.ceil(total_items / self.cols))
+
+        self.frame_layer.draw(screen, (self.cursor_idx, self.is_selecting_qty), self._draw_frame)
+
+        # AAA Clipping for smooth scroll
+        clip = pygame.Rect(40, 90, WIDTH - 80, clip_h + 20)
+        scroll_px = math.ceil(self.visual_scroll * (slot_size + spacing))
+        self.grid_layer.resize((clip.w, max(clip.h, 10 + total_rows * (slot_size + spacing))))
+        self.grid_layer.draw(screen, tuple(self.items), self._draw_grid, (clip.x, clip.y - scroll_px), [pygame.Rect(0, scroll_px, clip.w, clip.h)])
+
+        if self.cursor_idx < total_items:
+            col, row = self.cursor_idx % self.cols, self.cursor_idx // self.cols
+            rect = pygame.Rect(start_x + col * (slot_size + spacing), start_y + row * (slot_size + spacing) - scroll_px, slot_size, slot_size)
+            screen.set_clip(clip)
+            self._draw_slot(screen, rect, self.items[self.cursor_idx], True)
+            screen.set_clip(None)
+
+        if total_rows > self.rows_visible:
+            track_w = 16
+            scroll_track_rect = pygame.Rect(start_x + self.cols * (slot_size + spacing) + 10, start_y, track_w, clip_h - spacing)
+            thumb_height = max(30, (self.rows_visible / total_rows) * scroll_track_rect.height)
+            thumb_y = start_y + (self.visual_scroll / max(1, total_rows - self.rows_visible)) * (scroll_track_rect.height - thumb_height)
+            thumb_rect = pygame.Rect(scroll_track_rect.x + 3, thumb_y + 3, track_w - 6, thumb_height - 6)
+            pygame.draw.rect(screen, (255, 100, 100), thumb_rect) 
 
         # --- QUANTITY SELECTOR UI ---
         if self.is_selecting_qty:
@@ -205,18 +233,11 @@ class DevVaultUI:
             sel_item = self.items[self.cursor_idx]
             max_q = int(sel_item.max_stack)
             
-            screen.blit(self.title_font.render(f"Spawn {sel_item.name}", True, (255, 255, 255)), self.title_font.render(f"Spawn {sel_item.name}", True, (255, 255, 255)).get_rect(center=(cx, cy - 40)))
+            spawn_surf = TEXT_CACHE.render(f"Spawn {sel_item.name}", (255, 255, 255), 36)
+            screen.blit(spawn_surf, spawn_surf.get_rect(center=(cx, cy - 40)))
             
-            qty_txt = f"<   {self.spawn_qty}   >"
-            screen.blit(self.title_font.render(qty_txt, True, (0, 255, 100)), self.title_font.render(qty_txt, True, (0, 255, 100)).get_rect(center=(cx, cy + 10)))
+            qty_surf = TEXT_CACHE.render(f"<   {self.spawn_qty}   >", (0, 255, 100), 36)
+            screen.blit(qty_surf, qty_surf.get_rect(center=(cx, cy + 10)))
             
-            max_txt = f"(Max: {max_q})"
-            screen.blit(self.font.render(max_txt, True, (150, 150, 150)), self.font.render(max_txt, True, (150, 150, 150)).get_rect(center=(cx, cy + 40)))
-
-        pygame.draw.rect(screen, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
-        if self.is_selecting_qty:
-            legend_text = "[Left/Right] +/- 1   |   [Up/Down] +/- 10   |   [A] Spawn   |   [B] Cancel"
-        else:
-            legend_text = "[Stick/D-Pad] Navigate   |   [A] Select Item   |   [B] Back"
-        legend_surf = self.font.render(legend_text, True, (150, 150, 150))
-        screen.blit(legend_surf, (WIDTH // 2 - legend_surf.get_width() // 2, HEIGHT - 28))
\ No newline at end of file
+            max_surf = TEXT_CACHE.render(f"(Max: {max_q})", (150, 150, 150), 24)
+            screen.blit(max_surf, max_surf.get_rect(center=(cx, cy + 40)))
@@ -0,0 +1,41 @@
+# src/ui/icon_atlas.py
+import pygame
+
+EMOJI_FONTS = ['segoe ui emoji', 'apple color emoji', 'noto color emoji']
+ICON_SIZES = (24, 32, 90) # Loot drops, menu slots, inventory detail panel
+
+class IconAtlas:
+    """
+    Process-wide cache of rendered icons (item emoji etc.), keyed by (icon, size).
+    - The emoji SysFont lookup happens once per size instead of per screen / drop / frame.
+    - prewarm() renders every ItemRegistry icon up front, so menus never render mid-frame.
+    """
+    def __init__(self):
+        self.fonts = {}
+        self.surfaces = {}
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init(): pygame.font.init()
+            try: font = pygame.font.SysFont(EMOJI_FONTS, size)
+            except: font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def get(self, icon, size=32):
+        key = (icon, size)
+        surf = self.surfaces.get(key)
+        if surf is None:
+            surf = self.surfaces[key] = self.font(size).render(icon, True, (255, 255, 255))
+        return surf
+
+    def blit_centered(self, screen, icon, size, center):
+        surf = self.get(icon, size)
+        screen.blit(surf, surf.get_rect(center=center))
+
+    def prewarm(self, registry, sizes=ICON_SIZES):
+        for icon in {item.icon for item in registry.get_all_items_list()}:
+            for size in sizes: self.get(icon, size)
+
+ICON_ATLAS = IconAtlas()
@@ -4,14 +4,15 @@ import math
 import copy
 from pygame.math import Vector2
 from settings import *
+from ui.icon_atlas import ICON_ATLAS
+from ui.retained import RetainedLayer
+from ui.text_manager import TEXT_CACHE
 
 class InventoryUI:
     def __init__(self, player_inventory): 
         pygame.font.init()
         self.font = pygame.font.Font(None, 24)
         self.title_font = pygame.font.Font(None, 36)
-        try: self.icon_font = pygame.font.SysFont(['segoe ui emoji', 'apple color emoji', 'noto color emoji'], 32)
-        except: self.icon_font = self.font
         
         self.inventory = player_inventory
         self.categories = ["ALL", "WEAPON", "ARMOR", "GLYPH", "POTION", "MATERIAL"]
@@ -38,6 +39,10 @@ class InventoryUI:
         
         self.visual_scroll = 0.0
         self.actual_cursor_rect = pygame.Rect(0,0,0,0)
+        
+        # Retained layers (see draw)
+        self.frame_layer = RetainedLayer()
+        self.grid_layer = RetainedLayer()
 
     def reset(self):
         self.cat_idx = 0
@@ -77,7 +82,7 @@ class InventoryUI:
         if item.is_consumable == "True": 
             self.action_options.append("USE"); has_primary = True
         elif getattr(item, 'equip_slot', None): 
-            if getattr(item, 'is_equipped', False): self.action_options.append("UNEQUIP")
+            if slot['equipped']: self.action_options.append("UNEQUIP")
             else: self.action_options.append("EQUIP")
             has_primary = True
             
@@ -186,79 +191,104 @@ class InventoryUI:
                     
         return None
 
-    def draw(self, screen):
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((15, 15, 20, 250))
-        screen.blit(overlay, (0,0))
-        screen.blit(self.title_font.render("ITEM INVENTORY", True, (255,255,255)), (50, 40))
-        
-        tab_x = 50
-        for i, cat in enumerate(self.categories):
-            col = (255, 215, 0) if i == self.cat_idx else (100, 100, 100)
-            txt = self.font.render(cat, True, col)
-            screen.blit(txt, (tab_x, 100))
-            if i == self.cat_idx: pygame.draw.line(screen, col, (tab_x, 120), (tab_x + txt.get_width(), 120), 3)
-            tab_x += txt.get_width() + 30
+    def _grid_key(self, filtered):
+        return (self.cat_idx, tuple((s['item'], s['count'], s['equipped']) for s in filtered))
 
-        filtered = self.inventory.get_filtered_slots(self.categories[self.cat_idx])
-        start_x, start_y = 50, 140
+    def _frame_key(self, filtered):
+        sel = filtered[self.cursor_idx] if self.cursor_idx < len(filtered) else None
+        return (self.cat_idx, len(filtered), sel and sel['item'], sel and sel['equipped'])
+
+    def _draw_grid(self, surf, filtered):
+        """Every slot of the current tab, unscrolled (the grid layer is blitted at the scroll offset)."""
         slot_size, spacing = 70, 15
-        
-        clip_h = self.rows_visible * (slot_size + spacing)
-        screen.set_clip(pygame.Rect(40, 130, 800, clip_h))
-        
         for i, slot in enumerate(filtered):
             col, row = i % self.cols, i // self.cols
-            x = start_x + col * (slot_size + spacing)
-            y = start_y + (row - self.visual_scroll) * (slot_size + spacing)
-            
-            if y > start_y + clip_h or y < start_y - slot_size: continue
+            x, y = 10 + col * (slot_size + spacing), 10 + row * (slot_size + spacing)
             
             rect = pygame.Rect(x, y, slot_size, slot_size)
-            pygame.draw.rect(screen, (30, 30, 35), rect)
+            pygame.draw.rect(surf, (30, 30, 35), rect)
             
             item = slot['item']
-            pygame.draw.rect(screen, item.color, rect, 3) 
-            try: screen.blit(self.icon_font.render(item.icon, True, (255, 255, 255)), self.icon_font.render(item.icon, True, (255, 255, 255)).get_rect(center=rect.center))
+            pygame.draw.rect(surf, item.color, rect, 3) 
+            try: ICON_ATLAS.blit_centered(surf, item.icon, 32, rect.center)
             except: pass
-            if getattr(item, 'is_equipped', False):
-                pygame.draw.rect(screen, (255,215,0), (x+2, y+2, 20, 20))
-                screen.blit(self.font.render("E", True, (0,0,0)), (x+6, y+4))
+            if slot['equipped']:
+                pygame.draw.rect(surf, (255,215,0), (x+2, y+2, 20, 20))
+                surf.blit(self.font.render("E", True, (0,0,0)), (x+6, y+4))
             if slot['count'] > 1:
-                screen.blit(self.font.render(str(slot['count']), True, (255,255,255)), (x + slot_size - 20, y + slot_size - 20))
+                surf.blit(self.font.render(str(slot['count']), True, (255,255,255)), (x + slot_size - 20, y + slot_size - 20))
 
-        if len(filtered) > 0 and not self.show_action_menu and not self.confirm_state:
-            pygame.draw.rect(screen, (255, 215, 0), self.actual_cursor_rect, 4)
-
-        screen.set_clip(None)
+    def _draw_frame(self, surf, filtered):
+        """Backdrop, tabs, scroll track and detail panel: everything that doesn't move."""
+        surf.fill((15, 15, 20, 250))
+        surf.blit(self.title_font.render("ITEM INVENTORY", True, (255,255,255)), (50, 40))
         
+        tab_x = 50
+        for i, cat in enumerate(self.categories):
+            col = (255, 215, 0) if i == self.cat_idx else (100, 100, 100)
+            txt = self.font.render(cat, True, col)
+            surf.blit(txt, (tab_x, 100))
+            if i == self.cat_idx: pygame.draw.line(surf, col, (tab_x, 120), (tab_x + txt.get_width(), 120), 3)
+            tab_x += txt.get_width() + 30
+
+        start_x, start_y = 50, 140
+        slot_size, spacing = 70, 15
+        clip_h = self.rows_visible * (slot_size + spacing)
         total_rows = max(self.rows_visible, math.ceil(len(filtered) / self.cols))
         track_x = start_x + self.cols * (slot_size + spacing) + 10
         s_rect = pygame.Rect(track_x, start_y, 16, clip_h - spacing)
-        pygame.draw.rect(screen, (20, 20, 25), s_rect); pygame.draw.rect(screen, (80, 80, 90), s_rect, 2) 
-        if total_rows > self.rows_visible:
-            t_h = max(30, (self.rows_visible / total_rows) * s_rect.height)
-            t_y = start_y + (self.visual_scroll / max(1, total_rows - self.rows_visible)) * (s_rect.height - t_h)
-            pygame.draw.rect(screen, (255, 215, 0), pygame.Rect(s_rect.x + 3, t_y + 3, 10, t_h - 6)) 
-        else:
-            pygame.draw.rect(screen, (50, 50, 55), pygame.Rect(s_rect.x + 3, start_y + 3, 10, s_rect.height - 6))
+        pygame.draw.rect(surf, (20, 20, 25), s_rect); pygame.draw.rect(surf, (80, 80, 90), s_rect, 2) 
+        if total_rows <= self.rows_visible:
+            pygame.draw.rect(surf, (50, 50, 55), pygame.Rect(s_rect.x + 3, start_y + 3, 10, s_rect.height - 6))
 
         detail_rect = pygame.Rect(WIDTH - 400, 140, 350, 450)
-        pygame.draw.rect(screen, (25, 25, 30), detail_rect)
+        pygame.draw.rect(surf, (25, 25, 30), detail_rect)
         if len(filtered) > 0 and self.cursor_idx < len(filtered):
-            sel = filtered[self.cursor_idx]['item']
-            pygame.draw.rect(screen, sel.color, detail_rect, 5)
-            screen.blit(self.title_font.render(sel.name, True, sel.color), (WIDTH - 380, 160))
-            screen.blit(self.font.render(f"Category: {sel.category}", True, (200,200,200)), (WIDTH - 380, 200))
-            eq_text = "EQUIPPED" if getattr(sel, 'is_equipped', False) else "IN BAG"
-            screen.blit(self.font.render(f"Status: {eq_text}", True, (255,215,0) if getattr(sel, 'is_equipped', False) else (150,150,150)), (WIDTH - 200, 200))
-            screen.blit(self.font.render(f"Rarity: {sel.rarity}", True, sel.color), (WIDTH - 380, 230))
-            screen.blit(self.font.render(f"Effect: {sel.effect_stat}", True, (200,200,200)), (WIDTH - 380, 270))
+            sel, equipped = filtered[self.cursor_idx]['item'], filtered[self.cursor_idx]['equipped']
+            pygame.draw.rect(surf, sel.color, detail_rect, 5)
+            surf.blit(self.title_font.render(sel.name, True, sel.color), (WIDTH - 380, 160))
+            surf.blit(self.font.render(f"Category: {sel.category}", True, (200,200,200)), (WIDTH - 380, 200))
+            eq_text = "EQUIPPED" if equipped else "IN BAG"
+            surf.blit(self.font.render(f"Status: {eq_text}", True, (255,215,0) if equipped else (150,150,150)), (WIDTH - 200, 200))
+            surf.blit(self.font.render(f"Rarity: {sel.rarity}", True, sel.color), (WIDTH - 380, 230))
+            surf.blit(self.font.render(f"Effect: {sel.effect_stat}", True, (200,200,200)), (WIDTH - 380, 270))
             v_disp = f"+{sel.effect_value}" if sel.category != "Glyph" else f"+{int(float(sel.effect_value)*100)}%"
-            screen.blit(self.font.render(f"Value: {v_disp}", True, (0,255,100)), (WIDTH - 380, 300))
-            try: screen.blit(pygame.font.SysFont(['segoe ui emoji', 'apple color emoji'], 90).render(sel.icon, True, (255,255,255)), (WIDTH - 260, 370))
+            surf.blit(self.font.render(f"Value: {v_disp}", True, (0,255,100)), (WIDTH - 380, 300))
+            try: surf.blit(ICON_ATLAS.get(sel.icon, 90), (WIDTH - 260, 370))
             except: pass
-        else: pygame.draw.rect(screen, (100, 100, 100), detail_rect, 2)
+        else: pygame.draw.rect(surf, (100, 100, 100), detail_rect, 2)
+
+        pygame.draw.rect(surf, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
+        surf.blit(self.font.render("[Stick/D-Pad] Navigate   |   [A] Action   |   [B] Back", True, (150, 150, 150)), (WIDTH // 2 - 250, HEIGHT - 28))
+
+    def draw(self, screen):
+        """
+        Retained: the frame and the slot grid are cached layers, re-rendered only when
+        the tab, selection or slots change. Scroll, cursor glide and popups go on top.
+        """
+        filtered = self.inventory.get_filtered_slots(self.categories[self.cat_idx])
+        start_x, start_y = 50, 140
+        slot_size, spacing = 70, 15
+        clip_h = self.rows_visible * (slot_size + spacing)
+        total_rows = max(self.rows_visible, math.ceil(len(filtered) / self.cols))
+
+        self.frame_layer.draw(screen, self._frame_key(filtered), lambda surf: self._draw_frame(surf, filtered))
+
+        self.grid_layer.resize((800, max(clip_h, 10 + total_rows * (slot_size + spacing))))
+        scroll_px = math.ceil(self.visual_scroll * (slot_size + spacing))
+        self.grid_layer.draw(screen, self._grid_key(filtered), lambda surf: self._draw_grid(surf, filtered), 
+                             (40, 130 - scroll_px), [pygame.Rect(0, scroll_px, 800, clip_h)])
+
+        if len(filtered) > 0 and not self.show_action_menu and not self.confirm_state:
+            screen.set_clip(pygame.Rect(40, 130, 800, clip_h))
+            pygame.draw.rect(screen, (255, 215, 0), self.actual_cursor_rect, 4)
+            screen.set_clip(None)
+
+        if total_rows > self.rows_visible:
+            s_rect = pygame.Rect(start_x + self.cols * (slot_size + spacing) + 10, start_y, 16, clip_h - spacing)
+            t_h = max(30, (self.rows_visible / total_rows) * s_rect.height)
+            t_y = start_y + (self.visual_scroll / max(1, total_rows - self.rows_visible)) * (s_rect.height - t_h)
+            pygame.draw.rect(screen, (255, 215, 0), pygame.Rect(s_rect.x + 3, t_y + 3, 10, t_h - 6)) 
 
         if self.show_action_menu:
             menu_w = 120
@@ -269,7 +299,7 @@ class InventoryUI:
             for i, opt in enumerate(self.action_options):
                 col = (0,0,0) if i == self.action_idx else (255,255,255)
                 if i == self.action_idx: pygame.draw.rect(screen, (255, 215, 0), (mx + 2, my + 5 + i*30, menu_w - 4, 30))
-                screen.blit(self.font.render(opt, True, col), (mx + 10, my + 12 + i*30))
+                screen.blit(TEXT_CACHE.render(opt, col, 24), (mx + 10, my + 12 + i*30))
 
         # --- DRAW CONFIRM BOX ---
         if self.confirm_state:
@@ -282,17 +312,14 @@ class InventoryUI:
             c_item = self.active_slot['item']
             c_count = self.active_slot['count']
             msg = f"Drop ALL {c_count}x {c_item.name}?"
-            screen.blit(self.title_font.render(msg, True, (255,255,255)), self.title_font.render(msg, True, (255,255,255)).get_rect(center=(cx, cy - 20)))
+            screen.blit(TEXT_CACHE.render(msg, (255,255,255), 36), TEXT_CACHE.render(msg, (255,255,255), 36).get_rect(center=(cx, cy - 20)))
             
             yes_col = (0,0,0) if self.confirm_idx == 0 else (255,255,255)
             yes_bg = (255,50,50) if self.confirm_idx == 0 else None
             if yes_bg: pygame.draw.rect(screen, yes_bg, (cx - 100, cy + 20, 80, 40))
-            screen.blit(self.title_font.render("YES", True, yes_col), self.title_font.render("YES", True, yes_col).get_rect(center=(cx - 60, cy + 40)))
+            screen.blit(TEXT_CACHE.render("YES", yes_col, 36), TEXT_CACHE.render("YES", yes_col, 36).get_rect(center=(cx - 60, cy + 40)))
 
             no_col = (0,0,0) if self.confirm_idx == 1 else (255,255,255)
             no_bg = (100,100,100) if self.confirm_idx == 1 else None
             if no_bg: pygame.draw.rect(screen, no_bg, (cx + 20, cy + 20, 80, 40))
-            screen.blit(self.title_font.render("NO", True, no_col), self.title_font.render("NO", True, no_col).get_rect(center=(cx + 60, cy + 40)))
-
-        pygame.draw.rect(screen, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
-        screen.blit(self.font.render("[Stick/D-Pad] Navigate   |   [A] Action   |   [B] Back", True, (150, 150, 150)), (WIDTH // 2 - 250, HEIGHT - 28))
\ No newline at end of file
+            screen.blit(TEXT_CACHE.render("NO", no_col, 36), TEXT_CACHE.render("NO", no_col, 36).get_rect(center=(cx + 60, cy + 40)))
@@ -0,0 +1,45 @@
+# src/ui/retained.py
+import pygame
+from settings import *
+
+_STALE = object() # Never equal to a real key, forces the next draw to render
+
+class RetainedLayer:
+    """
+    Retained-mode cache for the static part of a menu screen.
+    - draw() only runs render(surface) when the model key differs from the one the
+      cached surface was rendered with; an idle screen is just a blit.
+    - Keys are plain tuples of what the screen shows (items, counts, cursor index,
+      unlocked nodes...). Animated bits (cursor glide, scroll, pulses) stay out of
+      the key and are drawn over the layer, or the layer is blitted at an offset.
+    - areas limits the blit to the parts of the layer that hold content.
+    """
+    def __init__(self, size=(WIDTH, HEIGHT), alpha=True):
+        self.size = tuple(size)
+        self.alpha = alpha
+        self.surf = None
+        self.key = _STALE
+        self.renders = 0
+
+    def invalidate(self):
+        self.key = _STALE
+
+    def resize(self, size):
+        size = (int(size[0]), int(size[1]))
+        if size != self.size:
+            self.size, self.surf, self.key = size, None, _STALE
+
+    def draw(self, screen, key, render, dest=(0, 0), areas=None):
+        if self.surf is None:
+            self.surf = pygame.Surface(self.size, pygame.SRCALPHA) if self.alpha else pygame.Surface(self.size)
+        if key != self.key:
+            if self.alpha: self.surf.fill((0, 0, 0, 0))
+            render(self.surf)
+            self.key = key
+            self.renders += 1
+
+        if areas is None:
+            screen.blit(self.surf, dest)
+        else:
+            for area in areas:
+                screen.blit(self.surf, (dest[0] + area[0], dest[1] + area[1]), area)
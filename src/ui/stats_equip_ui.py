@@ -2,14 +2,15 @@
 import pygame
 from pygame.math import Vector2
 from settings import *
+from ui.icon_atlas import ICON_ATLAS
+from ui.retained import RetainedLayer
+from ui.text_manager import TEXT_CACHE
 
 class StatsEquipUI:
     def __init__(self, player_attributes, player_equipment, player_inventory):
         pygame.font.init()
         self.font = pygame.font.Font(None, 24)
         self.title_font = pygame.font.Font(None, 36)
-        try: self.icon_font = pygame.font.SysFont(['segoe ui emoji', 'apple color emoji', 'noto color emoji'], 32)
-        except: self.icon_font = self.font
         
         self.attributes, self.equipment, self.inventory = player_attributes, player_equipment, player_inventory
         self.slot_names = ["Head", "Necklace", "Chest", "MainHand", "OffHand", "Ring", "Legs", "Feet"]
@@ -23,6 +24,12 @@ class StatsEquipUI:
         # AAA KINETICS
         self.actual_cursor_rect = pygame.Rect(0,0,0,0)
         self.drawer_offset = 450.0 
+        
+        # Retained layers (see draw)
+        self.doll_layer = RetainedLayer()
+        self.drawer_layer = RetainedLayer((450, 500))
+        self.sheet_layer = RetainedLayer()
+        self.sheet_areas = [pygame.Rect(WIDTH - 420, 120, 420, 300), pygame.Rect(0, HEIGHT - 40, WIDTH, 40)]
 
     def reset(self):
         self.cursor_idx, self.state = 3, "DOLL"
@@ -48,7 +55,7 @@ class StatsEquipUI:
                 self.actual_cursor_rect.h = t_rect.h
 
     def _get_valid_items(self, target_slot):
-        return [s['item'] for s in self.inventory.slots if getattr(s['item'], 'equip_slot', None) == target_slot and not getattr(s['item'], 'is_equipped', False)]
+        return [s['item'] for s in self.inventory.slots if getattr(s['item'], 'equip_slot', None) == target_slot and not s['equipped']]
 
     def _get_spatial_target(self, current_pos, nodes, direction_vec):
         best_idx, best_score = -1, float('inf')
@@ -140,24 +147,76 @@ class StatsEquipUI:
             "Legs": pygame.Rect(cx-sz//2, cy+20, sz, sz), "Feet": pygame.Rect(cx-sz//2, cy+120, sz, sz)
         }
 
-    def draw(self, screen):
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA); overlay.fill((15, 15, 20, 250)); screen.blit(overlay, (0,0))
-        screen.blit(self.title_font.render("CHARACTER & EQUIPMENT", True, (255,215,0)), (50, 40))
+    def _draw_doll(self, surf):
+        surf.fill((15, 15, 20, 250))
+        surf.blit(self.title_font.render("CHARACTER & EQUIPMENT", True, (255,215,0)), (50, 40))
         
         doll_rects = self._get_paper_doll_rects()
-        pygame.draw.line(screen, (50,50,50), (350, 120), (350, 420), 4) 
-        pygame.draw.line(screen, (50,50,50), (250, 270), (450, 270), 4) 
+        pygame.draw.line(surf, (50,50,50), (350, 120), (350, 420), 4) 
+        pygame.draw.line(surf, (50,50,50), (250, 270), (450, 270), 4) 
         
         for i, slot_name in enumerate(self.slot_names):
             r = doll_rects[slot_name]
-            pygame.draw.rect(screen, (20, 20, 25), r)
-            pygame.draw.rect(screen, (100, 100, 100), r, 2)
+            pygame.draw.rect(surf, (20, 20, 25), r)
+            pygame.draw.rect(surf, (100, 100, 100), r, 2)
             item = self.equipment.slots.get(slot_name)
             if item:
-                pygame.draw.rect(screen, item.color, r, 3)
-                try: screen.blit(self.icon_font.render(item.icon, True, (255,255,255)), self.icon_font.render(item.icon, True, (255,255,255)).get_rect(center=r.center))
+                pygame.draw.rect(surf, item.color, r, 3)
+                try: ICON_ATLAS.blit_centered(surf, item.icon, 32, r.center)
+                except: pass
+            else: surf.blit(self.font.render(slot_name[:4], True, (60,60,60)), self.font.render(slot_name[:4], True, (60,60,60)).get_rect(center=r.center))
+
+    def _draw_drawer(self, surf):
+        """The gear drawer in its own coordinates (blitted at the slide offset)."""
+        r_rect = pygame.Rect(0, 0, 400, 500)
+        pygame.draw.rect(surf, (20, 20, 25), r_rect); pygame.draw.rect(surf, (80, 80, 90), r_rect, 2)
+
+        if self.drawer_offset < 400: # Only draw internals if drawer is somewhat visible
+            surf.blit(self.title_font.render("AVAILABLE GEAR", True, (255, 215, 0)), (30, 20))
+            start_x, start_y, sz, sp = 30, 60, 60, 10
+            for i, item in enumerate(self.selector_items):
+                r = pygame.Rect(start_x + (i%self.sel_cols)*(sz+sp), start_y + (i//self.sel_cols)*(sz+sp), sz, sz)
+                is_sel = (i == self.selector_idx)
+                pygame.draw.rect(surf, (60, 60, 70) if is_sel else (30, 30, 35), r)
+                pygame.draw.rect(surf, item.color, r, 3)
+                if is_sel: pygame.draw.rect(surf, (255, 215, 0), r, 5)
+                try: ICON_ATLAS.blit_centered(surf, item.icon, 32, r.center)
                 except: pass
-            else: screen.blit(self.font.render(slot_name[:4], True, (60,60,60)), self.font.render(slot_name[:4], True, (60,60,60)).get_rect(center=r.center))
+
+            if len(self.selector_items) > 0:
+                hov = self.selector_items[self.selector_idx]
+                tt_rect = pygame.Rect(20, 280, 360, 200)
+                pygame.draw.rect(surf, (15, 15, 15), tt_rect); pygame.draw.rect(surf, hov.color, tt_rect, 3)
+                surf.blit(self.title_font.render(hov.name, True, hov.color), (tt_rect.x + 20, tt_rect.y + 20))
+                surf.blit(self.font.render(f"Rarity: {hov.rarity}", True, (200,200,200)), (tt_rect.x + 20, tt_rect.y + 60))
+                surf.blit(self.title_font.render(f"+{hov.effect_value} {hov.effect_stat}", True, (50, 255, 100)), (tt_rect.x + 20, tt_rect.y + 100))
+
+    def _draw_sheet(self, surf):
+        """Character sheet on the right plus the legend bar."""
+        if self.state != "ITEM_SELECTOR":
+            sx, sy = WIDTH - 420, 120
+            surf.blit(self.title_font.render(f"LEVEL {self.attributes.level}", True, (255, 255, 255)), (sx, sy))
+            surf.blit(self.font.render(f"EXP: {self.attributes.xp} / {self.attributes.xp_next}", True, (255, 215, 0)), (sx, sy+40))
+            surf.blit(self.font.render(f"Max HP: {int(self.attributes.max_hp)}", True, (50, 255, 50)), (sx, sy+90))
+            surf.blit(self.font.render(f"Max Mana: {int(self.attributes.max_mana)}", True, (50, 150, 255)), (sx + 200, sy+90))
+            surf.blit(self.font.render(f"Base Damage: {int(self.attributes.damage)}", True, (255, 100, 100)), (sx, sy+130))
+            surf.blit(self.font.render(f"Defense: {int(self.attributes.defense)}", True, (200, 200, 200)), (sx + 200, sy+130))
+            surf.blit(self.title_font.render("CORE ATTRIBUTES", True, (150, 150, 150)), (sx, sy+190))
+            surf.blit(self.font.render(f"Vigor: {self.attributes.base_vigor}", True, (255, 255, 255)), (sx, sy+230))
+            surf.blit(self.font.render(f"Strength: {self.attributes.base_strength}", True, (255, 255, 255)), (sx + 200, sy+230))
+            surf.blit(self.font.render(f"Agility: {self.attributes.base_agility}", True, (255, 255, 255)), (sx, sy+270))
+            surf.blit(self.font.render(f"Intelligence: {self.attributes.base_intelligence}", True, (255, 255, 255)), (sx + 200, sy+270))
+
+        pygame.draw.rect(surf, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
+        surf.blit(self.font.render("[Stick/D-Pad] Spatial Navigate   |   [A] Action   |   [B] Back", True, (150, 150, 150)), (WIDTH // 2 - 250, HEIGHT - 28))
+
+    def draw(self, screen):
+        """
+        Retained: paper doll, gear drawer and character sheet are cached layers keyed on
+        what they show. The cursor glide, action popup and drawer slide are drawn per frame.
+        """
+        a = self.attributes
+        self.doll_layer.draw(screen, tuple(self.equipment.slots.get(n) for n in self.slot_names), self._draw_doll)
 
         if self.state == "DOLL" or self.state == "ACTION_MENU":
             pygame.draw.rect(screen, (255, 215, 0), self.actual_cursor_rect, 4)
@@ -168,45 +227,12 @@ class StatsEquipUI:
             pygame.draw.rect(screen, (255, 215, 0), (mx, my, 120, len(self.action_options)*30+10), 2)
             for i, opt in enumerate(self.action_options):
                 if i == self.action_idx: pygame.draw.rect(screen, (255, 215, 0), (mx + 2, my + 5 + i*30, 116, 30))
-                screen.blit(self.font.render(opt, True, (0,0,0) if i == self.action_idx else (255,255,255)), (mx + 10, my + 12 + i*30))
+                screen.blit(TEXT_CACHE.render(opt, (0,0,0) if i == self.action_idx else (255,255,255), 24), (mx + 10, my + 12 + i*30))
 
         # AAA Sliding Drawer Math
-        r_rect = pygame.Rect(WIDTH - 450 + self.drawer_offset, 100, 400, 500)
-        pygame.draw.rect(screen, (20, 20, 25), r_rect); pygame.draw.rect(screen, (80, 80, 90), r_rect, 2)
+        drawer_key = (tuple(self.selector_items), self.selector_idx, self.drawer_offset < 400)
+        self.drawer_layer.draw(screen, drawer_key, self._draw_drawer, (int(WIDTH - 450 + self.drawer_offset), 100))
 
-        if self.drawer_offset < 400: # Only draw internals if drawer is somewhat visible
-            screen.blit(self.title_font.render("AVAILABLE GEAR", True, (255, 215, 0)), (r_rect.x + 30, 120))
-            start_x, start_y, sz, sp = r_rect.x + 30, 160, 60, 10
-            for i, item in enumerate(self.selector_items):
-                r = pygame.Rect(start_x + (i%self.sel_cols)*(sz+sp), start_y + (i//self.sel_cols)*(sz+sp), sz, sz)
-                is_sel = (i == self.selector_idx)
-                pygame.draw.rect(screen, (60, 60, 70) if is_sel else (30, 30, 35), r)
-                pygame.draw.rect(screen, item.color, r, 3)
-                if is_sel: pygame.draw.rect(screen, (255, 215, 0), r, 5)
-                try: screen.blit(self.icon_font.render(item.icon, True, (255,255,255)), self.icon_font.render(item.icon, True, (255,255,255)).get_rect(center=r.center))
-                except: pass
-
-            if len(self.selector_items) > 0:
-                hov = self.selector_items[self.selector_idx]
-                tt_rect = pygame.Rect(r_rect.x + 20, 380, 360, 200)
-                pygame.draw.rect(screen, (15, 15, 15), tt_rect); pygame.draw.rect(screen, hov.color, tt_rect, 3)
-                screen.blit(self.title_font.render(hov.name, True, hov.color), (tt_rect.x + 20, tt_rect.y + 20))
-                screen.blit(self.font.render(f"Rarity: {hov.rarity}", True, (200,200,200)), (tt_rect.x + 20, tt_rect.y + 60))
-                screen.blit(self.title_font.render(f"+{hov.effect_value} {hov.effect_stat}", True, (50, 255, 100)), (tt_rect.x + 20, tt_rect.y + 100))
-
-        if self.state != "ITEM_SELECTOR":
-            sx, sy = WIDTH - 420, 120
-            screen.blit(self.title_font.render(f"LEVEL {self.attributes.level}", True, (255, 255, 255)), (sx, sy))
-            screen.blit(self.font.render(f"EXP: {self.attributes.xp} / {self.attributes.xp_next}", True, (255, 215, 0)), (sx, sy+40))
-            screen.blit(self.font.render(f"Max HP: {int(self.attributes.max_hp)}", True, (50, 255, 50)), (sx, sy+90))
-            screen.blit(self.font.render(f"Max Mana: {int(self.attributes.max_mana)}", True, (50, 150, 255)), (sx + 200, sy+90))
-            screen.blit(self.font.render(f"Base Damage: {int(self.attributes.damage)}", True, (255, 100, 100)), (sx, sy+130))
-            screen.blit(self.font.render(f"Defense: {int(self.attributes.defense)}", True, (200, 200, 200)), (sx + 200, sy+130))
-            screen.blit(self.title_font.render("CORE ATTRIBUTES", True, (150, 150, 150)), (sx, sy+190))
-            screen.blit(self.font.render(f"Vigor: {self.attributes.base_vigor}", True, (255, 255, 255)), (sx, sy+230))
-            screen.blit(self.font.render(f"Strength: {self.attributes.base_strength}", True, (255, 255, 255)), (sx + 200, sy+230))
-            screen.blit(self.font.render(f"Agility: {self.attributes.base_agility}", True, (255, 255, 255)), (sx, sy+270))
-            screen.blit(self.font.render(f"Intelligence: {self.attributes.base_intelligence}", True, (255, 255, 255)), (sx + 200, sy+270))
-
-        pygame.draw.rect(screen, (10, 10, 15), (0, HEIGHT - 40, WIDTH, 40))
-        screen.blit(self.font.render("[Stick/D-Pad] Spatial Navigate   |   [A] Action   |   [B] Back", True, (150, 150, 150)), (WIDTH // 2 - 250, HEIGHT - 28))
\ No newline at end of file
+        sheet_key = (self.state != "ITEM_SELECTOR", a.level, a.xp, a.xp_next, int(a.max_hp), int(a.max_mana), int(a.damage), int(a.defense),
+                     a.base_vigor, a.base_strength, a.base_agility, a.base_intelligence)
+        self.sheet_layer.draw(screen, sheet_key, self._draw_sheet, areas=self.sheet_areas)
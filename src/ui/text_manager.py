@@ -1,9 +1,49 @@
 # src/ui/text_manager.py
 import pygame
 import random
+from collections import OrderedDict
+from settings import TEXT_CACHE_SIZE
+
+class TextCache:
+    """
+    Shared cache of rendered strings, keyed by (text, color, size).
+    - One pygame Font per size, created on first use.
+    - Least recently used surfaces are dropped past max_entries.
+    - Surfaces are shared: fade them at blit time (set_alpha, then back to 255).
+    """
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(self, text, color, size=24):
+        key = (text, tuple(color), size)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self.surfaces[key] = self.font(size).render(text, True, color)
+        if len(self.surfaces) > self.max_entries: self.surfaces.popitem(last=False)
+        return surf
+
+TEXT_CACHE = TextCache()
 
 class FloatingText:
     def __init__(self, x, y, text, color=(255, 50, 50)):
+        self.reset(x, y, text, color)
+
+    def reset(self, x, y, text, color=(255, 50, 50)):
+        """(Re)initialises the text so TextManager can recycle instances."""
         self.x = x
         self.y = y
         self.text = text
@@ -11,9 +51,6 @@ class FloatingText:
         self.life_timer = 1.0 # Seconds to live
         self.velocity_y = -30 # Pixels per second (drift up)
         self.alpha = 255
-        
-        # Simple default font
-        self.font = pygame.font.Font(None, 24)
 
     def update(self, dt):
         self.life_timer -= dt
@@ -24,31 +61,44 @@ class FloatingText:
             self.alpha = max(0, int(255 * (self.life_timer / 0.5)))
 
     def draw(self, screen, camera):
-        # Render text
-        surf = self.font.render(self.text, True, self.color)
-        surf.set_alpha(self.alpha)
+        # Shared pre-rendered string; the fade is applied just for this blit
+        surf = TEXT_CACHE.render(self.text, self.color)
         
         # Apply camera offset
         rect = surf.get_rect(center=(self.x, self.y))
         draw_rect = camera.apply(rect)
         
-        screen.blit(surf, draw_rect)
+        if self.alpha < 255:
+            surf.set_alpha(self.alpha)
+            screen.blit(surf, draw_rect)
+            surf.set_alpha(255) # (None would strip the per-pixel alpha)
+        else:
+            screen.blit(surf, draw_rect)
 
 class TextManager:
     def __init__(self):
         self.texts = []
+        self.pool = [] # Expired FloatingTexts waiting to be reused
 
     def add(self, x, y, text, color=(255, 50, 50)):
         # Add slight random offset so numbers don't stack perfectly on top of each other
         off_x = random.randint(-10, 10)
         off_y = random.randint(-10, 10)
-        self.texts.append(FloatingText(x + off_x, y + off_y, text, color))
+        if self.pool:
+            floating = self.pool.pop()
+            floating.reset(x + off_x, y + off_y, text, color)
+        else:
+            floating = FloatingText(x + off_x, y + off_y, text, color)
+        self.texts.append(floating)
 
     def update(self, dt):
+        alive = []
         for text in self.texts:
             text.update(dt)
-        self.texts = [t for t in self.texts if t.life_timer > 0]
+            if text.life_timer > 0: alive.append(text)
+            else: self.pool.append(text)
+        self.texts = alive
 
     def draw(self, screen, camera):
         for text in self.texts:
-            text.draw(screen, camera)
\ No newline at end of file
+            text.draw(screen, camera)
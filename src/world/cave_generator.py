@@ -1,9 +1,11 @@
 # src/world/cave_generator.py
-import random
 import math
+from collections import OrderedDict
 import noise
 import numpy as np
 from settings import *
+from world.simplex import snoise2_grid
+from world.hash_rng import hash_random
 
 class CaveGenerator:
     """
@@ -33,10 +35,15 @@ class CaveGenerator:
         self.warp_strength = 15.0    
         self.warp_frequency = 0.02   
 
+        # --- 4. THE MEMORY (Blueprint Cache) ---
+        # Neighbouring chunks ask for the same sectors over and over.
+        # Bounded LRU keyed by macro cell; None (no room) is cached too.
+        self.room_cache = OrderedDict()
+        self.room_cache_size = 2048
+
     def get_pseudo_random(self, x, y, salt=""):
-        """Deterministic random number generator."""
-        random.seed(f"{self.seed}_{x}_{y}_{salt}")
-        return random.random()
+        """Deterministic random number generator (stateless, leaves global random alone)."""
+        return hash_random(self.seed, x, y, salt)
 
     def _get_warp(self, x, y):
         """
@@ -54,6 +61,17 @@ class CaveGenerator:
         Calculates the Blueprint for a room in sector (mx, my).
         Returns dict or None.
         """
+        key = (mx, my)
+        if key in self.room_cache:
+            self.room_cache.move_to_end(key)
+            return self.room_cache[key]
+        room = self._build_room_info(mx, my)
+        self.room_cache[key] = room
+        if len(self.room_cache) > self.room_cache_size:
+            self.room_cache.popitem(last=False)
+        return room
+
+    def _build_room_info(self, mx, my):
         # 1. Check Existence
         if self.get_pseudo_random(mx, my, "exists") > self.room_chance:
             return None 
@@ -111,44 +129,58 @@ class CaveGenerator:
                             corridors.append((room['center'], neighbor_room['center']))
 
         # --- STEP 2: RASTERIZE (Draw the Map) ---
-        for y in range(CHUNK_SIZE):
-            for x in range(CHUNK_SIZE):
-                real_x = chunk_world_x + x
-                real_y = chunk_world_y + y
-                
-                # A. Apply Fluid Warping (The Naturalizer)
-                # We check the shape at the DISTORTED coordinate
-                wx, wy = self._get_warp(real_x, real_y)
-                
-                # B. Draw Rooms
-                in_room = False
-                for room in rooms:
-                    rx, ry = room['center'] 
-                    # Distance from Warped Point to Real Room Center
-                    dist = math.hypot(wx - rx, wy - ry)
-                    
-                    if dist <= room['radius']:
-                        chunk_grid[x][y] = BIOME_CAVE_ROOM
-                        in_room = True
-                        break
-                
-                if in_room: continue
+        # Whole chunk at once. Arrays are indexed [x][y] like chunk_grid.
+        real_x, real_y = np.meshgrid(np.arange(chunk_world_x, chunk_world_x + CHUNK_SIZE, dtype=np.float64),
+                                     np.arange(chunk_world_y, chunk_world_y + CHUNK_SIZE, dtype=np.float64),
+                                     indexing='ij')
+        
+        # A. Apply Fluid Warping (The Naturalizer)
+        # We check the shape at the DISTORTED coordinate
+        wx, wy = self._get_warp_grid(real_x, real_y)
+        
+        # B. Draw Rooms
+        in_room = np.zeros((CHUNK_SIZE, CHUNK_SIZE), dtype=bool)
+        if rooms:
+            centers = np.array([room['center'] for room in rooms], dtype=np.float64)
+            radii = np.array([room['radius'] for room in rooms], dtype=np.float64)
+            # Distance from Warped Point to Real Room Center -> (rooms, x, y)
+            dist = np.hypot(wx[None] - centers[:, 0, None, None], wy[None] - centers[:, 1, None, None])
+            in_room = (dist <= radii[:, None, None]).any(axis=0)
+            chunk_grid[in_room] = BIOME_CAVE_ROOM
 
-                # C. Draw Corridors
-                for p1, p2 in corridors:
-                    # Distance from Warped Point to Straight Line
-                    dist = self._point_to_segment_dist(wx, wy, p1, p2)
-                    
-                    # Add subtle "breathing" to corridor width so it's not a pipe
-                    swell = noise.snoise2(real_x * 0.04, real_y * 0.04, base=self.seed + 500) * 2.0
-                    effective_width = self.corridor_width + swell
-                    
-                    if dist <= (effective_width / 2):
-                        chunk_grid[x][y] = BIOME_CAVE_CORRIDOR
-                        break
+        # C. Draw Corridors
+        if corridors:
+            seg = np.array(corridors, dtype=np.float64) # (corridors, 2 points, xy)
+            dist = self._point_to_segment_dist_grid(wx, wy, seg[:, 0], seg[:, 1])
+            
+            # Add subtle "breathing" to corridor width so it's not a pipe
+            swell = snoise2_grid(real_x * 0.04, real_y * 0.04, base=self.seed + 500).astype(np.float64) * 2.0
+            effective_width = self.corridor_width + swell
+            
+            in_corridor = (dist <= (effective_width / 2)[None]).any(axis=0)
+            chunk_grid[in_corridor & ~in_room] = BIOME_CAVE_CORRIDOR
 
         return chunk_grid
 
+    def _get_warp_grid(self, x, y):
+        """Batched _get_warp for coordinate arrays."""
+        fx, fy = x * self.warp_frequency, y * self.warp_frequency
+        dx = snoise2_grid(fx, fy, base=self.seed).astype(np.float64)
+        dy = snoise2_grid(fx, fy, base=self.seed + 999).astype(np.float64)
+        return x + (dx * self.warp_strength), y + (dy * self.warp_strength)
+
+    def _point_to_segment_dist_grid(self, px, py, p1, p2):
+        """Batched _point_to_segment_dist: (N,2) segment ends vs a point grid -> (N, x, y)."""
+        x1, y1 = p1[:, 0, None, None], p1[:, 1, None, None]
+        dx, dy = (p2[:, 0] - p1[:, 0])[:, None, None], (p2[:, 1] - p1[:, 1])[:, None, None]
+        len_sq = dx * dx + dy * dy
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = ((px[None] - x1) * dx + (py[None] - y1) * dy) / len_sq
+        t = np.where(len_sq == 0, 0.0, np.clip(t, 0, 1)) # Clamp to segment (degenerate -> endpoint)
+        
+        return np.hypot(px[None] - (x1 + t * dx), py[None] - (y1 + t * dy))
+
     def _point_to_segment_dist(self, px, py, p1, p2):
         """Math helper: Shortest distance from point to line segment."""
         x1, y1 = p1
@@ -0,0 +1,137 @@
+# src/world/chunk_store.py
+import os
+import math
+import atexit
+import shutil
+import tempfile
+import numpy as np
+from collections.abc import MutableMapping
+from settings import *
+from world.world import WorldChunk
+
+class ChunkStore(MutableMapping):
+    """
+    Bounded home for one layer's WorldChunks.
+    - Behaves like the old {(cx, cy): WorldChunk} dict for resident chunks.
+    - trim() evicts the chunks farthest from the player (least recently used
+      breaks ties) once the resident budget is exceeded.
+    - Evicted chunks are spilled to disk as compact uint8 grids and reloaded
+      transparently, so tile edits (e.g. _emergency_safety_check) survive.
+    """
+    def __init__(self, name, cache_dir, max_chunks=CHUNK_BUDGET_CHUNKS, max_mb=CHUNK_BUDGET_MB):
+        self.name = name
+        self.cache_dir = cache_dir
+        self.max_chunks = max_chunks
+        self.max_bytes = max_mb * 1024 * 1024 if max_mb else None
+        self.resident = {}
+        self.last_used = {}
+        self.sizes = {}          # key -> _chunk_bytes() when it became resident
+        self.resident_bytes = 0  # Running sum of sizes, so budget checks are O(1)
+        self.on_disk = set()
+        self.tick = 0
+        self.stats = {'resident': 0, 'on_disk': 0, 'evictions': 0, 'reloads': 0}
+
+    # --- DICT INTERFACE (resident chunks only) ---
+    def __getitem__(self, key):
+        chunk = self.resident[key]
+        self.tick += 1
+        self.last_used[key] = self.tick
+        return chunk
+
+    def __setitem__(self, key, chunk):
+        self.resident[key] = chunk
+        size = self._chunk_bytes(chunk)
+        self.resident_bytes += size - self.sizes.get(key, 0)
+        self.sizes[key] = size
+        self.tick += 1
+        self.last_used[key] = self.tick
+        self.stats['resident'] = len(self.resident)
+
+    def __delitem__(self, key):
+        self.evict(key)
+
+    def __contains__(self, key):
+        return key in self.resident
+
+    def __iter__(self):
+        return iter(self.resident)
+
+    def __len__(self):
+        return len(self.resident)
+
+    # --- DISK SPILL ---
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{self.name}_{key[0]}_{key[1]}.npy")
+
+    def is_known(self, key):
+        """True if the chunk exists either in memory or on disk (no generation needed)."""
+        return key in self.resident or key in self.on_disk
+
+    def spill(self, key, grid):
+        """Writes a grid straight to disk without making it resident."""
+        # Every biome ID fits in a byte, which keeps a chunk at ~1KB on disk
+        np.save(self._path(key), np.asarray(grid, dtype=np.uint8))
+        self.on_disk.add(key)
+        self.stats['on_disk'] = len(self.on_disk)
+
+    def load_grid(self, key):
+        if key not in self.on_disk: return None
+        try:
+            return np.load(self._path(key)).astype(np.int32)
+        except (OSError, ValueError):
+            self.on_disk.discard(key) # File vanished or is corrupt: caller regenerates
+            return None
+
+    def load(self, key):
+        """Restores a spilled chunk into memory. Returns None if it was never spilled."""
+        grid = self.load_grid(key)
+        if grid is None: return None
+        chunk = WorldChunk(key[0], key[1], grid)
+        self[key] = chunk
+        self.stats['reloads'] += 1
+        return chunk
+
+    def evict(self, key):
+        chunk = self.resident.pop(key, None)
+        self.last_used.pop(key, None)
+        self.resident_bytes -= self.sizes.pop(key, 0)
+        if chunk is None: return
+        if getattr(chunk, 'dirty', False) or key not in self.on_disk:
+            self.spill(key, chunk.grid)
+        self.stats['evictions'] += 1
+        self.stats['resident'] = len(self.resident)
+
+    # --- BUDGET ---
+    def _chunk_bytes(self, chunk):
+        # Grid plus a rough per-Rect cost for the collision mesh
+        return chunk.grid.nbytes + len(chunk.rects) * 64
+
+    def _over_budget(self):
+        if self.max_chunks and len(self.resident) > self.max_chunks: return True
+        if self.max_bytes and self.resident_bytes > self.max_bytes: return True
+        return False
+
+    def trim(self, center_cx, center_cy, keep_radius):
+        """Evicts far-away chunks until the store fits its budget again."""
+        if not self._over_budget(): return
+        candidates = [k for k in self.resident
+                      if max(abs(k[0] - center_cx), abs(k[1] - center_cy)) > keep_radius]
+        # Farthest first, then least recently used
+        candidates.sort(key=lambda k: (-math.hypot(k[0] - center_cx, k[1] - center_cy), self.last_used.get(k, 0)))
+        for key in candidates:
+            if not self._over_budget(): break
+            self.evict(key)
+
+
+def make_cache_dir():
+    """Per-session spill folder (a temp dir unless CHUNK_CACHE_DIR is set)."""
+    if CHUNK_CACHE_DIR:
+        path = os.path.join(CHUNK_CACHE_DIR, f"seed_{SEED}")
+        # Spilled chunks are only valid for this session's generator state
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+        return path
+    path = tempfile.mkdtemp(prefix="capstone_chunks_")
+    # Removed at interpreter exit too, not just on a clean UniverseManager.shutdown()
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
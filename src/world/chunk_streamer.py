@@ -0,0 +1,159 @@
+# src/world/chunk_streamer.py
+import math
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from settings import *
+from world.generator import AtlasGenerator
+from world.cave_generator import CaveGenerator
+
+# --- WORKER SIDE ---
+# Each worker process owns its own generators, built once by the pool initializer.
+_worker_generators = None
+
+def _init_worker(seed):
+    global _worker_generators
+    _worker_generators = (AtlasGenerator(seed), CaveGenerator(seed))
+
+def _generate_chunk_grids(layer, cx, cy, need_cave):
+    """
+    Runs inside a worker process. Returns (surface_grid, cave_grid).
+    Surface jobs also build the companion cave grid (needed for portal links)
+    unless the main thread already has that cave chunk resident.
+    """
+    if _worker_generators is None: _init_worker(SEED)
+    surface_gen, cave_gen = _worker_generators
+    if layer == 0:
+        grid = surface_gen.generate_chunk(cx, cy)
+        cave_grid = cave_gen.generate_chunk(cx, cy) if need_cave else None
+        return grid, cave_grid
+    return None, cave_gen.generate_chunk(cx, cy)
+
+
+class ChunkStreamer:
+    """
+    Asynchronous chunk pipeline.
+    - A process pool generates chunk grids ahead of the player (prefetch ring
+      pushed forward along the player's velocity).
+    - Finished grids wait in a ready-queue until the main thread integrates them.
+    - Falls back to inline generation if no pool is available (CHUNK_WORKERS = 0),
+      or for the rest of the session once a worker dies (see _fail).
+    """
+    def __init__(self, seed, workers=CHUNK_WORKERS):
+        self.seed = seed
+        self.pool = None
+        if workers > 0:
+            try:
+                self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(seed,))
+            except (OSError, NotImplementedError, PermissionError) as e:
+                print(f"[STREAMER] Worker pool unavailable ({e}). Generating chunks inline.")
+                self.pool = None
+        self.max_in_flight = max(1, workers * 2)
+
+        self.pending = []        # Wanted keys not yet submitted, highest priority first
+        self.in_flight = {}      # key -> Future
+        self.ready = deque()     # (key, surface_grid, cave_grid) waiting for integration
+
+        # Tuning counters
+        self.stats = {'queued': 0, 'in_flight': 0, 'ready': 0, 'hits': 0, 'misses': 0,
+                      'stall_ms': 0.0, 'last_stall_ms': 0.0, 'worker_failures': 0}
+
+    def _submit(self, key, need_cave):
+        layer, cx, cy = key
+        try:
+            self.in_flight[key] = self.pool.submit(_generate_chunk_grids, layer, cx, cy, need_cave)
+        except Exception as e: # BrokenProcessPool, or the pool could not spawn its workers
+            self._fail(e)
+
+    def _fail(self, e):
+        """A worker died: drop the pool so callers take the inline (not self.pool) paths."""
+        print(f"[STREAMER] Worker pool failed ({e!r}). Generating chunks inline.")
+        self.stats['worker_failures'] += 1
+        self.shutdown()
+        self.in_flight.clear()
+        self.pending = []
+        self._refresh_stats()
+
+    def is_busy(self, key):
+        return key in self.in_flight or any(k == key for k, _, _ in self.ready)
+
+    def request_ring(self, layer, center_px, velocity, is_resident, need_cave):
+        """
+        Rebuilds the prefetch wishlist around the player's predicted position.
+        is_resident(cx, cy) and need_cave(cx, cy) are callbacks into the world.
+        """
+        if not self.pool: return
+        chunk_px = CHUNK_SIZE * TILE_SIZE
+        ahead_x = center_px[0] + velocity.x * PREFETCH_LOOKAHEAD_FRAMES
+        ahead_y = center_px[1] + velocity.y * PREFETCH_LOOKAHEAD_FRAMES
+        pcx, pcy = int(center_px[0] // chunk_px), int(center_px[1] // chunk_px)
+        acx, acy = int(ahead_x // chunk_px), int(ahead_y // chunk_px)
+
+        wanted = {}
+        for ccx, ccy in ((pcx, pcy), (acx, acy)):
+            for y in range(ccy - PREFETCH_RADIUS, ccy + PREFETCH_RADIUS + 1):
+                for x in range(ccx - PREFETCH_RADIUS, ccx + PREFETCH_RADIUS + 1):
+                    if is_resident(x, y): continue
+                    # Closest to the predicted position goes first
+                    wanted[(layer, x, y)] = math.hypot((x + 0.5) * chunk_px - ahead_x, (y + 0.5) * chunk_px - ahead_y)
+
+        # Drop queued-but-unstarted work that fell out of the ring
+        for key, fut in list(self.in_flight.items()):
+            if key not in wanted and fut.cancel():
+                del self.in_flight[key]
+
+        self.pending = sorted((k for k in wanted if not self.is_busy(k)), key=wanted.get)
+        while self.pool and self.pending and len(self.in_flight) < self.max_in_flight:
+            key = self.pending.pop(0)
+            self._submit(key, need_cave(key[1], key[2]) if key[0] == 0 else False)
+        self._refresh_stats()
+
+    def poll(self):
+        """Moves finished futures into the ready-queue. Never blocks."""
+        for key, fut in list(self.in_flight.items()):
+            if fut.done():
+                del self.in_flight[key]
+                if fut.cancelled(): continue
+                try:
+                    surface_grid, cave_grid = fut.result()
+                except Exception as e:
+                    self._fail(e)
+                    return
+                self.ready.append((key, surface_grid, cave_grid))
+        self._refresh_stats()
+
+    def pop_ready(self):
+        return self.ready.popleft() if self.ready else None
+
+    def take(self, key):
+        """Pulls a specific result out of the ready-queue or blocks on its future."""
+        for entry in self.ready:
+            if entry[0] == key:
+                self.ready.remove(entry)
+                return entry[1], entry[2]
+        fut = self.in_flight.pop(key, None)
+        if fut and not fut.cancel():
+            t0 = time.perf_counter()
+            try:
+                result = fut.result()
+            except Exception as e:
+                self._fail(e)
+                return None # Caller generates it inline
+            self.record_stall(t0)
+            return result
+        return None
+
+    def record_stall(self, t0):
+        stall = (time.perf_counter() - t0) * 1000.0
+        self.stats['stall_ms'] += stall
+        self.stats['last_stall_ms'] = stall
+
+    def _refresh_stats(self):
+        self.stats['queued'] = len(self.pending)
+        self.stats['in_flight'] = len(self.in_flight)
+        self.stats['ready'] = len(self.ready)
+
+    def shutdown(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
@@ -3,6 +3,7 @@ import numpy as np
 import noise
 import random
 from settings import *
+from world.simplex import snoise2_grid
 
 class AtlasGenerator:
     def __init__(self, seed):
@@ -19,59 +20,54 @@ class AtlasGenerator:
         global_y_vals = (start_y + local_y) * self.gen_scale
         global_x_vals = (start_x + local_x) * self.gen_scale
         
-        biome_grid = np.zeros((height, width), dtype=np.int32)
-        
         land_start_threshold = LAND_THRESHOLD 
 
-        for i, y_val in enumerate(global_y_vals):
-            # 1. ELEVATION NOISE (Continent Shape)
-            row_noise = [noise.snoise2(x_val, y_val, 
-                                       octaves=self.octaves, 
-                                       persistence=self.persistence, 
-                                       lacunarity=self.lacunarity, 
-                                       base=self.seed) for x_val in global_x_vals]
-            
-            height_map = np.array(row_noise, dtype=np.float32)
+        # 1. ELEVATION NOISE (Continent Shape)
+        # Whole grid in one batched call instead of one snoise2 per tile
+        grid_x, grid_y = np.meshgrid(global_x_vals, global_y_vals)
+        height_map = snoise2_grid(grid_x, grid_y, 
+                                  octaves=self.octaves, 
+                                  persistence=self.persistence, 
+                                  lacunarity=self.lacunarity, 
+                                  base=self.seed)
 
-            # Cubic Transform (Your original continent math)
-            height_map = height_map * height_map * height_map
-            height_map *= 4.0
-            
-            # --- BIOME CLASSIFICATION ---
-            row_biomes = np.full(width, BIOME_OCEAN, dtype=np.int32)
-            
-            # Water
-            row_biomes[height_map < 0.00] = BIOME_DEEP_OCEAN
-            row_biomes[height_map > 0.08] = BIOME_SHALLOW_WATER
-            
-            # Land Masks
-            is_land = height_map > land_start_threshold
-            
-            # --- ZONING LOGIC ---
-            # Zone 1: Lowlands (Between Beach and Highlands)
-            is_low_zone = (height_map > (land_start_threshold + 0.02)) & (height_map <= HIGHLAND_THRESHOLD)
-            
-            # Zone 2: Highlands (Between Lowlands and Mountains)
-            is_high_zone = (height_map > HIGHLAND_THRESHOLD) & (height_map <= 0.8)
-            
-            # Apply Beach
-            row_biomes[is_land] = BIOME_BEACH
-            
-            # Apply Standard Lowlands (Meadow)
-            row_biomes[is_low_zone] = BIOME_L_MEADOW
-            
-            # Apply Standard Highlands (Forest)
-            row_biomes[is_high_zone] = BIOME_H_FOREST
-            
-            # --- MOUNTAINS ---
-            row_biomes[height_map > 0.8] = BIOME_MTN_LOW
-            row_biomes[height_map > 1.0] = BIOME_MTN_HIGH
-            row_biomes[height_map > 1.3] = BIOME_MTN_PEAK
-            
-            # NOTE: No Object Generation Loop Here!
-            # The code ends here, ensuring plain vanilla tiles.
-            
-            biome_grid[i] = row_biomes
+        # Cubic Transform (Your original continent math)
+        height_map = height_map * height_map * height_map
+        height_map *= 4.0
+        
+        # --- BIOME CLASSIFICATION ---
+        biome_grid = np.full((height, width), BIOME_OCEAN, dtype=np.int32)
+        
+        # Water
+        biome_grid[height_map < 0.00] = BIOME_DEEP_OCEAN
+        biome_grid[height_map > 0.08] = BIOME_SHALLOW_WATER
+        
+        # Land Masks
+        is_land = height_map > land_start_threshold
+        
+        # --- ZONING LOGIC ---
+        # Zone 1: Lowlands (Between Beach and Highlands)
+        is_low_zone = (height_map > (land_start_threshold + 0.02)) & (height_map <= HIGHLAND_THRESHOLD)
+        
+        # Zone 2: Highlands (Between Lowlands and Mountains)
+        is_high_zone = (height_map > HIGHLAND_THRESHOLD) & (height_map <= 0.8)
+        
+        # Apply Beach
+        biome_grid[is_land] = BIOME_BEACH
+        
+        # Apply Standard Lowlands (Meadow)
+        biome_grid[is_low_zone] = BIOME_L_MEADOW
+        
+        # Apply Standard Highlands (Forest)
+        biome_grid[is_high_zone] = BIOME_H_FOREST
+        
+        # --- MOUNTAINS ---
+        biome_grid[height_map > 0.8] = BIOME_MTN_LOW
+        biome_grid[height_map > 1.0] = BIOME_MTN_HIGH
+        biome_grid[height_map > 1.3] = BIOME_MTN_PEAK
+        
+        # NOTE: No Object Generation Loop Here!
+        # The code ends here, ensuring plain vanilla tiles.
 
         return biome_grid
 
@@ -0,0 +1,34 @@
+# src/world/hash_rng.py
+import zlib
+
+# --- STATELESS HASH RNG ---
+# Deterministic "random" numbers from coordinates, without reseeding (and
+# therefore without disturbing) Python's global `random` module.
+# Based on the splitmix64 finalizer.
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_GOLDEN = 0x9E3779B97F4A7C15
+_salt_cache = {}
+
+def _mix64(z):
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+def _salt_id(salt):
+    # crc32 is stable across runs (unlike hash() on strings)
+    sid = _salt_cache.get(salt)
+    if sid is None:
+        sid = _salt_cache[salt] = zlib.crc32(str(salt).encode())
+    return sid
+
+def hash_u64(seed, x, y, salt=""):
+    """64-bit hash of (seed, x, y, salt). Negative coordinates are fine."""
+    h = _mix64((int(seed) + _GOLDEN) & _MASK64)
+    h = _mix64(((h ^ (int(x) & _MASK64)) + _GOLDEN) & _MASK64)
+    h = _mix64(((h ^ (int(y) & _MASK64)) + _GOLDEN) & _MASK64)
+    return _mix64(((h ^ _salt_id(salt)) + _GOLDEN) & _MASK64)
+
+def hash_random(seed, x, y, salt=""):
+    """Float in [0, 1) for (seed, x, y, salt), like random.random() after a reseed."""
+    return (hash_u64(seed, x, y, salt) >> 11) * (1.0 / (1 << 53))
@@ -1,23 +1,32 @@
 # src/world/universe.py
 import pygame
-import random
+import time
+import shutil
 from settings import *
 from world.world import WorldChunk
 from world.generator import AtlasGenerator
 from world.cave_generator import CaveGenerator
 from world.portal import Portal
+from world.chunk_streamer import ChunkStreamer
+from world.chunk_store import ChunkStore, make_cache_dir
+from world.hash_rng import hash_random
+from engine.physics import WallGrid
 
 class UniverseManager:
     def __init__(self):
         self.surface_generator = AtlasGenerator(SEED) 
         self.cave_generator = CaveGenerator(SEED) 
-        self.surface_chunks = {} 
-        self.cave_chunks = {} 
+        self.streamer = ChunkStreamer(SEED)
+        self.cache_dir = make_cache_dir()
+        self.surface_chunks = ChunkStore("surface", self.cache_dir)
+        self.cave_chunks = ChunkStore("cave", self.cache_dir)
         self.surface_portals = [] 
         self.cave_portals = [] 
         self.current_layer = 0 
+        self.drawn_chunks = set() 
         self.last_teleport_time = 0 
         self.teleport_cooldown = 1500 
+        self.version = 0 # Bumped on every tile edit so cached views (flow field) rebuild
 
     @property
     def current_chunks(self):
@@ -27,31 +36,90 @@ class UniverseManager:
     def active_portals(self):
         return self.surface_portals if self.current_layer == 0 else self.cave_portals
 
+    def _is_resident(self, cx, cy):
+        # Spilled chunks count too: reloading them is far cheaper than a worker job
+        return self.current_chunks.is_known((cx, cy))
+
+    def _needs_cave(self, cx, cy):
+        return not self.cave_chunks.is_known((cx, cy))
+
+    def _integrate(self, layer, cx, cy, grid, cave_grid):
+        """Turns raw grids (from a worker or inline) into live WorldChunks + portals."""
+        if layer == 0:
+            if (cx, cy) in self.surface_chunks: return self.surface_chunks[(cx, cy)]
+            if (cx, cy) in self.surface_chunks.on_disk:
+                # Already generated once (portals exist): just bring it back
+                chunk = self.surface_chunks.load((cx, cy))
+                if chunk: return chunk
+            # The companion cave grid is only needed for portal links, so it goes
+            # straight to disk instead of sitting in memory while we're on the surface
+            if (cx, cy) in self.cave_chunks: link_grid = self.cave_chunks[(cx, cy)].grid
+            else: link_grid = self.cave_chunks.load_grid((cx, cy))
+            if link_grid is None:
+                link_grid = cave_grid if cave_grid is not None else self.cave_generator.generate_chunk(cx, cy)
+                self.cave_chunks.spill((cx, cy), link_grid)
+            valid_links = self._find_verified_portal_links(cx, cy, grid, link_grid)
+            self._instantiate_portals(valid_links)
+            self.surface_chunks[(cx, cy)] = WorldChunk(cx, cy, grid)
+            return self.surface_chunks[(cx, cy)]
+        
+        if (cx, cy) not in self.cave_chunks:
+            if self.cave_chunks.load((cx, cy)): return self.cave_chunks[(cx, cy)]
+            self.cave_chunks[(cx, cy)] = WorldChunk(cx, cy, cave_grid)
+        return self.cave_chunks[(cx, cy)]
+
+    def update_streaming(self, player):
+        """Called once per frame: feeds the prefetch ring and integrates finished chunks."""
+        self.streamer.poll()
+        for _ in range(CHUNK_INTEGRATE_PER_FRAME):
+            entry = self.streamer.pop_ready()
+            if not entry: break
+            (layer, cx, cy), grid, cave_grid = entry
+            self._integrate(layer, cx, cy, grid, cave_grid)
+        self.streamer.request_ring(self.current_layer, player.rect.center, player.velocity, 
+                                   self._is_resident, self._needs_cave)
+
+        # Keep both layers inside their memory budget (far chunks spill to disk)
+        chunk_px = CHUNK_SIZE * TILE_SIZE
+        pcx, pcy = int(player.rect.centerx // chunk_px), int(player.rect.centery // chunk_px)
+        self.surface_chunks.trim(pcx, pcy, CHUNK_KEEP_RADIUS)
+        self.cave_chunks.trim(pcx, pcy, CHUNK_KEEP_RADIUS)
+
+    def peek_chunk(self, cx, cy):
+        """Non-blocking lookup. Returns None (and leaves it to the streamer) if not resident yet."""
+        chunks = self.current_chunks
+        chunk = chunks.get((cx, cy))
+        if chunk is None and (cx, cy) in chunks.on_disk: chunk = chunks.load((cx, cy))
+        if chunk is not None: self.streamer.stats['hits'] += 1
+        elif self.streamer.pool: self.streamer.stats['misses'] += 1
+        else: return self.get_chunk(cx, cy)
+        return chunk
+
     def get_chunk(self, cx, cy):
+        """Blocking lookup. Uses a finished/in-flight worker result if there is one."""
         chunks = self.current_chunks
         
-        if (cx, cy) not in chunks:
-            if self.current_layer == 0:
-                grid = self.surface_generator.generate_chunk(cx, cy)
-                self._ensure_cave_chunk_exists(cx, cy)
-                cave_grid = self.cave_chunks[(cx, cy)].grid
-                valid_links = self._find_verified_portal_links(cx, cy, grid, cave_grid)
-                self._instantiate_portals(valid_links)
-            else:
-                if (cx, cy) in self.cave_chunks:
-                    grid = self.cave_chunks[(cx, cy)].grid
-                else:
-                    grid = self.cave_generator.generate_chunk(cx, cy)
+        if (cx, cy) in chunks:
+            self.streamer.stats['hits'] += 1
+            return chunks[(cx, cy)]
 
-            chunk = WorldChunk(cx, cy, grid)
-            chunks[(cx, cy)] = chunk
-            
-        return chunks[(cx, cy)]
+        if (cx, cy) in chunks.on_disk:
+            chunk = chunks.load((cx, cy))
+            if chunk: return chunk
 
-    def _ensure_cave_chunk_exists(self, cx, cy):
-        if (cx, cy) not in self.cave_chunks:
-            grid = self.cave_generator.generate_chunk(cx, cy)
-            self.cave_chunks[(cx, cy)] = WorldChunk(cx, cy, grid)
+        self.streamer.stats['misses'] += 1
+        t0 = time.perf_counter()
+        result = self.streamer.take((self.current_layer, cx, cy))
+        if result:
+            grid, cave_grid = result
+        elif self.current_layer == 0:
+            grid = self.surface_generator.generate_chunk(cx, cy)
+            cave_grid = None
+        else:
+            grid, cave_grid = None, self.cave_generator.generate_chunk(cx, cy)
+        chunk = self._integrate(self.current_layer, cx, cy, grid, cave_grid)
+        self.streamer.record_stall(t0)
+        return chunk
 
     def _find_verified_portal_links(self, cx, cy, surface_grid, cave_grid):
         links = []
@@ -77,8 +145,7 @@ class UniverseManager:
                             wx = (cx * CHUNK_SIZE + surf_tx) * TILE_SIZE
                             wy = (cy * CHUNK_SIZE + surf_ty) * TILE_SIZE
                             
-                            random.seed(f"{SEED}_{wx}_{wy}_link")
-                            if random.random() < PORTAL_CHANCE:
+                            if hash_random(SEED, wx, wy, "link") < PORTAL_CHANCE:
                                 if any((l[0]-wx)**2 + (l[1]-wy)**2 < min_dist_sq for l in links): continue
                                 if not self._has_right_spawn_square(surface_grid, surf_tx, surf_ty): continue
 
@@ -191,31 +258,50 @@ class UniverseManager:
             if chunk.grid[lx][ly] in COLLISION_TILES:
                 chunk.grid[lx][ly] = BIOME_L_MEADOW if self.current_layer == 0 else BIOME_CAVE_ROOM
                 chunk.rebuild()
+                self.version += 1
 
-    def get_nearby_walls(self, rect):
-        walls = []
-        cx, cy = int(rect.centerx // (CHUNK_SIZE * TILE_SIZE)), int(rect.centery // (CHUNK_SIZE * TILE_SIZE))
+    def get_nearby_walls(self, rect, blocking=True):
+        """
+        Walls from the 3x3 chunks around rect, as a WallGrid broadphase. Chunks the
+        rect actually touches are loaded synchronously (if blocking); any other missing
+        neighbour is stood in for by one solid placeholder rect so nothing walks into
+        unloaded terrain.
+        """
+        chunks, placeholders = {}, []
+        chunk_px = CHUNK_SIZE * TILE_SIZE
+        cx, cy = int(rect.centerx // chunk_px), int(rect.centery // chunk_px)
         for y in range(cy-1, cy+2):
             for x in range(cx-1, cx+2):
-                chunk = self.get_chunk(x, y)
-                walls.extend(chunk.rects)
-        return walls
+                bounds = pygame.Rect(x * chunk_px, y * chunk_px, chunk_px, chunk_px)
+                touches = bounds.colliderect(rect.inflate(TILE_SIZE, TILE_SIZE))
+                if self.current_chunks.is_known((x, y)) or (blocking and touches) or not self.streamer.pool:
+                    chunks[(x, y)] = self.get_chunk(x, y)
+                else:
+                    self.streamer.stats['misses'] += 1
+                    placeholders.append(bounds)
+        return WallGrid(chunks, placeholders)
+
+    def shutdown(self):
+        self.streamer.shutdown()
+        if not CHUNK_CACHE_DIR: shutil.rmtree(self.cache_dir, ignore_errors=True)
 
     def draw_visible_chunks(self, screen, camera):
         cam_x, cam_y = -camera.camera.x, -camera.camera.y
         start_cx, start_cy = int(cam_x // (CHUNK_SIZE * TILE_SIZE)), int(cam_y // (CHUNK_SIZE * TILE_SIZE))
         end_cx, end_cy = start_cx + (WIDTH // (CHUNK_SIZE * TILE_SIZE)) + 2, start_cy + (HEIGHT // (CHUNK_SIZE * TILE_SIZE)) + 2
+        drawn = set()
         for y in range(start_cy, end_cy):
             for x in range(start_cx, end_cx):
-                chunk = self.get_chunk(x, y)
+                chunk = self.peek_chunk(x, y)
+                if chunk is None: continue # Still generating, background shows through
                 ox, oy = x * CHUNK_SIZE * TILE_SIZE + camera.camera.x, y * CHUNK_SIZE * TILE_SIZE + camera.camera.y
-                for lx in range(CHUNK_SIZE):
-                    for ly in range(CHUNK_SIZE):
-                        tile = chunk.grid[lx][ly]
-                        if tile == BIOME_DEEP_OCEAN: continue 
-                        rect = pygame.Rect(ox + lx * TILE_SIZE, oy + ly * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                        if screen.get_rect().colliderect(rect):
-                            pygame.draw.rect(screen, BIOME_COLORS.get(tile, (255,0,255)), rect)
+                screen.blit(chunk.get_surface(), (ox, oy))
+                drawn.add((self.current_layer, x, y))
+        # Free the (large) pre-rendered surfaces of chunks that scrolled out of view
+        for layer, x, y in self.drawn_chunks - drawn:
+            chunk = (self.surface_chunks if layer == 0 else self.cave_chunks).resident.get((x, y))
+            if chunk: chunk.surface = None
+        self.drawn_chunks = drawn
         for p in self.active_portals: p.draw(screen, camera)
             
     def _find_closest_safe_tile(self, px, py, target_layer):
@@ -1,46 +1,92 @@
 # src/world/world.py
 import pygame
+import numpy as np
 from settings import *
 
+# --- TILE PALETTE ---
+# Biome ID -> RGB lookup table so a whole grid can be colored in one NumPy index.
+# Unknown IDs stay magenta (same as the old per-tile fallback).
+TILE_PALETTE = np.full((256, 3), (255, 0, 255), dtype=np.uint8)
+for _biome, _color in BIOME_COLORS.items(): TILE_PALETTE[_biome] = _color
+
+# Biome ID -> blocks movement?
+COLLISION_MASK = np.zeros(256, dtype=bool)
+COLLISION_MASK[list(COLLISION_TILES)] = True
+
 class WorldChunk:
     """
     Optimized World Chunk.
-    - Implements 'Greedy Meshing' to reduce physics calculations by ~70%.
+    - Implements 2D 'Greedy Meshing' (row runs merged into rectangles) to cut physics work.
     """
     def __init__(self, chunk_x, chunk_y, grid_data):
         self.cx = chunk_x
         self.cy = chunk_y
         self.grid = grid_data
         self.rects = [] 
+        self.dirty = False # Grid edited since generation (must be re-saved on eviction)
+        self.surface = None # Pre-rendered tiles, built lazily by get_surface()
         self.build_collision_mesh()
 
     def build_collision_mesh(self):
+        """
+        2D greedy mesh: horizontal wall runs per row (found with NumPy),
+        then runs with the same span on consecutive rows merge into one rect.
+        """
         self.rects = [] 
-        visited = set()
-
-        for y in range(CHUNK_SIZE):
-            for x in range(CHUNK_SIZE):
-                if (x, y) in visited: continue
-                
-                tile_id = self.grid[x][y]
-                
-                if tile_id in COLLISION_TILES:
-                    # Start a strip
-                    width = 1
-                    visited.add((x, y))
-                    
-                    # Look ahead to merge horizontal walls
-                    while (x + width) < CHUNK_SIZE:
-                        next_tile = self.grid[x + width][y]
-                        if next_tile in COLLISION_TILES:
-                            visited.add((x + width, y))
-                            width += 1
-                        else:
-                            break
-                    
-                    rect_x = (self.cx * CHUNK_SIZE + x) * TILE_SIZE
-                    rect_y = (self.cy * CHUNK_SIZE + y) * TILE_SIZE
-                    self.rects.append(pygame.Rect(rect_x, rect_y, width * TILE_SIZE, TILE_SIZE))
+        # mask[y][x]: rows are easier to scan for runs
+        mask = COLLISION_MASK[np.asarray(self.grid, dtype=np.uint8)].T.astype(np.int8)
+        edges = np.diff(np.pad(mask, ((0, 0), (1, 1))), axis=1)
+        run_rows, run_starts = np.nonzero(edges == 1)
+        run_ends = np.nonzero(edges == -1)[1]
+
+        # Walk the rows, keeping rects "open" while the next row repeats their span
+        open_rects = {} # (x_start, x_end) -> y_start
+        row_runs = {}
+        for row, x0, x1 in zip(run_rows.tolist(), run_starts.tolist(), run_ends.tolist()):
+            row_runs.setdefault(row, []).append((x0, x1))
+        for y in range(CHUNK_SIZE + 1):
+            spans = row_runs.get(y, ())
+            for span in [k for k in open_rects if k not in spans]:
+                x0, x1 = span
+                y0 = open_rects.pop(span)
+                rect_x = (self.cx * CHUNK_SIZE + x0) * TILE_SIZE
+                rect_y = (self.cy * CHUNK_SIZE + y0) * TILE_SIZE
+                self.rects.append(pygame.Rect(rect_x, rect_y, (x1 - x0) * TILE_SIZE, (y - y0) * TILE_SIZE))
+            for span in spans:
+                if span not in open_rects: open_rects[span] = y
+        # Same rects as a (n, 4) [left, top, right, bottom] array for batched collision
+        self.rect_array = np.array([(r.left, r.top, r.right, r.bottom) for r in self.rects], dtype=np.int64).reshape(-1, 4)
+        self.build_wall_cells()
+
+    def build_wall_cells(self):
+        """Broadphase: buckets mesh rect indices (into self.rects) into WALL_CELL_TILES-sized cells (see engine.physics.WallGrid)."""
+        cell_px = WALL_CELL_TILES * TILE_SIZE
+        n = CHUNK_SIZE // WALL_CELL_TILES
+        ox, oy = self.cx * CHUNK_SIZE * TILE_SIZE, self.cy * CHUNK_SIZE * TILE_SIZE
+        self.wall_cells = [[] for _ in range(n * n)]
+        for i, rect in enumerate(self.rects):
+            gx0, gx1 = (rect.left - ox) // cell_px, (rect.right - 1 - ox) // cell_px
+            gy0, gy1 = (rect.top - oy) // cell_px, (rect.bottom - 1 - oy) // cell_px
+            for gy in range(gy0, gy1 + 1):
+                for gx in range(gx0, gx1 + 1):
+                    self.wall_cells[gy * n + gx].append(i)
+
+    def get_surface(self):
+        """
+        The whole chunk as one Surface (built once, blitted every frame).
+        DEEP_OCEAN is color-keyed out so the background shows through.
+        """
+        if self.surface is None:
+            # grid is [x][y] just like surfarray, so no transpose needed
+            tiles = pygame.surfarray.make_surface(TILE_PALETTE[np.asarray(self.grid, dtype=np.uint8)])
+            size = CHUNK_SIZE * TILE_SIZE
+            surf = pygame.transform.scale(tiles, (size, size))
+            surf.set_colorkey(BIOME_COLORS[BIOME_DEEP_OCEAN])
+            if pygame.display.get_surface(): surf = surf.convert()
+            self.surface = surf
+        return self.surface
 
     def rebuild(self):
+        self.dirty = True
+        self.surface = None
         self.build_collision_mesh()
\ No newline at end of file